@@ -53,6 +53,7 @@ interface GameState {
   roundCount: number;
   nextStep: 'continue' | 'conclude';
   decisionOptions?: DecisionOption[];
+  sessionId?: string;
 }
 
 export function FinancialGameSimulation({ career }: FinancialGameSimulationProps) {
@@ -170,6 +171,7 @@ export function FinancialGameSimulation({ career }: FinancialGameSimulationProps
         level: response.level,
         achievements: response.achievements || [],
         decisionOptions: response.decision_options || [],
+        sessionId: response.session_id,
         isLoading: false
       }));
     } catch (error) {
@@ -204,7 +206,8 @@ export function FinancialGameSimulation({ career }: FinancialGameSimulationProps
           savings: gameState.savings,
           debt: gameState.debt,
           financialDecision: selectedDecision,
-          nextStep
+          nextStep,
+          sessionId: gameState.sessionId
         }
       });
 
@@ -220,8 +223,8 @@ export function FinancialGameSimulation({ career }: FinancialGameSimulationProps
           expenses: response.expenses || prev.expenses,
           savings: response.savings || prev.savings,
           debt: response.debt || prev.debt,
-          xpEarned: response.xp_earned || prev.xpEarned,
-          level: response.level || prev.level,
+          xpEarned: response.total_xp || response.xp_earned || prev.xpEarned,
+          level: response.total_level || response.level || prev.level,
           achievements: response.achievements || prev.achievements,
           decisionOptions: response.decision_options || [],
           isLoading: false,
@@ -259,7 +262,8 @@ export function FinancialGameSimulation({ career }: FinancialGameSimulationProps
           xpEarned: gameState.xpEarned,
           level: gameState.level,
           achievements: gameState.achievements,
-          financialDecision: selectedDecision || 'balanced_approach'
+          financialDecision: selectedDecision || 'balanced_approach',
+          sessionId: gameState.sessionId
         }
       });
 
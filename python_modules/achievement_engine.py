@@ -0,0 +1,128 @@
+"""
+Achievement rule engine for the Financial Twin game
+Achievements are declared as data (a threshold over a named metric), compiled once into
+sorted per-metric threshold tables, and re-evaluated only for metrics that changed.
+Each achievement also has a stable bit so sets of them are stored and sent as integers.
+"""
+import json
+import zlib
+import bisect
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Comparison operators a rule can use
+OPERATORS = ('>', '>=', '<', '<=', '==')
+
+
+class AchievementRule:
+    """One achievement: unlocked while `metric op threshold` holds"""
+
+    def __init__(self, name: str, metric: str, op: str, threshold: float):
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator for achievement {name}: {op}")
+        self.name = name
+        self.metric = metric
+        self.op = op
+        self.threshold = float(threshold)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AchievementRule':
+        """Build a rule from its declaration"""
+        return cls(data['name'], data['metric'], data['op'], data['threshold'])
+
+
+class _MetricTable:
+    """All rules over one metric, sorted by threshold so a value is matched with two bisects"""
+
+    def __init__(self, rules: Sequence[Tuple[int, AchievementRule]]):
+        self.above: Dict[str, Tuple[List[float], List[int]]] = {}
+        self.equal: Dict[float, List[int]] = {}
+        for op in ('>', '>=', '<', '<='):
+            matching = sorted((rule.threshold, index) for index, rule in rules if rule.op == op)
+            self.above[op] = ([threshold for threshold, _ in matching], [index for _, index in matching])
+        for index, rule in rules:
+            if rule.op == '==':
+                self.equal.setdefault(rule.threshold, []).append(index)
+
+    def satisfied(self, value: float) -> List[int]:
+        """Indices of the rules this value satisfies"""
+        indices: List[int] = []
+        thresholds, rules = self.above['>']
+        indices += rules[:bisect.bisect_left(thresholds, value)]
+        thresholds, rules = self.above['>=']
+        indices += rules[:bisect.bisect_right(thresholds, value)]
+        thresholds, rules = self.above['<']
+        indices += rules[bisect.bisect_right(thresholds, value):]
+        thresholds, rules = self.above['<=']
+        indices += rules[bisect.bisect_left(thresholds, value):]
+        indices += self.equal.get(value, [])
+        return indices
+
+
+class AchievementEngine:
+    """Compiled achievement rules"""
+
+    def __init__(self, rules: Sequence[Dict[str, Any]]):
+        self.rules = [AchievementRule.from_dict(rule) for rule in rules]
+        by_metric: Dict[str, List[Tuple[int, AchievementRule]]] = {}
+        for index, rule in enumerate(self.rules):
+            by_metric.setdefault(rule.metric, []).append((index, rule))
+        self.tables = {metric: _MetricTable(metric_rules) for metric, metric_rules in by_metric.items()}
+        self.metrics = tuple(self.tables)
+
+    def evaluate(self, metrics: Dict[str, float], previous: Optional[Dict[str, Any]] = None) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Work out which achievements a set of metrics earns
+
+        Args:
+            metrics: Current metric values by name
+            previous: State returned by the last evaluation; metrics that haven't changed
+                      since then reuse their previous result
+
+        Returns:
+            Tuple of (achievement names in declaration order, state for the next evaluation)
+        """
+        previous_values = previous.get('metrics', {}) if previous else {}
+        previous_satisfied = previous.get('satisfied', {}) if previous else {}
+        values: Dict[str, float] = {}
+        satisfied: Dict[str, List[int]] = {}
+        for metric in self.metrics:
+            value = metrics.get(metric)
+            if value is None:
+                continue
+            values[metric] = value
+            if metric in previous_satisfied and previous_values.get(metric) == value:
+                satisfied[metric] = previous_satisfied[metric]
+            else:
+                satisfied[metric] = self.tables[metric].satisfied(value)
+
+        indices = sorted(index for metric_indices in satisfied.values() for index in metric_indices)
+        return [self.rules[index].name for index in indices], {'metrics': values, 'satisfied': satisfied}
+
+
+class AchievementCatalog:
+    """Stable bit positions for achievements, so a set of them travels and is stored as one integer"""
+
+    def __init__(self, bits: Dict[str, int]):
+        if len(set(bits.values())) != len(bits):
+            raise ValueError("Achievement bit positions must be unique")
+        self.bits = dict(bits)
+        self.labels = {bit: name for name, bit in bits.items()}
+        # Changes whenever an achievement is added or relabelled, so clients know to refetch the table
+        self.version = format(zlib.crc32(json.dumps(sorted(self.labels.items())).encode('utf-8')), '08x')
+
+    def encode(self, names: Sequence[str]) -> int:
+        """Bitset of a list of achievement names (unknown names are ignored)"""
+        mask = 0
+        for name in names:
+            bit = self.bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def decode(self, mask: int) -> List[str]:
+        """Achievement names in a bitset, in bit order"""
+        return [self.labels[bit] for bit in sorted(self.labels) if mask >> bit & 1]
+
+    def table(self) -> Dict[str, Any]:
+        """The id-to-label table clients cache to read bitsets"""
+        return {'version': self.version, 'labels': {str(bit): name for bit, name in sorted(self.labels.items())}}
@@ -0,0 +1,110 @@
+"""
+Bitmap index of achievements across players for the Financial Twin game
+Every player (game session) gets an ordinal, and every achievement a bitmap file with one
+bit per player. Unlocks set a single bit in place; cohort counts are integer AND/NOT and
+a popcount over the loaded bitmaps.
+"""
+import os
+import sys
+from typing import Dict, Iterable, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background
+except ImportError:
+    import background
+
+# Index storage
+INDEX_DIR = os.environ.get('FINANCIAL_TWIN_ACHIEVEMENT_INDEX_DIR', '/tmp/financial_twin_achievement_index')
+_COUNTER_PATH = os.path.join(INDEX_DIR, 'players.count')
+
+
+def _bitmap_path(bit: int) -> str:
+    """Bitmap file of one achievement"""
+    return os.path.join(INDEX_DIR, f"achievement_{int(bit)}.bitmap")
+
+
+def player_count() -> int:
+    """Number of players in the index"""
+    try:
+        with open(_COUNTER_PATH, 'r') as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def assign_ordinal() -> int:
+    """Give a new player the next ordinal (its bit position in every bitmap)"""
+    with background.file_lock(_COUNTER_PATH):
+        ordinal = player_count()
+        with open(_COUNTER_PATH + '.tmp', 'w') as f:
+            f.write(str(ordinal + 1))
+        os.replace(_COUNTER_PATH + '.tmp', _COUNTER_PATH)
+    return ordinal
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Positions of the set bits of a mask"""
+    bit = 0
+    while mask:
+        if mask & 1:
+            yield bit
+        mask >>= 1
+        bit += 1
+
+
+def record(ordinal: int, mask: int) -> None:
+    """Set a player's bit in the bitmap of every achievement in mask (one byte written per achievement)"""
+    byte_offset, bit_in_byte = divmod(int(ordinal), 8)
+    for bit in _bits(mask):
+        path = _bitmap_path(bit)
+        with background.file_lock(path):
+            with open(path, 'r+b' if os.path.exists(path) else 'w+b') as f:
+                f.seek(byte_offset)
+                current = f.read(1)
+                value = (current[0] if current else 0) | (1 << bit_in_byte)
+                f.seek(byte_offset)
+                f.write(bytes((value,)))
+
+
+def load_bitmap(bit: int) -> int:
+    """One achievement's bitmap as an integer (bit n set = player n has it)"""
+    try:
+        with open(_bitmap_path(bit), 'rb') as f:
+            return int.from_bytes(f.read(), 'little')
+    except OSError:
+        return 0
+
+
+class Cohorts:
+    """Bitmaps loaded once for answering many cohort queries"""
+
+    def __init__(self, bits: Iterable[int]):
+        self.players = player_count()
+        self.everyone = (1 << self.players) - 1
+        self.bitmaps: Dict[int, int] = {bit: load_bitmap(bit) for bit in bits}
+
+    def count(self, has_mask: int = 0, lacks_mask: int = 0) -> int:
+        """Players with every achievement in has_mask and none in lacks_mask"""
+        selected = self.everyone
+        for bit in _bits(has_mask):
+            selected &= self.bitmaps.get(bit, 0)
+        for bit in _bits(lacks_mask):
+            selected &= ~self.bitmaps.get(bit, 0)
+        return selected.bit_count()
+
+    def rarity(self) -> Dict[int, float]:
+        """Percentage of players holding each achievement"""
+        if not self.players:
+            return {bit: 0.0 for bit in self.bitmaps}
+        return {bit: round(100 * bitmap.bit_count() / self.players, 2) for bit, bitmap in self.bitmaps.items()}
+
+
+def cohort_count(has_mask: int = 0, lacks_mask: int = 0, bits: Optional[Iterable[int]] = None) -> Dict[str, float]:
+    """How many players have every achievement in has_mask and none in lacks_mask"""
+    cohorts = Cohorts(bits if bits is not None else _bits(has_mask | lacks_mask))
+    matching = cohorts.count(has_mask, lacks_mask)
+    return {'players': cohorts.players, 'matching': matching,
+            'percentage': round(100 * matching / cohorts.players, 2) if cohorts.players else 0.0}
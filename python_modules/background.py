@@ -0,0 +1,112 @@
+"""
+Background work helpers for the Financial Twin game
+Each game request runs in a short-lived Python process, so work that must outlive the
+request is handed to a detached child process and coordinated through files on disk.
+"""
+import os
+import sys
+import json
+import time
+import fcntl
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+# Project root, used as the working directory of background processes
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def spawn(script_path: str, *args: str) -> Optional[int]:
+    """
+    Start a Python script as a detached background process
+
+    Args:
+        script_path: Path of the script to run
+        *args: Command line arguments for the script
+
+    Returns:
+        The child's pid, or None if it could not be started
+    """
+    try:
+        process = subprocess.Popen(
+            [sys.executable, script_path, *args],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        return process.pid
+    except OSError as e:
+        with open("/tmp/python_errors.log", "a") as f:
+            f.write(f"Error starting background job {script_path} {args}: {str(e)}\n")
+        return None
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on path + '.lock' for the duration of the block"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """Read a JSON file, returning default if it is missing or unreadable"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write a JSON file so readers never see a partially written document"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def claim_marker(path: str, ttl_seconds: float) -> bool:
+    """
+    Claim a marker file so only one background job does a piece of work at a time
+
+    Returns:
+        True if the marker was claimed, False if another live claim exists
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        # Take over claims left behind by jobs that died
+        try:
+            if time.time() - os.path.getmtime(path) < ttl_seconds:
+                return False
+            os.remove(path)
+        except OSError:
+            return False
+        return claim_marker(path, ttl_seconds)
+    with os.fdopen(fd, 'w') as f:
+        f.write(str(os.getpid()))
+    return True
+
+
+def release_marker(path: str) -> None:
+    """Release a marker claimed with claim_marker"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
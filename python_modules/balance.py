@@ -0,0 +1,252 @@
+"""
+Game balance analytics for the Financial Twin game
+Plays large numbers of sessions per career with bot policies through the real turn rules
+(advance_turn_pence, no LLM or narration) across a process pool, and reports outcome distributions.
+"""
+import os
+import sys
+import json
+import time
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import scenario_deck, money
+except ImportError:
+    import scenario_deck
+    import money
+
+# Decisions per session: the client concludes after its fifth decision
+TURNS_PER_SESSION = 5
+
+# Sessions simulated per pool task
+CHUNK_SIZE = 20000
+
+# Percentiles reported for each outcome
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Outcomes kept in pence during the simulation and reported in pounds
+MONEY_OUTCOMES = ('savings', 'debt', 'income', 'net_worth')
+
+
+def _game_module():
+    """Import the game module lazily (worker processes import it on first use)"""
+    try:
+        from python_modules import financial_twin_updated
+    except ImportError:
+        import financial_twin_updated
+    return financial_twin_updated
+
+
+def _net_impact(option: Dict[str, Any]) -> float:
+    """Declared effect of an option on net worth, as shown on the decision cards"""
+    impact = option.get('impact', {})
+    return impact.get('savings', 0) + impact.get('income', 0) - impact.get('expenses', 0) - impact.get('debt', 0)
+
+
+def _downside(option: Dict[str, Any]) -> float:
+    """Worst declared effect of an option: lost savings or income, added expenses or debt"""
+    impact = option.get('impact', {})
+    return max(0, -impact.get('savings', 0), -impact.get('income', 0), impact.get('expenses', 0), impact.get('debt', 0))
+
+
+def random_bot(options: Sequence[Dict[str, Any]], rng: random.Random) -> Dict[str, Any]:
+    """Pick any option"""
+    return options[rng.randrange(len(options))]
+
+
+def greedy_bot(options: Sequence[Dict[str, Any]], rng: random.Random) -> Dict[str, Any]:
+    """Pick the option with the best declared net effect"""
+    return max(options, key=_net_impact)
+
+
+def cautious_bot(options: Sequence[Dict[str, Any]], rng: random.Random) -> Dict[str, Any]:
+    """Pick the option with the smallest downside, then the best net effect"""
+    return min(options, key=lambda option: (_downside(option), -_net_impact(option)))
+
+
+BOTS: Dict[str, Callable[[Sequence[Dict[str, Any]], random.Random], Dict[str, Any]]] = {
+    'random': random_bot,
+    'greedy': greedy_bot,
+    'cautious': cautious_bot
+}
+
+
+def simulate_chunk(career: str, bot: str, sessions: int, seed: int) -> Dict[str, Any]:
+    """
+    Play a chunk of sessions for one career and bot (runs in a worker process)
+
+    Returns:
+        Raw per-session outcomes as int64 arrays (amounts in pence) plus counters
+    """
+    game = _game_module()
+    rng = random.Random(seed)
+    choose = BOTS[bot]
+    start = game.CAREER_DATA[career]
+    initial_options = game.CAREER_DECISIONS[career]
+    scenarios = game.SCENARIOS_WITH_OPTIONS.get(career, game.SCENARIOS_WITH_OPTIONS['Student'])
+    advance_turn = game.advance_turn_pence
+    start_pence = [money.to_pence(start[field]) for field in ('income', 'expenses', 'savings', 'debt')]
+
+    outcomes = {name: array('q') for name in MONEY_OUTCOMES + ('xp', 'level')}
+    achievement_sessions: Dict[str, int] = {}
+    final_achievements: Dict[str, int] = {}
+    crisis_counts: Dict[str, int] = {}
+    crisis_turns = 0
+    sessions_with_crisis = 0
+
+    for _ in range(sessions):
+        income, expenses, savings, debt = start_pence
+        options = initial_options
+        unlocked = set()
+        had_crisis = False
+        turn = None
+        total_xp = 0
+        deck = scenario_deck.ScenarioDeck.new(len(scenarios), rng)
+        for _ in range(TURNS_PER_SESSION):
+            decision = choose(options, rng)['value']
+            turn = advance_turn(career, income, expenses, savings, debt, decision, rng, deck=deck)
+            income, expenses, savings, debt = turn['income'], turn['expenses'], turn['savings'], turn['debt']
+            total_xp += turn['xp_earned']
+            unlocked.update(turn['achievements'])
+            if turn['crisis_type'] is not None:
+                crisis_turns += 1
+                had_crisis = True
+                crisis_counts[turn['crisis_type']] = crisis_counts.get(turn['crisis_type'], 0) + 1
+            options = scenarios[turn['scenario_index']]['options']
+
+        outcomes['savings'].append(savings)
+        outcomes['debt'].append(debt)
+        outcomes['income'].append(income)
+        outcomes['net_worth'].append(savings - debt)
+        # The conclusion's XP and level come from the session's XP ledger, the sum over its turns;
+        # its achievements are the last turn's
+        outcomes['xp'].append(total_xp)
+        outcomes['level'].append(game.get_level(total_xp))
+        for achievement in unlocked:
+            achievement_sessions[achievement] = achievement_sessions.get(achievement, 0) + 1
+        for achievement in set(turn['achievements']):
+            final_achievements[achievement] = final_achievements.get(achievement, 0) + 1
+        sessions_with_crisis += had_crisis
+
+    return {
+        'outcomes': {name: values.tobytes() for name, values in outcomes.items()},
+        'achievement_sessions': achievement_sessions,
+        'final_achievements': final_achievements,
+        'crisis_counts': crisis_counts,
+        'crisis_turns': crisis_turns,
+        'sessions_with_crisis': sessions_with_crisis,
+        'sessions': sessions
+    }
+
+
+def _distribution(values: array, unit: int = 1) -> Dict[str, float]:
+    """Mean and percentiles of an outcome, divided by unit (100 to report pence in pounds)"""
+    ordered = sorted(values)
+    count = len(ordered)
+    summary = {'mean': round(sum(ordered) / count / unit, 2), 'min': ordered[0] / unit, 'max': ordered[-1] / unit}
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}"] = ordered[min(count - 1, count * percentile // 100)] / unit
+    return summary
+
+
+def _merge(career: str, bot: str, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the chunks of one career and bot into its report"""
+    sessions = sum(chunk['sessions'] for chunk in chunks)
+    outcomes = {}
+    for name in chunks[0]['outcomes']:
+        values = array('q')
+        for chunk in chunks:
+            values.frombytes(chunk['outcomes'][name])
+        outcomes[name] = _distribution(values, money.PENCE_PER_POUND if name in MONEY_OUTCOMES else 1)
+
+    def rates(key: str) -> Dict[str, float]:
+        totals: Dict[str, int] = {}
+        for chunk in chunks:
+            for name, count in chunk[key].items():
+                totals[name] = totals.get(name, 0) + count
+        return {name: round(count / sessions, 4) for name, count in sorted(totals.items())}
+
+    crisis_turns = sum(chunk['crisis_turns'] for chunk in chunks)
+    return {
+        'career': career,
+        'bot': bot,
+        'sessions': sessions,
+        'outcomes': outcomes,
+        'achievement_unlock_rate': rates('achievement_sessions'),
+        'final_achievement_rate': rates('final_achievements'),
+        'crisis': {
+            'per_turn': round(crisis_turns / (sessions * TURNS_PER_SESSION), 4),
+            'sessions_with_crisis': round(sum(chunk['sessions_with_crisis'] for chunk in chunks) / sessions, 4),
+            'by_type_per_session': rates('crisis_counts')
+        }
+    }
+
+
+def simulate(
+    sessions: int,
+    careers: Optional[Sequence[str]] = None,
+    bots: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Simulate bot-played sessions and report outcome distributions per career and bot
+
+    Args:
+        sessions: Sessions per career and bot
+        careers: Careers to simulate (default all)
+        bots: Bot policies to use: random, greedy, cautious (default all)
+        workers: Worker processes (default one per CPU; 1 runs in this process)
+        seed: Base seed; every chunk gets its own derived seed so runs are reproducible
+
+    Returns:
+        Dictionary with one report per career and bot, and the elapsed time
+    """
+    careers = list(careers or _game_module().CAREER_DATA)
+    bots = list(bots or BOTS)
+    workers = workers or os.cpu_count() or 1
+    if sessions <= 0:
+        raise ValueError(f"Sessions must be positive: {sessions}")
+    for bot in bots:
+        if bot not in BOTS:
+            raise ValueError(f"Unknown bot: {bot}")
+
+    tasks = []
+    for career in careers:
+        for bot in bots:
+            for offset in range(0, sessions, CHUNK_SIZE):
+                tasks.append((career, bot, min(CHUNK_SIZE, sessions - offset), seed * 1000003 + len(tasks)))
+
+    started = time.perf_counter()
+    if workers == 1:
+        chunks = [simulate_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(simulate_chunk, *zip(*tasks)))
+
+    reports = []
+    for career in careers:
+        for bot in bots:
+            reports.append(_merge(career, bot, [chunk for task, chunk in zip(tasks, chunks)
+                                                if task[0] == career and task[1] == bot]))
+    return {'sessions_per_report': sessions, 'turns_per_session': TURNS_PER_SESSION,
+            'elapsed_seconds': round(time.perf_counter() - started, 2), 'reports': reports}
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        arguments = sys.argv[1:] + [None] * 4
+        session_count = int(arguments[0])
+        bot_names = None if arguments[1] in (None, 'all') else arguments[1].split(',')
+        career_names = None if arguments[2] in (None, 'all') else arguments[2].split(',')
+        worker_count = int(arguments[3]) if arguments[3] else None
+        print(json.dumps(simulate(session_count, career_names, bot_names, worker_count), indent=2))
+    else:
+        print("Usage: python balance.py <sessions> [bots|all] [careers|all] [workers]")
@@ -0,0 +1,194 @@
+"""
+Crisis events for the Financial Twin game
+Each turn may bring a crisis. How likely one is depends on the player's savings buffer, and
+which one it is depends on the career (and, for some events, the buffer too). Every
+career and buffer band gets one precompiled alias table over "no crisis" plus the events,
+so a turn's crisis is a single uniform draw and a table lookup. Whole batches of players or
+Monte Carlo paths can be drawn at once with NumPy.
+"""
+import os
+import sys
+import random
+from fractions import Fraction
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import money
+except ImportError:
+    import money
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Savings buffer bands: no savings, less than CUSHION_MONTHS of expenses, or more
+BUFFER_BANDS = ('no_buffer', 'thin', 'cushioned')
+CUSHION_MONTHS = 3
+
+# Code returned by batch draws for "no crisis"
+NO_CRISIS = -1
+
+
+class AliasSampler:
+    """Vose alias table: draws an index in proportion to its weight with one uniform number"""
+
+    def __init__(self, weights: Sequence[float]):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("An alias table needs a positive total weight")
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] += scaled[low] - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+        self.size = count
+
+    def pick(self, uniform: float) -> int:
+        """Index for a uniform number in [0, 1)"""
+        position = uniform * self.size
+        column = int(position)
+        return column if position - column < self.probability[column] else self.alias[column]
+
+    def pick_many(self, uniforms: Any) -> Any:
+        """Indexes for an array of uniform numbers (NumPy array in, NumPy array out)"""
+        position = np.asarray(uniforms) * self.size
+        column = position.astype(np.int64)
+        probability = np.asarray(self.probability)
+        alias = np.asarray(self.alias)
+        return np.where(position - column < probability[column], column, alias[column])
+
+
+class CrisisEngine:
+    """Per-career, per-buffer crisis tables compiled into alias samplers"""
+
+    def __init__(
+        self,
+        events: Mapping[str, Dict[str, Any]],
+        probability_by_band: Mapping[str, float],
+        career_weights: Optional[Mapping[str, Mapping[str, float]]] = None,
+        band_weights: Optional[Mapping[str, Mapping[str, float]]] = None,
+        cushion_months: float = CUSHION_MONTHS
+    ):
+        """
+        Args:
+            events: Crisis definitions by name (cost, income_reduction, message)
+            probability_by_band: Chance of any crisis in a turn for each buffer band
+            career_weights: Relative weight of events per career (missing events weigh 1)
+            band_weights: Multipliers on event weights per buffer band
+            cushion_months: Months of expenses that make a buffer 'cushioned'
+        """
+        self.events = dict(events)
+        self.names: List[str] = list(self.events)
+        self.probability_by_band = dict(probability_by_band)
+        self.career_weights = {career: dict(weights) for career, weights in (career_weights or {}).items()}
+        self.band_weights = {band: dict(weights) for band, weights in (band_weights or {}).items()}
+        self.cushion_months = cushion_months
+        # Each event's effect in exact terms: cost in pence and the fraction of income kept
+        self._costs = {name: money.to_pence(event.get('cost', 0)) for name, event in self.events.items()}
+        self._income_kept = {name: money.ratio(1 - Fraction(str(event.get('income_reduction', 0))))
+                             for name, event in self.events.items()}
+        # Outcome 0 of every table is "no crisis", outcome i + 1 is self.names[i]
+        self._samplers: Dict[Tuple[Optional[str], str], AliasSampler] = {
+            (career, band): AliasSampler(self.probabilities(career, band))
+            for career in list(self.career_weights) + [None] for band in BUFFER_BANDS
+        }
+
+    def band(self, savings: float, expenses: float) -> str:
+        """Buffer band of a savings balance against monthly expenses"""
+        if savings <= 0:
+            return 'no_buffer'
+        return 'thin' if savings < self.cushion_months * expenses else 'cushioned'
+
+    def probabilities(self, career: Optional[str], band: str) -> List[float]:
+        """Probability of no crisis followed by the probability of each event, for a career and band"""
+        career_weights = self.career_weights.get(career, {})
+        band_weights = self.band_weights.get(band, {})
+        weights = [career_weights.get(name, 1.0) * band_weights.get(name, 1.0) for name in self.names]
+        total = sum(weights)
+        trigger = self.probability_by_band[band] if total > 0 else 0.0
+        return [1.0 - trigger] + [trigger * weight / total if total > 0 else 0.0 for weight in weights]
+
+    def _sampler(self, career: Optional[str], band: str) -> AliasSampler:
+        return self._samplers.get((career, band)) or self._samplers[(None, band)]
+
+    def draw(self, career: str, savings: float, expenses: float, rng: Any = random) -> Optional[str]:
+        """
+        Draw this turn's crisis
+
+        Args:
+            career: Player's career
+            savings: Savings after the turn's decision
+            expenses: Monthly expenses
+            rng: Source of random draws (the random module or a random.Random)
+
+        Returns:
+            The crisis name, or None if there is no crisis
+        """
+        outcome = self._sampler(career, self.band(savings, expenses)).pick(rng.random())
+        return self.names[outcome - 1] if outcome else None
+
+    def draw_many(self, career: str, savings: Any, expenses: Any, rng: Any = None) -> Any:
+        """
+        Draw crises for a batch of players or paths at once
+
+        Args:
+            career: Career of the batch
+            savings: Savings of each player or path
+            expenses: Monthly expenses of each player or path
+            rng: numpy.random.Generator with NumPy, otherwise a random.Random (default a fresh one)
+
+        Returns:
+            Event index into self.names per entry, NO_CRISIS where there is none (NumPy array,
+            or a list without NumPy)
+        """
+        if np is None:
+            rng = rng or random.Random()
+            codes = []
+            for saving, expense in zip(savings, expenses):
+                outcome = self._sampler(career, self.band(saving, expense)).pick(rng.random())
+                codes.append(outcome - 1)
+            return codes
+
+        rng = rng or np.random.default_rng()
+        savings = np.asarray(savings, dtype=float)
+        expenses = np.broadcast_to(np.asarray(expenses, dtype=float), savings.shape)
+        bands = np.where(savings <= 0, 0, np.where(savings < self.cushion_months * expenses, 1, 2))
+        uniforms = rng.random(savings.shape)
+        codes = np.empty(savings.shape, dtype=np.int64)
+        for band_index, band in enumerate(BUFFER_BANDS):
+            selected = bands == band_index
+            if selected.any():
+                codes[selected] = self._sampler(career, band).pick_many(uniforms[selected])
+        return codes - 1
+
+    def apply(self, crisis_type: Optional[str], income: int, savings: int) -> Tuple[int, int, Optional[str]]:
+        """Apply a crisis to income and savings in pence; returns the new income, savings and the crisis message"""
+        if crisis_type is None:
+            return income, savings, None
+        savings -= self._costs[crisis_type]
+        income = money.mul_div(income, *self._income_kept[crisis_type])
+        return income, savings, self.events[crisis_type]['message']
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    try:
+        from python_modules import financial_twin_updated as game
+    except ImportError:
+        import financial_twin_updated as game
+    import json
+    careers = sys.argv[1:] or list(game.CAREER_DATA)
+    print(json.dumps({career: {band: dict(zip(['none'] + game.CRISIS_ENGINE.names,
+                                              (round(p, 4) for p in game.CRISIS_ENGINE.probabilities(career, band))))
+                               for band in BUFFER_BANDS} for career in careers}, indent=2))
@@ -0,0 +1,120 @@
+"""
+Decision preview for the Financial Twin game
+Applies every option of the presented scenario to the current state with the turn engine's
+own decision rules, so players can compare monthly savings, ratios and a 12-month outlook
+before choosing.
+"""
+import sys
+import os
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import fast_forward, money
+except ImportError:
+    import fast_forward
+    import money
+
+# Horizon of the outlook shown for each option
+PREVIEW_MONTHS = 12
+
+# Order of the state columns and of the impact matrix
+FIELDS = ('income', 'expenses', 'savings', 'debt')
+
+
+def _metrics(income: float, expenses: float, savings: float, debt: float) -> Dict[str, Optional[float]]:
+    """Monthly savings and ratios for one state (ratios are None without income)"""
+    return {
+        'monthly_savings': round(income - expenses, 2),
+        'debt_to_income_ratio': round(debt / (income * 12), 4) if income > 0 else None,
+        'savings_ratio': round(savings / income, 4) if income > 0 else None
+    }
+
+
+def _game_module():
+    """Import the game module lazily (it imports this module)"""
+    try:
+        from python_modules import financial_twin_updated
+    except ImportError:
+        import financial_twin_updated
+    return financial_twin_updated
+
+
+def decided_state(financial_decision: str, income: int, expenses: int, savings: int, debt: int) -> List[float]:
+    """
+    Expected state right after a decision, in pounds (the turn's random crisis comes later)
+
+    Args:
+        financial_decision: Option value, as passed to the turn engine
+        income, expenses, savings, debt: Current state in pence
+
+    Returns:
+        Income, expenses, savings and debt in FIELDS order, weighted over the decision's outcomes
+    """
+    outcomes, _ = _game_module().decision_outcomes(financial_decision, income, savings, debt)
+    expected = [sum(outcome[field] * outcome[0] for outcome in outcomes) for field in (1, 2, 3)]
+    return [money.to_pounds(round(expected[0])), money.to_pounds(expenses),
+            money.to_pounds(round(expected[1])), money.to_pounds(round(expected[2]))]
+
+
+def preview(
+    options: List[Dict[str, Any]],
+    income: float,
+    expenses: float,
+    savings: float,
+    debt: float,
+    career_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Compare every option of a scenario from the current state
+
+    Each option's value goes through the turn engine's decision step (decision_outcomes), so
+    a row shows what choosing it does, averaged over chance outcomes such as an investment
+    paying off. Each row is then projected with the closed-form fast-forward.
+
+    Args:
+        options: Decision options with 'value' and 'label'
+        income: Current monthly income
+        expenses: Current monthly expenses
+        savings: Current savings
+        debt: Current debt
+        career_path: Career, used for the default debt rate
+
+    Returns:
+        Dictionary with the baseline, one comparison row per option and the best options
+    """
+    state_pence = [money.to_pence(value) for value in (income, expenses, savings, debt)]
+    state = [money.to_pounds(value) for value in state_pence]
+
+    baseline_metrics = _metrics(*state)
+    baseline_outlook = fast_forward.fast_forward(*state, PREVIEW_MONTHS, career_path)
+    baseline = dict(zip(FIELDS, state), **baseline_metrics, net_worth_12m=baseline_outlook['net_worth'])
+
+    rows = []
+    for option in options:
+        new_income, new_expenses, new_savings, new_debt = decided_state(option.get('value', ''), *state_pence)
+        metrics = _metrics(new_income, new_expenses, new_savings, new_debt)
+        outlook = fast_forward.fast_forward(new_income, new_expenses, new_savings, new_debt, PREVIEW_MONTHS, career_path)
+        rows.append({
+            'value': option.get('value'),
+            'label': option.get('label'),
+            'income': round(new_income, 2),
+            'expenses': round(new_expenses, 2),
+            'savings': round(new_savings, 2),
+            'debt': round(new_debt, 2),
+            **metrics,
+            'monthly_savings_change': round(metrics['monthly_savings'] - baseline_metrics['monthly_savings'], 2),
+            'outlook_12m': {key: outlook[key] for key in ('savings', 'debt', 'net_worth')},
+            'net_worth_change_12m': round(outlook['net_worth'] - baseline_outlook['net_worth'], 2)
+        })
+
+    best = {}
+    if rows:
+        best = {
+            'net_worth_12m': max(rows, key=lambda row: row['outlook_12m']['net_worth'])['value'],
+            'monthly_savings': max(rows, key=lambda row: row['monthly_savings'])['value'],
+            'lowest_debt_12m': min(rows, key=lambda row: row['outlook_12m']['debt'])['value']
+        }
+    return {'months': PREVIEW_MONTHS, 'baseline': baseline, 'options': rows, 'best': best}
@@ -0,0 +1,288 @@
+"""
+Event-sourced session log for the Financial Twin game
+Session events (start, every turn's inputs and outputs, conclusion) are appended to
+preallocated segment files through mmap. Each segment starts with a fixed header holding
+its write position, and each record has a fixed-size header (length, CRC, sequence, time,
+session key, kind) followed by a compact JSON payload. A full segment is sealed and the
+next one started. A small sidecar index per segment keeps the offset of each session's
+first record in it, so a session's events are found without decoding the whole log.
+"""
+import os
+import sys
+import json
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background
+except ImportError:
+    import background
+
+# Log storage and the size segments are preallocated to
+EVENT_LOG_DIR = os.environ.get('FINANCIAL_TWIN_EVENT_LOG_DIR', '/tmp/financial_twin_event_log')
+SEGMENT_SIZE = int(os.environ.get('FINANCIAL_TWIN_EVENT_SEGMENT_SIZE', str(8 * 1024 * 1024)))
+
+# Segment header: magic, format version, segment number, sealed flag, write position, record count, created
+SEGMENT_MAGIC = b'FTEVLOG1'
+SEGMENT_HEADER = struct.Struct('<8sIIIQQd')
+SEGMENT_DATA_START = 64
+_SEALED_AT = 16
+_TAIL_AT = 20
+
+# Record header: payload length, payload CRC32, sequence in segment, time, session key, kind
+RECORD_HEADER = struct.Struct('<IIId16sH')
+
+# Sparse index entry: session key and the offset of its first record in the segment
+INDEX_ENTRY = struct.Struct('<16sI')
+
+FORMAT_VERSION = 1
+
+# Event kinds and their codes in record headers
+KINDS = {'start': 1, 'turn': 2, 'conclude': 3}
+KIND_NAMES = {code: kind for kind, code in KINDS.items()}
+
+
+def session_key(session_id: str) -> bytes:
+    """16-byte key of a session (the id itself for hex session ids, otherwise its hash)"""
+    text = str(session_id)
+    if len(text) == 32:
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            pass
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _segment_path(number: int) -> str:
+    return os.path.join(EVENT_LOG_DIR, f"segment_{number:08d}.log")
+
+
+def _index_path(number: int) -> str:
+    return os.path.join(EVENT_LOG_DIR, f"segment_{number:08d}.idx")
+
+
+def segment_numbers() -> List[int]:
+    """Numbers of the segments on disk, oldest first"""
+    try:
+        names = os.listdir(EVENT_LOG_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(int(name[8:-4]) for name in names if name.startswith('segment_') and name.endswith('.log'))
+
+
+def _create_segment(number: int) -> None:
+    """Preallocate an empty segment"""
+    with open(_segment_path(number), 'w+b') as f:
+        f.truncate(SEGMENT_SIZE)
+        f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, FORMAT_VERSION, number, 0, SEGMENT_DATA_START, 0, time.time()))
+
+
+def _read_header(view: Any) -> Dict[str, Any]:
+    magic, version, number, sealed, tail, count, created = SEGMENT_HEADER.unpack_from(view, 0)
+    if magic != SEGMENT_MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not an event log segment")
+    return {'number': number, 'sealed': bool(sealed), 'tail': tail, 'count': count, 'created': created}
+
+
+def _index_offset(number: int, key: bytes) -> Optional[int]:
+    """Offset of a session's first record in a segment, from the segment's sparse index"""
+    try:
+        with open(_index_path(number), 'rb') as f:
+            entries = f.read()
+    except FileNotFoundError:
+        return None
+    position = entries.find(key)
+    while position != -1:
+        if position % INDEX_ENTRY.size == 0:
+            return INDEX_ENTRY.unpack_from(entries, position)[1]
+        position = entries.find(key, position + 1)
+    return None
+
+
+def append(session_id: str, kind: str, data: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Append an event to the log
+
+    Args:
+        session_id: Game session the event belongs to
+        kind: Event kind ('start', 'turn' or 'conclude')
+        data: Event payload (JSON-serialisable)
+
+    Returns:
+        Segment number and offset of the record
+    """
+    payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    size = RECORD_HEADER.size + len(payload)
+    if SEGMENT_DATA_START + size > SEGMENT_SIZE:
+        raise ValueError(f"Event of {size} bytes does not fit in a segment")
+    key = session_key(session_id)
+
+    with background.file_lock(os.path.join(EVENT_LOG_DIR, 'append')):
+        numbers = segment_numbers()
+        number = numbers[-1] if numbers else 1
+        if not numbers:
+            _create_segment(number)
+        with open(_segment_path(number), 'r+b') as f:
+            view = mmap.mmap(f.fileno(), 0)
+        try:
+            header = _read_header(view)
+            if header['tail'] + size > len(view):
+                # Seal the full segment and continue in a new one
+                struct.pack_into('<I', view, _SEALED_AT, 1)
+                view.close()
+                number += 1
+                _create_segment(number)
+                with open(_segment_path(number), 'r+b') as f:
+                    view = mmap.mmap(f.fileno(), 0)
+                header = _read_header(view)
+            offset = header['tail']
+            # Payload and record header first, then the write position that makes them visible
+            view[offset + RECORD_HEADER.size:offset + size] = payload
+            RECORD_HEADER.pack_into(view, offset, len(payload), zlib.crc32(payload), header['count'],
+                                    time.time(), key, KINDS[kind])
+            struct.pack_into('<QQ', view, _TAIL_AT, offset + size, header['count'] + 1)
+        finally:
+            view.close()
+        if _index_offset(number, key) is None:
+            with open(_index_path(number), 'ab') as f:
+                f.write(INDEX_ENTRY.pack(key, offset))
+    return number, offset
+
+
+def _records(number: int, start: Optional[int] = None, key: Optional[bytes] = None,
+             verify: bool = True) -> Iterator[Dict[str, Any]]:
+    """Records of one segment from start (default the first), optionally only one session's"""
+    try:
+        f = open(_segment_path(number), 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        tail = _read_header(view)['tail']
+        offset = start if start is not None else SEGMENT_DATA_START
+        while offset < tail:
+            length, crc, sequence, event_time, record_key, kind = RECORD_HEADER.unpack_from(view, offset)
+            payload_start = offset + RECORD_HEADER.size
+            if key is None or record_key == key:
+                payload = view[payload_start:payload_start + length]
+                if verify and zlib.crc32(payload) != crc:
+                    raise ValueError(f"Corrupt record at segment {number} offset {offset}")
+                yield {'segment': number, 'offset': offset, 'sequence': sequence, 'time': event_time,
+                       'session': record_key.hex(), 'kind': KIND_NAMES.get(kind, str(kind)),
+                       'data': json.loads(payload)}
+            offset = payload_start + length
+    finally:
+        view.close()
+
+
+def replay(kinds: Optional[Sequence[str]] = None, from_segment: int = 0, verify: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Every event in the log in append order
+
+    Args:
+        kinds: Only yield events of these kinds (default all)
+        from_segment: Skip segments numbered below this
+        verify: Check each payload's CRC
+
+    Yields:
+        Events with their segment, offset, sequence, time, session key (hex), kind and data
+    """
+    for number in segment_numbers():
+        if number < from_segment:
+            continue
+        for event in _records(number, verify=verify):
+            if kinds is None or event['kind'] in kinds:
+                yield event
+
+
+def session_events(session_id: str) -> List[Dict[str, Any]]:
+    """Every event of one session in order, located through the segments' sparse indexes"""
+    key = session_key(session_id)
+    events = []
+    for number in segment_numbers():
+        start = _index_offset(number, key)
+        if start is not None:
+            events.extend(_records(number, start, key))
+    return events
+
+
+def reconstruct(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a session's state by folding its events
+
+    Returns:
+        Career, latest financial state, turns played, XP earned and achievements seen,
+        or None if the session has no events
+    """
+    events = session_events(session_id)
+    if not events:
+        return None
+    state: Dict[str, Any] = {'career': None, 'income': 0.0, 'expenses': 0.0, 'savings': 0.0, 'debt': 0.0,
+                             'turns': 0, 'xp_earned': 0, 'achievements': [], 'concluded': False}
+    for event in events:
+        data = event['data']
+        if event['kind'] == 'start':
+            state['career'] = data.get('career')
+            state.update(data.get('state', {}))
+        elif event['kind'] == 'turn':
+            state['career'] = data.get('career', state['career'])
+            state.update(data.get('after', {}))
+            state['turns'] += 1
+            state['xp_earned'] += data.get('xp_earned', 0)
+            for achievement in data.get('achievements', []):
+                if achievement not in state['achievements']:
+                    state['achievements'].append(achievement)
+        elif event['kind'] == 'conclude':
+            state['concluded'] = True
+    state['updated'] = events[-1]['time']
+    return state
+
+
+def stats() -> Dict[str, Any]:
+    """Segments on disk with their record counts and bytes used"""
+    segments = []
+    for number in segment_numbers():
+        with open(_segment_path(number), 'rb') as f:
+            header = _read_header(f.read(SEGMENT_HEADER.size))
+        segments.append({'segment': number, 'records': header['count'], 'bytes': header['tail'],
+                         'sealed': header['sealed']})
+    return {'segments': segments, 'records': sum(segment['records'] for segment in segments)}
+
+
+def prune(keep_segments: int) -> int:
+    """Delete the oldest sealed segments beyond the newest keep_segments; returns the number removed"""
+    removed = 0
+    numbers = segment_numbers()
+    with background.file_lock(os.path.join(EVENT_LOG_DIR, 'append')):
+        for number in numbers[:max(0, len(numbers) - max(1, keep_segments))]:
+            for path in (_segment_path(number), _index_path(number)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            removed += 1
+    return removed
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'replay':
+        events = session_events(sys.argv[2]) if len(sys.argv) >= 3 else replay()
+        for logged_event in events:
+            print(json.dumps(logged_event))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'state':
+        print(json.dumps(reconstruct(sys.argv[2]), indent=2))
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'stats':
+        print(json.dumps(stats(), indent=2))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'prune':
+        print(prune(int(sys.argv[2])))
+    else:
+        print("Usage: python event_log.py replay [session_id] | state <session_id> | stats | prune <keep_segments>")
@@ -0,0 +1,271 @@
+"""
+Multi-month fast-forward for the Financial Twin game
+Projects a player's savings and debt N months ahead with closed-form compound growth and
+annuity amortization, so long horizons cost the same as one month.
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Annual rates used when the caller doesn't give any
+DEFAULT_SAVINGS_APR = 0.04
+DEFAULT_DEBT_APR = {
+    'Student': 0.043,
+    'Entrepreneur': 0.08,
+    'Artist': 0.07,
+    'Banker': 0.05
+}
+FALLBACK_DEBT_APR = 0.06
+
+# Share of a positive monthly cash flow put towards debt when no payment is given
+DEFAULT_DEBT_PAYMENT_SHARE = 0.5
+
+# Horizon of the outlook attached to every turn
+OUTLOOK_MONTHS = 60
+
+
+def growth_sum(rate: float, months: float) -> float:
+    """Future value of 1 paid at the end of each month for `months` months: ((1+r)^n - 1) / r"""
+    if rate == 0:
+        return months
+    return math.expm1(months * math.log1p(rate)) / rate
+
+
+def default_debt_payment(income: float, expenses: float, debt: float) -> float:
+    """Monthly debt payment used when the player hasn't set one"""
+    if debt <= 0:
+        return 0.0
+    return max(income - expenses, 0.0) * DEFAULT_DEBT_PAYMENT_SHARE
+
+
+def payoff_months(debt: float, monthly_rate: float, payment: float) -> float:
+    """
+    Months until a debt is repaid with a fixed monthly payment (closed form, fractional)
+
+    Returns:
+        Number of months, or math.inf if the payment never covers the interest
+    """
+    if debt <= 0:
+        return 0.0
+    if payment <= 0 or payment <= debt * monthly_rate:
+        return math.inf
+    if monthly_rate == 0:
+        return debt / payment
+    return -math.log1p(-monthly_rate * debt / payment) / math.log1p(monthly_rate)
+
+
+def debt_after(debt: float, monthly_rate: float, payment: float, months: float) -> float:
+    """Debt balance after `months` full payments: D(1+r)^n - p((1+r)^n - 1)/r"""
+    return debt * math.exp(months * math.log1p(monthly_rate)) - payment * growth_sum(monthly_rate, months)
+
+
+def savings_switch_month(savings: float, monthly_rate: float, contribution: float) -> float:
+    """
+    Month after which savings cross zero, switching between earning interest and not
+
+    Only a positive balance earns interest, so savings follow S(1+r)^n + c((1+r)^n - 1)/r while
+    positive and S + cn otherwise. Negative savings with a positive contribution climb linearly to
+    zero; positive savings with withdrawals larger than their interest compound down to it.
+
+    Returns:
+        Whole number of months, or math.inf if the balance never crosses zero
+    """
+    if savings <= 0 < contribution:
+        return float(math.ceil(-savings / contribution))
+    if savings > 0 > contribution and monthly_rate > 0:
+        offset = contribution / monthly_rate
+        if savings + offset < 0:
+            # (S + c/r)(1+r)^n = c/r
+            return float(math.ceil(math.log(offset / (savings + offset)) / math.log1p(monthly_rate)))
+    return math.inf
+
+
+def _savings_phase(savings: float, monthly_rate: float, contribution: float, months: float, earning: bool) -> float:
+    if earning:
+        return savings * math.exp(months * math.log1p(monthly_rate)) + contribution * growth_sum(monthly_rate, months)
+    return savings + contribution * months
+
+
+def savings_after(savings: float, monthly_rate: float, contribution: float, months: float) -> float:
+    """Savings after `months` end-of-month contributions, with interest only while the balance is positive"""
+    switch = savings_switch_month(savings, monthly_rate, contribution)
+    earning = savings > 0
+    if months <= switch:
+        return _savings_phase(savings, monthly_rate, contribution, months, earning)
+    at_switch = _savings_phase(savings, monthly_rate, contribution, switch, earning)
+    return _savings_phase(at_switch, monthly_rate, contribution, months - switch, not earning)
+
+
+class Plan:
+    """Phases of a projection: full debt payments, the final partial payment, then debt-free saving"""
+
+    def __init__(self, income: float, expenses: float, savings: float, debt: float,
+                 savings_rate: float, debt_rate: float, payment: float):
+        self.cash_flow = income - expenses
+        self.savings = savings
+        self.debt = debt
+        self.savings_rate = savings_rate
+        self.debt_rate = debt_rate
+        self.payment = payment if debt > 0 else 0.0
+
+        payoff = payoff_months(debt, debt_rate, self.payment)
+        # Months with a full payment, and the final (smaller) payment that clears the debt
+        self.full_payments = math.inf if math.isinf(payoff) else float(math.ceil(payoff) - 1 if payoff > 0 else 0)
+        if debt > 0 and not math.isinf(payoff):
+            remaining = debt_after(debt, debt_rate, self.payment, self.full_payments)
+            self.final_payment = max(remaining, 0.0) * (1 + debt_rate)
+            self.debt_free_month: Optional[int] = int(self.full_payments) + 1
+        else:
+            self.final_payment = 0.0
+            self.debt_free_month = 0 if debt <= 0 else None
+
+        # Savings at the end of the debt phase, the start of debt-free saving
+        if self.debt_free_month:
+            during = savings_after(savings, savings_rate, self.cash_flow - self.payment, self.full_payments)
+            self.savings_when_debt_free = (during * (1 + savings_rate if during > 0 else 1)
+                                           + self.cash_flow - self.final_payment)
+        else:
+            self.savings_when_debt_free = savings
+
+    def at(self, month: float) -> Dict[str, float]:
+        """Savings and debt at the end of a month (closed form, no iteration)"""
+        if self.debt_free_month is None or month < (self.debt_free_month or 0):
+            # Still repaying (or never repaying)
+            return {'savings': savings_after(self.savings, self.savings_rate, self.cash_flow - self.payment, month),
+                    'debt': debt_after(self.debt, self.debt_rate, self.payment, month)}
+        extra = month - self.debt_free_month
+        return {'savings': savings_after(self.savings_when_debt_free, self.savings_rate, self.cash_flow, extra),
+                'debt': 0.0}
+
+
+def _savings_array(savings: float, monthly_rate: float, contribution: float, month: Any) -> Any:
+    """savings_after over an array of months"""
+    def phase(start: float, months: Any, earning: bool) -> Any:
+        if not earning or not monthly_rate:
+            return start + contribution * months
+        growth = np.exp(months * math.log1p(monthly_rate))
+        return start * growth + contribution * (growth - 1) / monthly_rate
+
+    switch = savings_switch_month(savings, monthly_rate, contribution)
+    earning = savings > 0
+    before = phase(savings, np.minimum(month, switch), earning)
+    if math.isinf(switch):
+        return before
+    at_switch = savings_after(savings, monthly_rate, contribution, switch)
+    return np.where(month <= switch, before, phase(at_switch, np.maximum(month - switch, 0), not earning))
+
+
+def _schedule(plan: Plan, months: int) -> Dict[str, List[float]]:
+    """Month-by-month balances, evaluated from the closed forms as arrays"""
+    if np is not None:
+        month = np.arange(1, months + 1, dtype=np.float64)
+        g_d = np.exp(month * math.log1p(plan.debt_rate))
+        ann_d = (g_d - 1) / plan.debt_rate if plan.debt_rate else month
+        repaying_savings = _savings_array(plan.savings, plan.savings_rate, plan.cash_flow - plan.payment, month)
+        repaying_debt = plan.debt * g_d - plan.payment * ann_d
+        if plan.debt_free_month is None:
+            savings, debt = repaying_savings, repaying_debt
+        else:
+            extra = np.maximum(month - plan.debt_free_month, 0)
+            free_savings = _savings_array(plan.savings_when_debt_free, plan.savings_rate, plan.cash_flow, extra)
+            paying = month < plan.debt_free_month
+            savings = np.where(paying, repaying_savings, free_savings)
+            debt = np.where(paying, repaying_debt, 0.0)
+        return {'month': month.astype(int).tolist(),
+                'savings': np.round(savings, 2).tolist(),
+                'debt': np.round(debt, 2).tolist()}
+
+    points = [plan.at(month) for month in range(1, months + 1)]
+    return {'month': list(range(1, months + 1)),
+            'savings': [round(point['savings'], 2) for point in points],
+            'debt': [round(point['debt'], 2) for point in points]}
+
+
+def build_plan(
+    income: float,
+    expenses: float,
+    savings: float,
+    debt: float,
+    career_path: Optional[str] = None,
+    savings_apr: Optional[float] = None,
+    debt_apr: Optional[float] = None,
+    debt_payment: Optional[float] = None
+) -> Plan:
+    """Resolve default rates and payment and build the closed-form plan for a player state"""
+    income, expenses, savings, debt = float(income), float(expenses), float(savings), max(float(debt), 0.0)
+    savings_apr = DEFAULT_SAVINGS_APR if savings_apr is None else float(savings_apr)
+    if debt_apr is None:
+        debt_apr = DEFAULT_DEBT_APR.get(str(career_path), FALLBACK_DEBT_APR)
+    payment = default_debt_payment(income, expenses, debt) if debt_payment is None else max(float(debt_payment), 0.0)
+    return Plan(income, expenses, savings, debt, savings_apr / 12, float(debt_apr) / 12, payment)
+
+
+def fast_forward(
+    income: float,
+    expenses: float,
+    savings: float,
+    debt: float,
+    months: int,
+    career_path: Optional[str] = None,
+    savings_apr: Optional[float] = None,
+    debt_apr: Optional[float] = None,
+    debt_payment: Optional[float] = None,
+    include_schedule: bool = False
+) -> Dict[str, Any]:
+    """
+    Project the player's finances `months` months ahead
+
+    Each month the cash flow (income - expenses) is received, the debt accrues interest and
+    takes a fixed payment until cleared, and the rest of the cash flow goes to savings,
+    which earn interest while positive. Negative savings are not charged overdraft interest.
+
+    Args:
+        income: Monthly income
+        expenses: Monthly expenses
+        savings: Current savings
+        debt: Current debt
+        months: Number of months to fast-forward
+        career_path: Career, used to pick the default debt rate
+        savings_apr: Annual savings rate (default 4%)
+        debt_apr: Annual debt rate (default depends on the career)
+        debt_payment: Monthly debt payment (default half of a positive cash flow)
+        include_schedule: Also return month-by-month balances
+
+    Returns:
+        Dictionary with the end state and, optionally, the schedule
+    """
+    months = max(int(months), 0)
+    plan = build_plan(income, expenses, savings, debt, career_path, savings_apr, debt_apr, debt_payment)
+    payment, debt, savings = plan.payment, plan.debt, plan.savings
+    end = plan.at(months)
+
+    # Interest follows from the balances: what went in versus what came out
+    debt_paid = (payment * min(plan.full_payments, months)
+                 + (plan.final_payment if plan.debt_free_month and plan.debt_free_month <= months else 0.0))
+    debt_interest = end['debt'] - debt + debt_paid
+    contributions = plan.cash_flow * months - debt_paid
+    savings_interest = end['savings'] - savings - contributions
+
+    result: Dict[str, Any] = {
+        'months': months,
+        'savings': round(end['savings'], 2),
+        'debt': round(end['debt'], 2),
+        'net_worth': round(end['savings'] - end['debt'], 2),
+        'monthly_debt_payment': round(payment, 2),
+        'debt_free_month': plan.debt_free_month,
+        'debt_interest_paid': round(debt_interest, 2),
+        'savings_interest_earned': round(savings_interest, 2)
+    }
+    if include_schedule:
+        result['schedule'] = _schedule(plan, months)
+    return result
+
+
+def outlook(income: float, expenses: float, savings: float, debt: float, career_path: Optional[str] = None) -> Dict[str, Any]:
+    """Compact five-year outlook attached to every turn"""
+    projection = fast_forward(income, expenses, savings, debt, OUTLOOK_MONTHS, career_path)
+    return {key: projection[key] for key in ('months', 'savings', 'debt', 'net_worth', 'debt_free_month')}
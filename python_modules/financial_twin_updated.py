@@ -7,7 +7,7 @@ import json
 import math
 import sys
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
 # Add the project root to the Python path to support both direct and relative imports
@@ -16,8 +16,32 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Setup module imports that can work both when imported directly or as part of a package
 try:
     from python_modules.abacusai import AgentResponse, ApiClient
+    from python_modules import tracing, narration, narration_pool, speculation, prompt_budget, narrative_jobs, fast_forward, goals, decision_preview, policy, achievement_engine, achievement_index, sessions, xp_ledger, event_log, crisis_engine, scenario_deck, money, tax_engine, health_metrics, state_history, tips, prompt_cache
 except ImportError:
     from abacusai import AgentResponse, ApiClient
+    import tracing
+    import narration
+    import prompt_budget
+    import narrative_jobs
+    import narration_pool
+    import speculation
+    import fast_forward
+    import goals
+    import decision_preview
+    import policy
+    import achievement_engine
+    import achievement_index
+    import sessions
+    import xp_ledger
+    import event_log
+    import crisis_engine
+    import scenario_deck
+    import money
+    import tax_engine
+    import health_metrics
+    import state_history
+    import tips
+    import prompt_cache
 
 class AbacusResponse:
     """Simple response class to mimic the structure of API responses"""
@@ -35,24 +59,800 @@ class AbacusResponse:
         """Convert the response to a JSON string"""
         return json.dumps(self.to_dict())
 
+# Gross annual pay of each career, with its student loan plan and how its National Insurance is paid
+CAREER_PAY = {
+    'Student': {'gross_salary': 10800, 'student_loan_plan': 'plan_5', 'employment': 'employed'},
+    'Entrepreneur': {'gross_salary': 37500, 'student_loan_plan': 'plan_1', 'employment': 'self_employed'},
+    'Artist': {'gross_salary': 23150, 'student_loan_plan': 'plan_2', 'employment': 'self_employed'},
+    'Banker': {'gross_salary': 95500, 'student_loan_plan': None, 'employment': 'employed'}
+}
+
+# Define initial financial values for each career path (in GBP £); income is the monthly take-home pay of the gross salary
+CAREER_DATA = {
+    'Student': {'income': tax_engine.net_monthly_income(**CAREER_PAY['Student']), 'expenses': 850.0, 'savings': 400.0, 'debt': 15000.0},
+    'Entrepreneur': {'income': tax_engine.net_monthly_income(**CAREER_PAY['Entrepreneur']), 'expenses': 2000.0, 'savings': 8000.0, 'debt': 40000.0},
+    'Artist': {'income': tax_engine.net_monthly_income(**CAREER_PAY['Artist']), 'expenses': 1500.0, 'savings': 1500.0, 'debt': 12000.0},
+    'Banker': {'income': tax_engine.net_monthly_income(**CAREER_PAY['Banker']), 'expenses': 4000.0, 'savings': 25000.0, 'debt': 8000.0}
+}
+
+# UK-specific initial decision options for each career path
+CAREER_DECISIONS = {
+    'Student': [
+        {
+            'value': 'budget_tightly',
+            'label': 'Budget Tightly',
+            'description': 'Cut all non-essential spending to maximize savings',
+            'impact': {'savings': 15, 'debt': 0, 'income': 0, 'expenses': -20}
+        },
+        {
+            'value': 'find_part_time_job',
+            'label': 'Find Part-Time Job',
+            'description': 'Look for work in a pub or shop to supplement your maintenance loan',
+            'impact': {'savings': 5, 'debt': 0, 'income': 25, 'expenses': 5}
+        },
+        {
+            'value': 'student_discount_focus',
+            'label': 'Maximise Student Discounts',
+            'description': 'Sign up for TOTUM card and student offers',
+            'impact': {'savings': 5, 'debt': 0, 'income': 0, 'expenses': -10}
+        },
+        {
+            'value': 'loan_repayment_planning',
+            'label': 'Student Loan Planning',
+            'description': 'Understand repayment thresholds and plan your finances',
+            'impact': {'savings': 0, 'debt': -5, 'income': 0, 'expenses': 0}
+        }
+    ],
+    'Entrepreneur': [
+        {
+            'value': 'bootstrap_business',
+            'label': 'Bootstrap Your Business',
+            'description': 'Minimize expenses and grow slowly without external funding',
+            'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': -15}
+        },
+        {
+            'value': 'seek_angel_investment',
+            'label': 'Seek Angel Investment',
+            'description': 'Pitch to UK angel investors for early funding',
+            'impact': {'savings': 30, 'debt': 0, 'income': 20, 'expenses': 15}
+        },
+        {
+            'value': 'apply_startup_loan',
+            'label': 'Apply for Start Up Loan',
+            'description': 'Apply for a UK government-backed Start Up Loan',
+            'impact': {'savings': 25, 'debt': 20, 'income': 15, 'expenses': 10}
+        },
+        {
+            'value': 'revenue_focus',
+            'label': 'Focus on Early Revenue',
+            'description': 'Prioritize paying customers and positive cash flow',
+            'impact': {'savings': 10, 'debt': -5, 'income': 15, 'expenses': 0}
+        }
+    ],
+    'Artist': [
+        {
+            'value': 'arts_council_grant',
+            'label': 'Apply for Arts Council Grant',
+            'description': 'Seek funding from Arts Council England',
+            'impact': {'savings': 20, 'debt': 0, 'income': 15, 'expenses': 5}
+        },
+        {
+            'value': 'teaching_workshops',
+            'label': 'Teach Art Workshops',
+            'description': 'Supplement income by teaching your skills',
+            'impact': {'savings': 5, 'debt': 0, 'income': 20, 'expenses': 3}
+        },
+        {
+            'value': 'digital_platforms',
+            'label': 'Sell on Digital Platforms',
+            'description': 'Use UK platforms like Etsy and Not On The High Street',
+            'impact': {'savings': 8, 'debt': 0, 'income': 12, 'expenses': 5}
+        },
+        {
+            'value': 'shared_studio_space',
+            'label': 'Join Shared Studio',
+            'description': 'Share studio costs with other artists',
+            'impact': {'savings': 5, 'debt': 0, 'income': 0, 'expenses': -15}
+        }
+    ],
+    'Banker': [
+        {
+            'value': 'maximise_pension',
+            'label': 'Maximise Pension Contributions',
+            'description': 'Take advantage of tax relief and employer matching',
+            'impact': {'savings': 25, 'debt': 0, 'income': -5, 'expenses': 0}
+        },
+        {
+            'value': 'invest_isa',
+            'label': 'Invest in Stocks & Shares ISA',
+            'description': 'Use your annual ISA allowance for tax-efficient investing',
+            'impact': {'savings': -10, 'debt': 0, 'income': 8, 'expenses': 0}
+        },
+        {
+            'value': 'property_investment',
+            'label': 'UK Property Investment',
+            'description': 'Invest in the British property market',
+            'impact': {'savings': -30, 'debt': 20, 'income': 15, 'expenses': 10}
+        },
+        {
+            'value': 'professional_development',
+            'label': 'Professional Qualifications',
+            'description': 'Invest in CFA or other financial certifications',
+            'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 5}
+        }
+    ]
+}
+
+# UK-specific scenarios for each career, each with its own decision options
+SCENARIOS_WITH_OPTIONS = {
+    'Student': [
+        {
+            'scenario': "Your student maintenance loan payment from Student Finance England is due soon, but your expenses are higher than expected. How will you manage your finances?",
+            'options': [
+                {
+                    'value': 'budget_review',
+                    'label': 'Review Your Budget',
+                    'description': 'Analyze your spending and cut non-essentials',
+                    'impact': {'savings': 10, 'debt': 0, 'income': 0, 'expenses': -15}
+                },
+                {
+                    'value': 'hardship_fund',
+                    'label': 'Apply for Hardship Fund',
+                    'description': 'Contact your university\'s financial support team',
+                    'impact': {'savings': 20, 'debt': 0, 'income': 15, 'expenses': 0}
+                },
+                {
+                    'value': 'overdraft_extension',
+                    'label': 'Use Student Overdraft',
+                    'description': 'Extend your interest-free student overdraft temporarily',
+                    'impact': {'savings': 0, 'debt': 10, 'income': 0, 'expenses': 0}
+                },
+                {
+                    'value': 'part_time_bar_work',
+                    'label': 'Find Weekend Bar Work',
+                    'description': 'Look for shifts in the Student Union or local pubs',
+                    'impact': {'savings': 5, 'debt': 0, 'income': 20, 'expenses': 5}
+                }
+            ]
+        },
+        {
+            'scenario': "The new term is starting at uni, and you need to purchase textbooks. You can buy new, get used ones from the SU shop, or find digital versions. What\'s your plan?",
+            'options': [
+                {
+                    'value': 'buy_new_books',
+                    'label': 'Buy New Textbooks',
+                    'description': 'Purchase all required textbooks brand new',
+                    'impact': {'savings': -25, 'debt': 0, 'income': 0, 'expenses': 5}
+                },
+                {
+                    'value': 'second_hand_books',
+                    'label': 'Shop at the SU',
+                    'description': 'Buy second-hand books from the Student Union shop',
+                    'impact': {'savings': -10, 'debt': 0, 'income': 0, 'expenses': 3}
+                },
+                {
+                    'value': 'digital_resources',
+                    'label': 'Use Digital Resources',
+                    'description': 'Find e-books and online alternatives',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 0, 'expenses': 1}
+                },
+                {
+                    'value': 'library_borrowing',
+                    'label': 'Borrow from Library',
+                    'description': 'Use the university library resources',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 0, 'expenses': 0}
+                }
+            ]
+        },
+        {
+            'scenario': "Your laptop needs replacing before assignment deadlines. You could use your overdraft, ask parents for help, or use the uni computer labs. What will you do?",
+            'options': [
+                {
+                    'value': 'buy_new_laptop',
+                    'label': 'Buy a New Laptop',
+                    'description': 'Purchase a new computer using your overdraft',
+                    'impact': {'savings': -10, 'debt': 30, 'income': 0, 'expenses': 5}
+                },
+                {
+                    'value': 'ask_parents',
+                    'label': 'Ask Parents for Help',
+                    'description': 'See if your family can contribute to a new laptop',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 25, 'expenses': 0}
+                },
+                {
+                    'value': 'use_uni_computers',
+                    'label': 'Use University Facilities',
+                    'description': 'Work in the computer labs and library',
+                    'impact': {'savings': 5, 'debt': 0, 'income': 0, 'expenses': 5}
+                },
+                {
+                    'value': 'refurbished_laptop',
+                    'label': 'Buy Refurbished',
+                    'description': 'Get a cheaper refurbished model',
+                    'impact': {'savings': -15, 'debt': 5, 'income': 0, 'expenses': 2}
+                }
+            ]
+        },
+        {
+            'scenario': "Your flatmates are planning a holiday to Spain during reading week. It would cost £450 but could be a great experience. How do you handle this?",
+            'options': [
+                {
+                    'value': 'go_on_holiday',
+                    'label': 'Join the Holiday',
+                    'description': 'Spend £450 on the trip to Spain',
+                    'impact': {'savings': -30, 'debt': 10, 'income': 0, 'expenses': 20}
+                },
+                {
+                    'value': 'budget_staycation',
+                    'label': 'Plan a Staycation',
+                    'description': 'Suggest more affordable UK activities',
+                    'impact': {'savings': -10, 'debt': 0, 'income': 0, 'expenses': 8}
+                },
+                {
+                    'value': 'skip_holiday',
+                    'label': 'Skip the Holiday',
+                    'description': 'Focus on studying and saving money',
+                    'impact': {'savings': 15, 'debt': 0, 'income': 5, 'expenses': -5}
+                },
+                {
+                    'value': 'extra_work_hours',
+                    'label': 'Work Extra Hours',
+                    'description': 'Pick up additional shifts to fund the trip',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 15}
+                }
+            ]
+        },
+        {
+            'scenario': "You\'ve received a £300 bursary from your university. Will you save it in your ISA, use it for everyday expenses, or invest in a professional development course?",
+            'options': [
+                {
+                    'value': 'save_in_isa',
+                    'label': 'Save in Cash ISA',
+                    'description': 'Put the money in a tax-free savings account',
+                    'impact': {'savings': 30, 'debt': 0, 'income': 1, 'expenses': 0}
+                },
+                {
+                    'value': 'everyday_expenses',
+                    'label': 'Cover Living Costs',
+                    'description': 'Use it for rent, groceries and bills',
+                    'impact': {'savings': 0, 'debt': -5, 'income': 0, 'expenses': -10}
+                },
+                {
+                    'value': 'professional_course',
+                    'label': 'Take a Development Course',
+                    'description': 'Invest in skills that may increase future earnings',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 8, 'expenses': 5}
+                },
+                {
+                    'value': 'split_bursary',
+                    'label': 'Split the Money',
+                    'description': 'Save half, spend half on necessities',
+                    'impact': {'savings': 15, 'debt': -2, 'income': 0, 'expenses': -5}
+                }
+            ]
+        }
+    ],
+    'Entrepreneur': [
+        {
+            'scenario': "A potential angel investor from London Tech Angels is interested in your startup. They offer £50,000 funding but want 25% equity. What\'s your decision?",
+            'options': [
+                {
+                    'value': 'accept_investment',
+                    'label': 'Accept the Offer',
+                    'description': 'Take the £50,000 investment for 25% equity',
+                    'impact': {'savings': 50, 'debt': -20, 'income': 25, 'expenses': 15}
+                },
+                {
+                    'value': 'negotiate_terms',
+                    'label': 'Negotiate Better Terms',
+                    'description': 'Counter with 15% equity for the same investment',
+                    'impact': {'savings': 20, 'debt': 0, 'income': 10, 'expenses': 5}
+                },
+                {
+                    'value': 'decline_investment',
+                    'label': 'Decline the Offer',
+                    'description': 'Keep full ownership and bootstrap the business',
+                    'impact': {'savings': -10, 'debt': 15, 'income': 5, 'expenses': -5}
+                },
+                {
+                    'value': 'seek_alternatives',
+                    'label': 'Explore Other Funding',
+                    'description': 'Look into UK government startup grants and loans',
+                    'impact': {'savings': 10, 'debt': 10, 'income': 5, 'expenses': 0}
+                }
+            ]
+        },
+        {
+            'scenario': "Your business is growing and you\'re stretched thin. You can hire a part-time assistant for £1,200/month or work longer hours yourself. What will you do?",
+            'options': [
+                {
+                    'value': 'hire_assistant',
+                    'label': 'Hire a Part-time Assistant',
+                    'description': 'Pay £1,200/month for professional help',
+                    'impact': {'savings': -12, 'debt': 0, 'income': 15, 'expenses': 12}
+                },
+                {
+                    'value': 'work_longer',
+                    'label': 'Work Longer Hours',
+                    'description': 'Handle everything yourself to save money',
+                    'impact': {'savings': 10, 'debt': 0, 'income': 5, 'expenses': -5}
+                },
+                {
+                    'value': 'outsource_tasks',
+                    'label': 'Use Freelancers',
+                    'description': 'Outsource specific tasks on platforms like Fiverr',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 8}
+                },
+                {
+                    'value': 'business_automation',
+                    'label': 'Invest in Automation',
+                    'description': 'Implement software to streamline operations',
+                    'impact': {'savings': -15, 'debt': 5, 'income': 12, 'expenses': -8}
+                }
+            ]
+        },
+        {
+            'scenario': "A competitor in your industry is closing down and offers to sell their client list for £5,000. It could bring in new business but is pricey. What\'s your choice?",
+            'options': [
+                {
+                    'value': 'buy_client_list',
+                    'label': 'Purchase the Client List',
+                    'description': 'Invest £5,000 to acquire potential new customers',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 5}
+                },
+                {
+                    'value': 'negotiate_price',
+                    'label': 'Negotiate a Lower Price',
+                    'description': 'Try to get the list for £2,500',
+                    'impact': {'savings': -8, 'debt': 0, 'income': 15, 'expenses': 3}
+                },
+                {
+                    'value': 'decline_purchase',
+                    'label': 'Focus on Organic Growth',
+                    'description': 'Build your client base through marketing instead',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 8, 'expenses': 10}
+                },
+                {
+                    'value': 'partnership_offer',
+                    'label': 'Offer a Partnership',
+                    'description': 'Propose a commission-based referral arrangement',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 12, 'expenses': 7}
+                }
+            ]
+        },
+        {
+            'scenario': "You have £8,000 to invest in your business. You can either upgrade your equipment or invest in digital marketing with a London agency. Which path do you choose?",
+            'options': [
+                {
+                    'value': 'upgrade_equipment',
+                    'label': 'Upgrade Equipment',
+                    'description': 'Invest in better equipment to improve productivity',
+                    'impact': {'savings': -20, 'debt': 0, 'income': 15, 'expenses': -10}
+                },
+                {
+                    'value': 'digital_marketing',
+                    'label': 'Hire a Marketing Agency',
+                    'description': 'Invest in professional digital marketing services',
+                    'impact': {'savings': -20, 'debt': 0, 'income': 30, 'expenses': 10}
+                },
+                {
+                    'value': 'split_investment',
+                    'label': 'Split the Investment',
+                    'description': 'Allocate funds to both equipment and marketing',
+                    'impact': {'savings': -20, 'debt': 0, 'income': 22, 'expenses': 0}
+                },
+                {
+                    'value': 'training_development',
+                    'label': 'Invest in Skills Development',
+                    'description': 'Take courses to enhance your business capabilities',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 18, 'expenses': -5}
+                }
+            ]
+        },
+        {
+            'scenario': "There\'s an opportunity to expand your business to Manchester, but it requires £15,000 upfront for a new location. How do you proceed?",
+            'options': [
+                {
+                    'value': 'expand_location',
+                    'label': 'Open the Manchester Office',
+                    'description': 'Invest £15,000 to expand to a new location',
+                    'impact': {'savings': -30, 'debt': 20, 'income': 40, 'expenses': 25}
+                },
+                {
+                    'value': 'virtual_presence',
+                    'label': 'Establish Virtual Presence',
+                    'description': 'Use co-working spaces and virtual meetings instead',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 15, 'expenses': 8}
+                },
+                {
+                    'value': 'partnership_expansion',
+                    'label': 'Find a Local Partner',
+                    'description': 'Partner with an existing Manchester business',
+                    'impact': {'savings': -10, 'debt': 0, 'income': 20, 'expenses': 10}
+                },
+                {
+                    'value': 'delay_expansion',
+                    'label': 'Delay Expansion Plans',
+                    'description': 'Build more capital before expanding',
+                    'impact': {'savings': 10, 'debt': -5, 'income': 5, 'expenses': 0}
+                }
+            ]
+        }
+    ],
+    'Artist': [
+        {
+            'scenario': "A popular gallery in Bristol offers to showcase your work, but you need to pay £600 for the space upfront. Is this a worthwhile investment?",
+            'options': [
+                {
+                    'value': 'pay_gallery_fee',
+                    'label': 'Pay the Gallery Fee',
+                    'description': 'Invest £600 to showcase your work',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 5}
+                },
+                {
+                    'value': 'negotiate_commission',
+                    'label': 'Negotiate a Commission Deal',
+                    'description': 'Offer a higher commission on sales instead of upfront fee',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 15, 'expenses': 0}
+                },
+                {
+                    'value': 'find_alternative_venue',
+                    'label': 'Look for a Different Venue',
+                    'description': 'Search for cafes or community spaces with lower fees',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 3}
+                },
+                {
+                    'value': 'online_exhibition',
+                    'label': 'Focus on Online Exhibition',
+                    'description': 'Invest in a virtual gallery on your website instead',
+                    'impact': {'savings': -8, 'debt': 0, 'income': 12, 'expenses': 2}
+                }
+            ]
+        },
+        {
+            'scenario': "You need supplies for your next project. You can invest £400 in premium materials or £150 in basic supplies. What\'s your approach?",
+            'options': [
+                {
+                    'value': 'premium_materials',
+                    'label': 'Buy Premium Materials',
+                    'description': 'Invest £400 in high-quality supplies',
+                    'impact': {'savings': -12, 'debt': 0, 'income': 20, 'expenses': 5}
+                },
+                {
+                    'value': 'basic_supplies',
+                    'label': 'Use Basic Supplies',
+                    'description': 'Spend £150 on standard materials',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 3}
+                },
+                {
+                    'value': 'mixed_approach',
+                    'label': 'Mix Premium and Basic',
+                    'description': 'Use premium materials for key elements only',
+                    'impact': {'savings': -8, 'debt': 0, 'income': 15, 'expenses': 4}
+                },
+                {
+                    'value': 'upcycled_materials',
+                    'label': 'Use Upcycled Materials',
+                    'description': 'Create art from repurposed or found objects',
+                    'impact': {'savings': -2, 'debt': 0, 'income': 8, 'expenses': 1}
+                }
+            ]
+        },
+        {
+            'scenario': "A prestigious client offers a rush commission that pays £1,200, but you\'ll need to cancel other commitments worth £800. What do you do?",
+            'options': [
+                {
+                    'value': 'accept_commission',
+                    'label': 'Accept the Rush Commission',
+                    'description': 'Take the £1,200 job and cancel other commitments',
+                    'impact': {'savings': 10, 'debt': 0, 'income': 12, 'expenses': 0}
+                },
+                {
+                    'value': 'negotiate_deadline',
+                    'label': 'Negotiate the Deadline',
+                    'description': 'Try to keep all commitments by adjusting timelines',
+                    'impact': {'savings': 15, 'debt': 0, 'income': 20, 'expenses': 5}
+                },
+                {
+                    'value': 'honor_commitments',
+                    'label': 'Honor Existing Commitments',
+                    'description': 'Decline the rush job to maintain relationships',
+                    'impact': {'savings': 5, 'debt': 0, 'income': 8, 'expenses': 0}
+                },
+                {
+                    'value': 'outsource_work',
+                    'label': 'Collaborate with Another Artist',
+                    'description': 'Share the commission with another artist to manage all work',
+                    'impact': {'savings': 3, 'debt': 0, 'income': 10, 'expenses': 4}
+                }
+            ]
+        },
+        {
+            'scenario': "The Royal College of Art is offering a specialized workshop that could enhance your skills, but it costs £850. How do you handle this opportunity?",
+            'options': [
+                {
+                    'value': 'pay_for_workshop',
+                    'label': 'Attend the Workshop',
+                    'description': 'Invest £850 in your professional development',
+                    'impact': {'savings': -20, 'debt': 5, 'income': 15, 'expenses': 0}
+                },
+                {
+                    'value': 'apply_for_grant',
+                    'label': 'Apply for an Arts Council Grant',
+                    'description': 'Seek funding to cover the workshop costs',
+                    'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 0}
+                },
+                {
+                    'value': 'self_taught_alternative',
+                    'label': 'Learn Through Online Resources',
+                    'description': 'Find free or low-cost alternatives for skill development',
+                    'impact': {'savings': -2, 'debt': 0, 'income': 5, 'expenses': 0}
+                },
+                {
+                    'value': 'skill_exchange',
+                    'label': 'Offer a Skill Exchange',
+                    'description': 'Propose teaching a workshop in exchange for attendance',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 8, 'expenses': 3}
+                }
+            ]
+        },
+        {
+            'scenario': "Not On The High Street wants to feature your work on their platform but takes a 35% commission. Will you join their marketplace?",
+            'options': [
+                {
+                    'value': 'join_marketplace',
+                    'label': 'Join Not On The High Street',
+                    'description': 'Accept the 35% commission for greater exposure',
+                    'impact': {'savings': 5, 'debt': 0, 'income': 25, 'expenses': 8}
+                },
+                {
+                    'value': 'negotiate_terms',
+                    'label': 'Negotiate Commission Rate',
+                    'description': 'Try to secure a lower commission percentage',
+                    'impact': {'savings': 8, 'debt': 0, 'income': 15, 'expenses': 5}
+                },
+                {
+                    'value': 'independent_shop',
+                    'label': 'Focus on Your Own Shop',
+                    'description': 'Invest in your own Shopify or Etsy store instead',
+                    'impact': {'savings': -10, 'debt': 0, 'income': 18, 'expenses': 12}
+                },
+                {
+                    'value': 'selective_listing',
+                    'label': 'List Selected Items Only',
+                    'description': 'Put only high-margin items on the marketplace',
+                    'impact': {'savings': 3, 'debt': 0, 'income': 12, 'expenses': 4}
+                }
+            ]
+        }
+    ],
+    'Banker': [
+        {
+            'scenario': "Your company offers share options as part of your bonus package. Will you exercise them (worth potentially £8,000) or take the cash equivalent of £5,500?",
+            'options': [
+                {
+                    'value': 'exercise_options',
+                    'label': 'Exercise Share Options',
+                    'description': 'Take the £8,000 in company shares',
+                    'impact': {'savings': 20, 'debt': 0, 'income': 5, 'expenses': 0}
+                },
+                {
+                    'value': 'take_cash',
+                    'label': 'Take Cash Bonus',
+                    'description': 'Accept the £5,500 cash equivalent',
+                    'impact': {'savings': 15, 'debt': -10, 'income': 0, 'expenses': 0}
+                },
+                {
+                    'value': 'split_bonus',
+                    'label': 'Split Between Cash and Shares',
+                    'description': 'Take half in shares and half in cash',
+                    'impact': {'savings': 18, 'debt': -5, 'income': 3, 'expenses': 0}
+                },
+                {
+                    'value': 'defer_decision',
+                    'label': 'Defer the Decision',
+                    'description': 'Wait for a better share price before deciding',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 10, 'expenses': 0}
+                }
+            ]
+        },
+        {
+            'scenario': "You\'ve spotted a promising investment opportunity in UK tech stocks, but it's relatively high-risk. Will you invest £10,000 from your portfolio?",
+            'options': [
+                {
+                    'value': 'invest_tech_stocks',
+                    'label': 'Invest £10,000',
+                    'description': 'Make the full investment in UK tech stocks',
+                    'impact': {'savings': -25, 'debt': 0, 'income': 35, 'expenses': 0}
+                },
+                {
+                    'value': 'partial_investment',
+                    'label': 'Invest £5,000',
+                    'description': 'Make a smaller investment to limit exposure',
+                    'impact': {'savings': -12, 'debt': 0, 'income': 15, 'expenses': 0}
+                },
+                {
+                    'value': 'diversified_approach',
+                    'label': 'Diversify Your Investment',
+                    'description': 'Spread £10,000 across tech stocks and safer options',
+                    'impact': {'savings': -25, 'debt': 0, 'income': 20, 'expenses': 0}
+                },
+                {
+                    'value': 'research_further',
+                    'label': 'Conduct More Research',
+                    'description': 'Hold off on investing until you gather more information',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 5, 'expenses': 0}
+                }
+            ]
+        },
+        {
+            'scenario': "A Chartered Financial Analyst qualification could advance your career but costs £5,000 and requires significant study time. Is this the right move?",
+            'options': [
+                {
+                    'value': 'pursue_cfa',
+                    'label': 'Pursue CFA Qualification',
+                    'description': 'Invest £5,000 in the CFA program',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 30, 'expenses': 5}
+                },
+                {
+                    'value': 'employer_sponsorship',
+                    'label': 'Request Employer Sponsorship',
+                    'description': 'Ask your bank to cover the qualification costs',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 20, 'expenses': 0}
+                },
+                {
+                    'value': 'alternative_qualification',
+                    'label': 'Consider Alternative Certifications',
+                    'description': 'Look into less expensive qualifications with similar benefits',
+                    'impact': {'savings': -8, 'debt': 0, 'income': 15, 'expenses': 3}
+                },
+                {
+                    'value': 'focus_on_experience',
+                    'label': 'Focus on Practical Experience',
+                    'description': 'Build expertise through projects rather than certifications',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 10, 'expenses': 0}
+                }
+            ]
+        },
+        {
+            'scenario': "You have £20,000 to invest. You can choose between a safe FTSE tracker fund or active management with higher potential returns. What\'s your strategy?",
+            'options': [
+                {
+                    'value': 'ftse_tracker',
+                    'label': 'FTSE Tracker Fund',
+                    'description': 'Invest in a low-cost FTSE 100 index fund',
+                    'impact': {'savings': -20, 'debt': 0, 'income': 15, 'expenses': 0}
+                },
+                {
+                    'value': 'active_management',
+                    'label': 'Active Fund Management',
+                    'description': 'Choose a professionally managed fund with higher fees',
+                    'impact': {'savings': -20, 'debt': 0, 'income': 25, 'expenses': 5}
+                },
+                {
+                    'value': 'mixed_portfolio',
+                    'label': 'Build a Mixed Portfolio',
+                    'description': 'Allocate funds across both passive and active investments',
+                    'impact': {'savings': -20, 'debt': 0, 'income': 20, 'expenses': 3}
+                },
+                {
+                    'value': 'property_investment',
+                    'label': 'Invest in Property',
+                    'description': 'Use as deposit for a buy-to-let property investment',
+                    'impact': {'savings': -20, 'debt': 20, 'income': 30, 'expenses': 15}
+                }
+            ]
+        },
+        {
+            'scenario': "A fintech startup approaches you to become an early investor with £15,000 for a 3% stake. How do you respond to this opportunity?",
+            'options': [
+                {
+                    'value': 'invest_startup',
+                    'label': 'Invest in the Startup',
+                    'description': 'Provide £15,000 for a 3% equity stake',
+                    'impact': {'savings': -30, 'debt': 0, 'income': 40, 'expenses': 0}
+                },
+                {
+                    'value': 'negotiate_equity',
+                    'label': 'Negotiate for More Equity',
+                    'description': 'Counter with £15,000 for 5% stake',
+                    'impact': {'savings': -30, 'debt': 0, 'income': 20, 'expenses': 0}
+                },
+                {
+                    'value': 'smaller_investment',
+                    'label': 'Make a Smaller Investment',
+                    'description': 'Offer £7,500 for a 1.5% stake',
+                    'impact': {'savings': -15, 'debt': 0, 'income': 20, 'expenses': 0}
+                },
+                {
+                    'value': 'decline_opportunity',
+                    'label': 'Decline the Opportunity',
+                    'description': 'Focus on more established investments',
+                    'impact': {'savings': 0, 'debt': 0, 'income': 0, 'expenses': 0}
+                }
+            ]
+        }
+    ]
+}
+
+# UK-specific crisis events that can strike after a decision
+CRISIS_EVENTS = {
+    'NHS Dental Treatment': {'cost': 280, 'message': 'You needed unexpected dental work not fully covered by the NHS.'},
+    'Zero Hours Contract': {'income_reduction': 0.25, 'message': 'Your hours were cut on your zero-hours contract.'},
+    'Boiler Breakdown': {'cost': 850, 'message': 'Your home boiler broke down and needed emergency repairs.'},
+    'Council Tax Arrears': {'cost': 450, 'message': 'You received a notice for council tax arrears that must be paid.'},
+    'Train Fare Increase': {'cost': 200, 'message': 'Your monthly rail commuting costs increased unexpectedly.'},
+    'Letting Agency Fees': {'cost': 300, 'message': 'You faced unexpected letting agency fees during a house move.'}
+}
+
+# Chance of a crisis in a turn by savings buffer after the decision: none, under three months of expenses, or more
+CRISIS_PROBABILITY_BY_BUFFER = {'no_buffer': 0.25, 'thin': 0.2, 'cushioned': 0.15}
+
+# How likely each crisis is relative to the others, per career (unlisted crises weigh 1)
+CRISIS_CAREER_WEIGHTS = {
+    # Full-time students are exempt from council tax and rarely own a boiler, but often work zero-hours jobs and rent
+    'Student': {'Zero Hours Contract': 2.0, 'Letting Agency Fees': 1.5, 'Boiler Breakdown': 0.5, 'Council Tax Arrears': 0.25},
+    'Artist': {'Zero Hours Contract': 2.0, 'Letting Agency Fees': 1.5},
+    'Entrepreneur': {'Zero Hours Contract': 0.25, 'Council Tax Arrears': 1.5},
+    'Banker': {'Zero Hours Contract': 0.1, 'Train Fare Increase': 2.0, 'Boiler Breakdown': 1.5}
+}
+
+# Crises made more or less likely by the savings buffer (arrears build up when there is nothing to pay from)
+CRISIS_BUFFER_WEIGHTS = {
+    'no_buffer': {'Council Tax Arrears': 2.0},
+    'cushioned': {'Council Tax Arrears': 0.5}
+}
+
+CRISIS_ENGINE = crisis_engine.CrisisEngine(CRISIS_EVENTS, CRISIS_PROBABILITY_BY_BUFFER,
+                                           CRISIS_CAREER_WEIGHTS, CRISIS_BUFFER_WEIGHTS)
+
+# Achievements earned while a metric meets a threshold; evaluated by the achievement rule engine
+ACHIEVEMENT_RULES = [
+    {'name': 'Positive Cash Flow Master', 'metric': 'monthly_savings', 'op': '>', 'threshold': 0},
+    {'name': 'Strategic Saver', 'metric': 'savings_ratio', 'op': '>', 'threshold': 0.2},
+    {'name': 'Debt Management Expert', 'metric': 'debt_to_income_ratio', 'op': '<', 'threshold': 0.3},
+    {'name': 'Wealth Builder', 'metric': 'savings', 'op': '>', 'threshold': 50000},
+    {'name': 'Debt Free Champion', 'metric': 'debt', 'op': '==', 'threshold': 0}
+]
+ACHIEVEMENT_ENGINE = achievement_engine.AchievementEngine(ACHIEVEMENT_RULES)
+
+# Stable bit of every achievement. Never renumber or reuse a bit; new achievements take the next free one.
+ACHIEVEMENT_BITS = {
+    'Positive Cash Flow Master': 0,
+    'Strategic Saver': 1,
+    'Debt Management Expert': 2,
+    'Wealth Builder': 3,
+    'Debt Free Champion': 4,
+    'Savings Milestone': 5
+}
+ACHIEVEMENT_CATALOG = achievement_engine.AchievementCatalog(ACHIEVEMENT_BITS)
+
+# Response fields holding achievement lists, sent as bitsets when a client asks for them
+ACHIEVEMENT_LIST_FIELDS = ('achievements', 'new_achievements', 'unlocked_achievements', 'final_achievements')
+
+# Amounts returned by a turn (in pence from advance_turn_pence)
+TURN_MONEY_FIELDS = ('income', 'expenses', 'savings', 'debt', 'monthly_savings')
+
+# Amounts moved by the decision keywords, in pence
+INVESTMENT_COST = money.to_pence(1000)
+INVESTMENT_INCOME_GAIN = money.to_pence(200)
+INVESTMENT_SUCCESS_PROBABILITY = 0.7
+SAVINGS_DEPOSIT = money.to_pence(500)
+DEBT_PAYMENT_LIMIT = money.to_pence(2000)
+
 def get_level(xp: int) -> int:
     """Calculate level based on XP earned"""
     return math.floor(xp / 100) + 1
 
-def welcome_node_function(player_name: str, career_choice: str) -> AbacusResponse:
-    """
-    Welcome function for new players starting the game
-    
-    Args:
-        player_name: Player's name
-        career_choice: Selected career path (Student, Entrepreneur, Artist, Banker)
-        
-    Returns:
-        AbacusResponse containing welcome message and data
-    """
-    # ApiClient is already imported at the top of the file
-    client = ApiClient()
-    prompt = f'''You are a friendly game host. A new player named {player_name} has joined the game.
+# System messages for the narrative prompts
+WELCOME_SYSTEM_MESSAGE = 'As a game host, generate a welcoming message for the player. Be friendly, engaging, and set a positive tone for the game.'
+CONCLUSION_SYSTEM_MESSAGE = 'As a friendly game host, generate an uplifting conclusion message for the player. Be encouraging and positive, and present the UK financial tips you are given as advice for their career path.'
+INITIAL_STATUS_SYSTEM_MESSAGE = 'As a friendly financial game host, generate an engaging message for a UK player, presenting their initial financial status in British pounds (£), introducing the first financial challenge with UK-specific context, and asking them to make decisions.'
+
+def build_welcome_prompt(player_name: str, career_choice: str) -> str:
+    """Build the LLM prompt for the welcome message"""
+    career = career_choice.title() if hasattr(career_choice, "title") else career_choice
+    return f'''You are a friendly game host. A new player named {player_name} has joined the game.
 
 Introduce the player to the Interactive Financial Simulation Game where they will create a virtual financial twin and navigate through life's financial challenges.
 
@@ -63,167 +863,29 @@ Explain that they can choose from one of the following career paths, each with u
 3. Artist
 4. Banker
 
-They have chosen the career path: {career_choice.title() if hasattr(career_choice, "title") else career_choice}.
+They have chosen the career path: {career}.
 
-Provide an enthusiastic welcome message that acknowledges their choice and sets the stage for their journey as a {career_choice.title() if hasattr(career_choice, "title") else career_choice}.
+Provide an enthusiastic welcome message that acknowledges their choice and sets the stage for their journey as a {career}.
 '''
-    response = client.evaluate_prompt(prompt=prompt, system_message='As a game host, generate a welcoming message for the player. Be friendly, engaging, and set a positive tone for the game.').content
-    return AbacusResponse(response, career_path=career_choice)
 
-def initialize_financial_twin_function(career_path: str, acknowledge_status: str) -> AbacusResponse:
-    """
-    Initialize the financial data for the selected career path
+def build_initial_status_prompt(career_path: str) -> str:
+    """Build the LLM prompt presenting the initial status and first challenge for a career"""
+    financial_status = CAREER_DATA.get(str(career_path), {'income': 0.0, 'expenses': 0.0, 'savings': 0.0, 'debt': 0.0})
+    decision_options = CAREER_DECISIONS.get(str(career_path), [])
     
-    Args:
-        career_path: Selected career path
-        acknowledge_status: Acknowledgment of initial financial status
-        
-    Returns:
-        AbacusResponse containing initial status and financial data plus decision options
-    """
-    # ApiClient is already imported at the top of the file
-    client = ApiClient()
-    
-    # Define initial financial values for each career path (in GBP £)
-    career_data = {
-        'Student': {'income': 900.0, 'expenses': 850.0, 'savings': 400.0, 'debt': 15000.0},
-        'Entrepreneur': {'income': 2500.0, 'expenses': 2000.0, 'savings': 8000.0, 'debt': 40000.0},
-        'Artist': {'income': 1700.0, 'expenses': 1500.0, 'savings': 1500.0, 'debt': 12000.0},
-        'Banker': {'income': 5500.0, 'expenses': 4000.0, 'savings': 25000.0, 'debt': 8000.0}
-    }
-    
-    # UK-specific initial decision options for each career path
-    career_decisions = {
-        'Student': [
-            {
-                'value': 'budget_tightly',
-                'label': 'Budget Tightly',
-                'description': 'Cut all non-essential spending to maximize savings',
-                'impact': {'savings': 15, 'debt': 0, 'income': 0, 'expenses': -20}
-            },
-            {
-                'value': 'find_part_time_job',
-                'label': 'Find Part-Time Job',
-                'description': 'Look for work in a pub or shop to supplement your maintenance loan',
-                'impact': {'savings': 5, 'debt': 0, 'income': 25, 'expenses': 5}
-            },
-            {
-                'value': 'student_discount_focus',
-                'label': 'Maximise Student Discounts',
-                'description': 'Sign up for TOTUM card and student offers',
-                'impact': {'savings': 5, 'debt': 0, 'income': 0, 'expenses': -10}
-            },
-            {
-                'value': 'loan_repayment_planning',
-                'label': 'Student Loan Planning',
-                'description': 'Understand repayment thresholds and plan your finances',
-                'impact': {'savings': 0, 'debt': -5, 'income': 0, 'expenses': 0}
-            }
-        ],
-        'Entrepreneur': [
-            {
-                'value': 'bootstrap_business',
-                'label': 'Bootstrap Your Business',
-                'description': 'Minimize expenses and grow slowly without external funding',
-                'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': -15}
-            },
-            {
-                'value': 'seek_angel_investment',
-                'label': 'Seek Angel Investment',
-                'description': 'Pitch to UK angel investors for early funding',
-                'impact': {'savings': 30, 'debt': 0, 'income': 20, 'expenses': 15}
-            },
-            {
-                'value': 'apply_startup_loan',
-                'label': 'Apply for Start Up Loan',
-                'description': 'Apply for a UK government-backed Start Up Loan',
-                'impact': {'savings': 25, 'debt': 20, 'income': 15, 'expenses': 10}
-            },
-            {
-                'value': 'revenue_focus',
-                'label': 'Focus on Early Revenue',
-                'description': 'Prioritize paying customers and positive cash flow',
-                'impact': {'savings': 10, 'debt': -5, 'income': 15, 'expenses': 0}
-            }
-        ],
-        'Artist': [
-            {
-                'value': 'arts_council_grant',
-                'label': 'Apply for Arts Council Grant',
-                'description': 'Seek funding from Arts Council England',
-                'impact': {'savings': 20, 'debt': 0, 'income': 15, 'expenses': 5}
-            },
-            {
-                'value': 'teaching_workshops',
-                'label': 'Teach Art Workshops',
-                'description': 'Supplement income by teaching your skills',
-                'impact': {'savings': 5, 'debt': 0, 'income': 20, 'expenses': 3}
-            },
-            {
-                'value': 'digital_platforms',
-                'label': 'Sell on Digital Platforms',
-                'description': 'Use UK platforms like Etsy and Not On The High Street',
-                'impact': {'savings': 8, 'debt': 0, 'income': 12, 'expenses': 5}
-            },
-            {
-                'value': 'shared_studio_space',
-                'label': 'Join Shared Studio',
-                'description': 'Share studio costs with other artists',
-                'impact': {'savings': 5, 'debt': 0, 'income': 0, 'expenses': -15}
-            }
-        ],
-        'Banker': [
-            {
-                'value': 'maximise_pension',
-                'label': 'Maximise Pension Contributions',
-                'description': 'Take advantage of tax relief and employer matching',
-                'impact': {'savings': 25, 'debt': 0, 'income': -5, 'expenses': 0}
-            },
-            {
-                'value': 'invest_isa',
-                'label': 'Invest in Stocks & Shares ISA',
-                'description': 'Use your annual ISA allowance for tax-efficient investing',
-                'impact': {'savings': -10, 'debt': 0, 'income': 8, 'expenses': 0}
-            },
-            {
-                'value': 'property_investment',
-                'label': 'UK Property Investment',
-                'description': 'Invest in the British property market',
-                'impact': {'savings': -30, 'debt': 20, 'income': 15, 'expenses': 10}
-            },
-            {
-                'value': 'professional_development',
-                'label': 'Professional Qualifications',
-                'description': 'Invest in CFA or other financial certifications',
-                'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 5}
-            }
-        ]
-    }
-    
-    # Use the career data or default values if career not found
-    financial_status = career_data.get(str(career_path), {'income': 0.0, 'expenses': 0.0, 'savings': 0.0, 'debt': 0.0})
-    income = financial_status['income']
-    expenses = financial_status['expenses']
-    savings = financial_status['savings']
-    debt = financial_status['debt']
-    
-    # Get decision options for this career path
-    decision_options = career_decisions.get(str(career_path), [])
-    
-    # Create prompt for the AI with specific decision options
     # Format the decision options for the prompt
     formatted_options = ""
     for option in decision_options:
         formatted_options += f"- {option['label']}: {option['description']}\n"
     
-    prompt = f'''
+    return f'''
 You are a financial game host for UK players. A player has chosen the career path of {career_path}.
 
 Their initial financial status is:
-- Monthly Income: £{income} per month
-- Monthly Expenses: £{expenses} per month
-- Savings: £{savings}
-- Debt: £{debt}
+- Monthly Income: £{financial_status['income']} per month
+- Monthly Expenses: £{financial_status['expenses']} per month
+- Savings: £{financial_status['savings']}
+- Debt: £{financial_status['debt']}
 
 Present this initial financial status to the player, providing a clear breakdown using British pounds (£).
 
@@ -238,8 +900,123 @@ IMPORTANT: The scenario must relate directly to these exact options. Do not refe
 
 Use an engaging and motivating tone.
 '''
-    system_message = 'As a friendly financial game host, generate an engaging message for a UK player, presenting their initial financial status in British pounds (£), introducing the first financial challenge with UK-specific context, and asking them to make decisions. Keep the message under 500 words.'
-    response = client.evaluate_prompt(prompt=prompt, system_message=system_message).content
+
+def welcome_node_function(
+    player_name: str,
+    career_choice: str,
+    use_narration_pool: Optional[bool] = None,
+    narration_mode: Optional[str] = None
+) -> AbacusResponse:
+    """
+    Welcome function for new players starting the game
+    
+    Args:
+        player_name: Player's name
+        career_choice: Selected career path (Student, Entrepreneur, Artist, Banker)
+        use_narration_pool: Serve a pre-generated narrative if one is ready (defaults to the environment setting)
+        narration_mode: 'template' to narrate offline without the LLM (defaults to the environment setting)
+        
+    Returns:
+        AbacusResponse containing welcome message and data
+    """
+    career = career_choice.title() if hasattr(career_choice, "title") else career_choice
+    narration_context = {'player_name': player_name, 'career': career}
+    
+    # Offline narration straight from the templates
+    if narration.offline_mode(narration_mode):
+        with tracing.span('narration.render', intent=narration.WELCOME):
+            return AbacusResponse(narration.render(narration.WELCOME, narration_context), career_path=career_choice)
+    
+    # Serve a pre-generated welcome personalised with the player's name when available
+    if narration_pool.pool_enabled(use_narration_pool):
+        with tracing.span('narration_pool', kind='welcome') as pool_span:
+            pooled = narration_pool.take('welcome', str(career), player_name)
+            if pool_span is not None:
+                pool_span.set(hit=pooled is not None)
+        if pooled is not None:
+            return AbacusResponse(pooled, career_path=career_choice)
+    
+    # ApiClient is already imported at the top of the file
+    client = prompt_cache.wrap(ApiClient())
+    with tracing.span('build_prompt') as prompt_span:
+        budgeted = prompt_budget.prepare('welcome', build_welcome_prompt(player_name, career_choice), WELCOME_SYSTEM_MESSAGE)
+        if prompt_span is not None:
+            prompt_span.set(**budgeted.stats)
+    with tracing.span('llm'):
+        response = budgeted.evaluate(client, narration.WELCOME, narration_context).content
+    return AbacusResponse(response, career_path=career_choice)
+
+def initialize_financial_twin_function(
+    career_path: str,
+    acknowledge_status: str,
+    use_narration_pool: Optional[bool] = None,
+    progressive: bool = False,
+    narration_mode: Optional[str] = None
+) -> AbacusResponse:
+    """
+    Initialize the financial data for the selected career path
+    
+    Args:
+        career_path: Selected career path
+        acknowledge_status: Acknowledgment of initial financial status
+        use_narration_pool: Serve a pre-generated narrative if one is ready (defaults to the environment setting)
+        progressive: Return a templated narrative now and generate the LLM one as a background job
+        narration_mode: 'template' to narrate offline without the LLM (defaults to the environment setting)
+        
+    Returns:
+        AbacusResponse containing initial status and financial data plus decision options
+    """
+    # Use the career data or default values if career not found
+    financial_status = CAREER_DATA.get(str(career_path), {'income': 0.0, 'expenses': 0.0, 'savings': 0.0, 'debt': 0.0})
+    income = financial_status['income']
+    expenses = financial_status['expenses']
+    savings = financial_status['savings']
+    debt = financial_status['debt']
+    
+    # Get decision options for this career path
+    decision_options = CAREER_DECISIONS.get(str(career_path), [])
+    
+    narration_context = {'career': str(career_path), 'income': income, 'expenses': expenses,
+                         'savings': savings, 'debt': debt, 'decision_options': decision_options}
+    
+    # Offline narration straight from the templates
+    response = None
+    if narration.offline_mode(narration_mode):
+        with tracing.span('narration.render', intent=narration.INITIAL_STATUS):
+            response = narration.render(narration.INITIAL_STATUS, narration_context)
+    
+    # The initial status narrative only depends on the career, so a pre-generated one can be served as is
+    if response is None and narration_pool.pool_enabled(use_narration_pool) and str(career_path) in CAREER_DATA:
+        with tracing.span('narration_pool', kind='initial_status') as pool_span:
+            response = narration_pool.take('initial_status', str(career_path))
+            if pool_span is not None:
+                pool_span.set(hit=response is not None)
+    
+    narrative_job = {}
+    if response is None:
+        # Create prompt for the AI with specific decision options
+        with tracing.span('build_prompt') as prompt_span:
+            budgeted = prompt_budget.prepare('initial_status', build_initial_status_prompt(career_path), INITIAL_STATUS_SYSTEM_MESSAGE)
+            if prompt_span is not None:
+                prompt_span.set(**budgeted.stats)
+        
+        if progressive:
+            # Answer with the templated narrative and let the LLM one follow
+            response = narration.render(narration.INITIAL_STATUS, narration_context)
+            with tracing.span('narrative_job.submit'):
+                narrative_job = {'narrative_job_id': narrative_jobs.submit('initial_status', budgeted, response),
+                                 'narrative_status': narrative_jobs.PENDING}
+        else:
+            # ApiClient is already imported at the top of the file
+            client = prompt_cache.wrap(ApiClient())
+            with tracing.span('llm'):
+                response = budgeted.evaluate(client, narration.INITIAL_STATUS, narration_context).content
+    
+    # Start the session's event history
+    session_id = sessions.new_session_id()
+    with tracing.span('event_log.append'):
+        event_log.append(session_id, 'start', {'career': str(career_path), 'state': {
+            'income': income, 'expenses': expenses, 'savings': savings, 'debt': debt}})
     
     # Return response with initial financial data and decision options
     return AbacusResponse(response, 
@@ -251,7 +1028,149 @@ Use an engaging and motivating tone.
                          xp_earned=0,
                          level=1,
                          achievements=[],
-                         decision_options=decision_options)
+                         decision_options=decision_options,
+                         decision_preview=decision_preview.preview(decision_options, income, expenses, savings, debt, str(career_path)),
+                         take_home=_take_home(str(career_path), income),
+                         session_id=session_id,
+                         **narrative_job)
+
+def decision_outcomes(
+    financial_decision: str,
+    income: int,
+    savings: int,
+    debt: int
+) -> Tuple[List[Tuple[float, int, int, int]], List[str]]:
+    """
+    Possible results of a decision, the decision step of the turn rules (amounts in pence)
+    
+    Decisions act by keyword (this would be better tied to specific decisions but keeping simple for now).
+    
+    Returns:
+        Tuple of (outcomes as (probability, income, savings, debt), achievements the decision earns)
+    """
+    decision_lower = str(financial_decision).lower()
+    if 'invest' in decision_lower:
+        savings -= INVESTMENT_COST
+        return [(INVESTMENT_SUCCESS_PROBABILITY, income + INVESTMENT_INCOME_GAIN, savings, debt),
+                (1 - INVESTMENT_SUCCESS_PROBABILITY, income, savings, debt)], []
+    if 'save' in decision_lower:
+        return [(1.0, income, savings + SAVINGS_DEPOSIT, debt)], ['Savings Milestone']
+    if 'pay' in decision_lower and 'debt' in decision_lower:
+        debt_payment = min(DEBT_PAYMENT_LIMIT, debt)
+        return [(1.0, income, savings - debt_payment, debt - debt_payment)], []
+    return [(1.0, income, savings, debt)], []
+
+def advance_turn_pence(
+    career_path: str,
+    income: int,
+    expenses: int,
+    savings: int,
+    debt: int,
+    financial_decision: str,
+    rng: Any = random,
+    achievement_state: Optional[Dict[str, Any]] = None,
+    deck: Optional[scenario_deck.ScenarioDeck] = None
+) -> Dict[str, Any]:
+    """
+    Apply the rules of one turn to a player state, without narration or side effects
+    
+    Args:
+        career_path: Selected career path
+        income: Current monthly income in pence
+        expenses: Current monthly expenses in pence
+        savings: Current savings amount in pence
+        debt: Current debt amount in pence
+        financial_decision: Decision made by the player
+        rng: Source of random draws (the random module, or a random.Random for simulations)
+        achievement_state: Achievement evaluation state from the session's previous turn
+        deck: The session's scenario deck (drawn from in place); without one the next scenario is drawn uniformly
+        
+    Returns:
+        Dictionary with the new state and monthly savings in pence, metrics, achievements (and
+        their evaluation state), XP, level, crisis and next scenario index
+    """
+    # Calculate financial metrics
+    monthly_savings = income - expenses
+    debt_to_income_ratio = (debt / (income * 12)) if income > 0 else float('inf')
+    savings_ratio = (savings / income) if income > 0 else 0
+    
+    # Check for achievements (only metrics that changed since the last evaluation are re-checked)
+    achievements, achievement_state = ACHIEVEMENT_ENGINE.evaluate({
+        'monthly_savings': money.to_pounds(monthly_savings),
+        'savings_ratio': savings_ratio,
+        'debt_to_income_ratio': debt_to_income_ratio,
+        'savings': money.to_pounds(savings),
+        'debt': money.to_pounds(debt)
+    }, achievement_state)
+    
+    # Calculate XP
+    xp_earned = 50
+    if monthly_savings > 0:
+        xp_earned += 25
+    if len(achievements) > 0:
+        xp_earned += 25 * len(achievements)
+    
+    # Calculate level
+    level = math.floor(xp_earned / 100) + 1
+    
+    # Process financial decision impact (one draw picks the outcome when there are several)
+    outcomes, decision_achievements = decision_outcomes(financial_decision, income, savings, debt)
+    achievements.extend(decision_achievements)
+    chosen = outcomes[-1]
+    if len(outcomes) > 1:
+        draw = rng.random()
+        for outcome in outcomes:
+            if draw < outcome[0]:
+                chosen = outcome
+                break
+            draw -= outcome[0]
+    _, income, savings, debt = chosen
+    
+    # Random UK-specific crisis event, weighted by career and savings buffer
+    crisis_type = CRISIS_ENGINE.draw(career_path, savings, expenses, rng)
+    income, savings, crisis_event = CRISIS_ENGINE.apply(crisis_type, income, savings)
+    
+    # Choose next scenario (its options are presented with it), from the session's deck when there is one
+    career_scenarios = SCENARIOS_WITH_OPTIONS.get(career_path, SCENARIOS_WITH_OPTIONS['Student'])
+    if deck is not None:
+        scenario_index = deck.draw(rng, scenario_deck.state_weights(career_scenarios, debt_to_income_ratio))
+    else:
+        scenario_index = rng.choice(range(len(career_scenarios)))
+    
+    return {
+        'income': income,
+        'expenses': expenses,
+        'savings': savings,
+        'debt': debt,
+        'monthly_savings': monthly_savings,
+        'debt_to_income_ratio': debt_to_income_ratio,
+        'savings_ratio': savings_ratio,
+        'achievements': achievements,
+        'achievement_state': achievement_state,
+        'xp_earned': xp_earned,
+        'level': level,
+        'crisis_type': crisis_type,
+        'crisis_event': crisis_event,
+        'scenario_index': scenario_index
+    }
+
+def advance_turn(
+    career_path: str,
+    income: float,
+    expenses: float,
+    savings: float,
+    debt: float,
+    financial_decision: str,
+    rng: Any = random,
+    achievement_state: Optional[Dict[str, Any]] = None,
+    deck: Optional[scenario_deck.ScenarioDeck] = None
+) -> Dict[str, Any]:
+    """advance_turn_pence for a state in pounds; the amounts returned are in pounds too"""
+    turn = advance_turn_pence(career_path, money.to_pence(income), money.to_pence(expenses), money.to_pence(savings),
+                              money.to_pence(debt), financial_decision, rng, achievement_state, deck)
+    for field in TURN_MONEY_FIELDS:
+        turn[field] = money.to_pounds(turn[field])
+    return turn
 
 def process_financial_decisions_function(
     career_path: str,
@@ -260,7 +1179,10 @@ def process_financial_decisions_function(
     savings: float,
     debt: float,
     financial_decision: str,
-    next_step: str
+    next_step: str,
+    speculate: Optional[bool] = None,
+    session_id: Optional[str] = None,
+    record_turn: bool = True
 ) -> AbacusResponse:
     """
     Process financial decisions and update player status
@@ -273,689 +1195,79 @@ def process_financial_decisions_function(
         debt: Current debt amount
         financial_decision: Decision made by the player
         next_step: Continue or conclude the session
+        speculate: Serve precomputed outcomes and precompute the next turn (defaults to the environment setting)
+        session_id: Game session to track unlocked achievements in (optional)
+        record_turn: Record the turn in the session; speculative precomputation only reads the session,
+                     and the response then carries the achievement state for the turn that serves it
         
     Returns:
         AbacusResponse containing updated financial status and game progress
     """
+    # Serve the outcome precomputed while the player was deciding, if there is one
+    speculating = speculation.speculation_enabled(speculate)
+    if speculating:
+        with tracing.span('speculation.lookup') as lookup_span:
+            cached = speculation.take(career_path, income, expenses, savings, debt, financial_decision, next_step,
+                                      session_id)
+            if lookup_span is not None:
+                lookup_span.set(hit=cached is not None)
+        deck_token = None
+        if cached is not None and session_id:
+            # A precomputed outcome is only served if its scenario doesn't repeat one from the session's deck
+            deck = _session_deck(sessions.load(session_id), str(career_path))
+            deck_token = deck.encode() if deck.take(cached.get('scenario_index', -1)) else None
+            if deck_token is None:
+                cached = None
+        if cached is not None:
+            achievement_state = cached.pop('achievement_state', None)
+            _log_turn(session_id, str(career_path), (income, expenses, savings, debt), financial_decision, cached)
+            health_turn = tuple(money.to_pence(value) for value in (savings, cached['income'], cached['expenses'],
+                                                                    cached['savings'], cached['debt']))
+            cached.update(_record_session_turn(session_id, cached.get('achievements', []), achievement_state,
+                                               cached.get('xp_earned', 0), deck_token,
+                                               health_turn + (cached['debt_to_income_ratio'],)))
+            speculation.schedule(str(career_path), cached, session_id)
+            return AbacusResponse(cached.pop('content', ''), **cached)
+    
     # ApiClient is already imported at the top of the file
     # random and math are already imported at the top
     
     client = ApiClient()
     
-    # Convert inputs to appropriate types if they're strings
+    # Convert inputs to whole pence (they may arrive as strings)
     try:
-        income = float(income)
-        expenses = float(expenses)
-        savings = float(savings)
-        debt = float(debt)
+        state_pence = [money.to_pence(value) for value in (income, expenses, savings, debt)]
     except (ValueError, TypeError):
         # If conversion fails, use default values
-        income = 2000.0
-        expenses = 1500.0
-        savings = 1000.0
-        debt = 10000.0
-    
-    # UK-specific scenarios with scenario-specific decision options
-    scenarios_with_options = {
-        'Student': [
-            {
-                'scenario': "Your student maintenance loan payment from Student Finance England is due soon, but your expenses are higher than expected. How will you manage your finances?",
-                'options': [
-                    {
-                        'value': 'budget_review',
-                        'label': 'Review Your Budget',
-                        'description': 'Analyze your spending and cut non-essentials',
-                        'impact': {'savings': 10, 'debt': 0, 'income': 0, 'expenses': -15}
-                    },
-                    {
-                        'value': 'hardship_fund',
-                        'label': 'Apply for Hardship Fund',
-                        'description': 'Contact your university\'s financial support team',
-                        'impact': {'savings': 20, 'debt': 0, 'income': 15, 'expenses': 0}
-                    },
-                    {
-                        'value': 'overdraft_extension',
-                        'label': 'Use Student Overdraft',
-                        'description': 'Extend your interest-free student overdraft temporarily',
-                        'impact': {'savings': 0, 'debt': 10, 'income': 0, 'expenses': 0}
-                    },
-                    {
-                        'value': 'part_time_bar_work',
-                        'label': 'Find Weekend Bar Work',
-                        'description': 'Look for shifts in the Student Union or local pubs',
-                        'impact': {'savings': 5, 'debt': 0, 'income': 20, 'expenses': 5}
-                    }
-                ]
-            },
-            {
-                'scenario': "The new term is starting at uni, and you need to purchase textbooks. You can buy new, get used ones from the SU shop, or find digital versions. What\'s your plan?",
-                'options': [
-                    {
-                        'value': 'buy_new_books',
-                        'label': 'Buy New Textbooks',
-                        'description': 'Purchase all required textbooks brand new',
-                        'impact': {'savings': -25, 'debt': 0, 'income': 0, 'expenses': 5}
-                    },
-                    {
-                        'value': 'second_hand_books',
-                        'label': 'Shop at the SU',
-                        'description': 'Buy second-hand books from the Student Union shop',
-                        'impact': {'savings': -10, 'debt': 0, 'income': 0, 'expenses': 3}
-                    },
-                    {
-                        'value': 'digital_resources',
-                        'label': 'Use Digital Resources',
-                        'description': 'Find e-books and online alternatives',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 0, 'expenses': 1}
-                    },
-                    {
-                        'value': 'library_borrowing',
-                        'label': 'Borrow from Library',
-                        'description': 'Use the university library resources',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 0, 'expenses': 0}
-                    }
-                ]
-            },
-            {
-                'scenario': "Your laptop needs replacing before assignment deadlines. You could use your overdraft, ask parents for help, or use the uni computer labs. What will you do?",
-                'options': [
-                    {
-                        'value': 'buy_new_laptop',
-                        'label': 'Buy a New Laptop',
-                        'description': 'Purchase a new computer using your overdraft',
-                        'impact': {'savings': -10, 'debt': 30, 'income': 0, 'expenses': 5}
-                    },
-                    {
-                        'value': 'ask_parents',
-                        'label': 'Ask Parents for Help',
-                        'description': 'See if your family can contribute to a new laptop',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 25, 'expenses': 0}
-                    },
-                    {
-                        'value': 'use_uni_computers',
-                        'label': 'Use University Facilities',
-                        'description': 'Work in the computer labs and library',
-                        'impact': {'savings': 5, 'debt': 0, 'income': 0, 'expenses': 5}
-                    },
-                    {
-                        'value': 'refurbished_laptop',
-                        'label': 'Buy Refurbished',
-                        'description': 'Get a cheaper refurbished model',
-                        'impact': {'savings': -15, 'debt': 5, 'income': 0, 'expenses': 2}
-                    }
-                ]
-            },
-            {
-                'scenario': "Your flatmates are planning a holiday to Spain during reading week. It would cost £450 but could be a great experience. How do you handle this?",
-                'options': [
-                    {
-                        'value': 'go_on_holiday',
-                        'label': 'Join the Holiday',
-                        'description': 'Spend £450 on the trip to Spain',
-                        'impact': {'savings': -30, 'debt': 10, 'income': 0, 'expenses': 20}
-                    },
-                    {
-                        'value': 'budget_staycation',
-                        'label': 'Plan a Staycation',
-                        'description': 'Suggest more affordable UK activities',
-                        'impact': {'savings': -10, 'debt': 0, 'income': 0, 'expenses': 8}
-                    },
-                    {
-                        'value': 'skip_holiday',
-                        'label': 'Skip the Holiday',
-                        'description': 'Focus on studying and saving money',
-                        'impact': {'savings': 15, 'debt': 0, 'income': 5, 'expenses': -5}
-                    },
-                    {
-                        'value': 'extra_work_hours',
-                        'label': 'Work Extra Hours',
-                        'description': 'Pick up additional shifts to fund the trip',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 15}
-                    }
-                ]
-            },
-            {
-                'scenario': "You\'ve received a £300 bursary from your university. Will you save it in your ISA, use it for everyday expenses, or invest in a professional development course?",
-                'options': [
-                    {
-                        'value': 'save_in_isa',
-                        'label': 'Save in Cash ISA',
-                        'description': 'Put the money in a tax-free savings account',
-                        'impact': {'savings': 30, 'debt': 0, 'income': 1, 'expenses': 0}
-                    },
-                    {
-                        'value': 'everyday_expenses',
-                        'label': 'Cover Living Costs',
-                        'description': 'Use it for rent, groceries and bills',
-                        'impact': {'savings': 0, 'debt': -5, 'income': 0, 'expenses': -10}
-                    },
-                    {
-                        'value': 'professional_course',
-                        'label': 'Take a Development Course',
-                        'description': 'Invest in skills that may increase future earnings',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 8, 'expenses': 5}
-                    },
-                    {
-                        'value': 'split_bursary',
-                        'label': 'Split the Money',
-                        'description': 'Save half, spend half on necessities',
-                        'impact': {'savings': 15, 'debt': -2, 'income': 0, 'expenses': -5}
-                    }
-                ]
-            }
-        ],
-        'Entrepreneur': [
-            {
-                'scenario': "A potential angel investor from London Tech Angels is interested in your startup. They offer £50,000 funding but want 25% equity. What\'s your decision?",
-                'options': [
-                    {
-                        'value': 'accept_investment',
-                        'label': 'Accept the Offer',
-                        'description': 'Take the £50,000 investment for 25% equity',
-                        'impact': {'savings': 50, 'debt': -20, 'income': 25, 'expenses': 15}
-                    },
-                    {
-                        'value': 'negotiate_terms',
-                        'label': 'Negotiate Better Terms',
-                        'description': 'Counter with 15% equity for the same investment',
-                        'impact': {'savings': 20, 'debt': 0, 'income': 10, 'expenses': 5}
-                    },
-                    {
-                        'value': 'decline_investment',
-                        'label': 'Decline the Offer',
-                        'description': 'Keep full ownership and bootstrap the business',
-                        'impact': {'savings': -10, 'debt': 15, 'income': 5, 'expenses': -5}
-                    },
-                    {
-                        'value': 'seek_alternatives',
-                        'label': 'Explore Other Funding',
-                        'description': 'Look into UK government startup grants and loans',
-                        'impact': {'savings': 10, 'debt': 10, 'income': 5, 'expenses': 0}
-                    }
-                ]
-            },
-            {
-                'scenario': "Your business is growing and you\'re stretched thin. You can hire a part-time assistant for £1,200/month or work longer hours yourself. What will you do?",
-                'options': [
-                    {
-                        'value': 'hire_assistant',
-                        'label': 'Hire a Part-time Assistant',
-                        'description': 'Pay £1,200/month for professional help',
-                        'impact': {'savings': -12, 'debt': 0, 'income': 15, 'expenses': 12}
-                    },
-                    {
-                        'value': 'work_longer',
-                        'label': 'Work Longer Hours',
-                        'description': 'Handle everything yourself to save money',
-                        'impact': {'savings': 10, 'debt': 0, 'income': 5, 'expenses': -5}
-                    },
-                    {
-                        'value': 'outsource_tasks',
-                        'label': 'Use Freelancers',
-                        'description': 'Outsource specific tasks on platforms like Fiverr',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 8}
-                    },
-                    {
-                        'value': 'business_automation',
-                        'label': 'Invest in Automation',
-                        'description': 'Implement software to streamline operations',
-                        'impact': {'savings': -15, 'debt': 5, 'income': 12, 'expenses': -8}
-                    }
-                ]
-            },
-            {
-                'scenario': "A competitor in your industry is closing down and offers to sell their client list for £5,000. It could bring in new business but is pricey. What\'s your choice?",
-                'options': [
-                    {
-                        'value': 'buy_client_list',
-                        'label': 'Purchase the Client List',
-                        'description': 'Invest £5,000 to acquire potential new customers',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 5}
-                    },
-                    {
-                        'value': 'negotiate_price',
-                        'label': 'Negotiate a Lower Price',
-                        'description': 'Try to get the list for £2,500',
-                        'impact': {'savings': -8, 'debt': 0, 'income': 15, 'expenses': 3}
-                    },
-                    {
-                        'value': 'decline_purchase',
-                        'label': 'Focus on Organic Growth',
-                        'description': 'Build your client base through marketing instead',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 8, 'expenses': 10}
-                    },
-                    {
-                        'value': 'partnership_offer',
-                        'label': 'Offer a Partnership',
-                        'description': 'Propose a commission-based referral arrangement',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 12, 'expenses': 7}
-                    }
-                ]
-            },
-            {
-                'scenario': "You have £8,000 to invest in your business. You can either upgrade your equipment or invest in digital marketing with a London agency. Which path do you choose?",
-                'options': [
-                    {
-                        'value': 'upgrade_equipment',
-                        'label': 'Upgrade Equipment',
-                        'description': 'Invest in better equipment to improve productivity',
-                        'impact': {'savings': -20, 'debt': 0, 'income': 15, 'expenses': -10}
-                    },
-                    {
-                        'value': 'digital_marketing',
-                        'label': 'Hire a Marketing Agency',
-                        'description': 'Invest in professional digital marketing services',
-                        'impact': {'savings': -20, 'debt': 0, 'income': 30, 'expenses': 10}
-                    },
-                    {
-                        'value': 'split_investment',
-                        'label': 'Split the Investment',
-                        'description': 'Allocate funds to both equipment and marketing',
-                        'impact': {'savings': -20, 'debt': 0, 'income': 22, 'expenses': 0}
-                    },
-                    {
-                        'value': 'training_development',
-                        'label': 'Invest in Skills Development',
-                        'description': 'Take courses to enhance your business capabilities',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 18, 'expenses': -5}
-                    }
-                ]
-            },
-            {
-                'scenario': "There\'s an opportunity to expand your business to Manchester, but it requires £15,000 upfront for a new location. How do you proceed?",
-                'options': [
-                    {
-                        'value': 'expand_location',
-                        'label': 'Open the Manchester Office',
-                        'description': 'Invest £15,000 to expand to a new location',
-                        'impact': {'savings': -30, 'debt': 20, 'income': 40, 'expenses': 25}
-                    },
-                    {
-                        'value': 'virtual_presence',
-                        'label': 'Establish Virtual Presence',
-                        'description': 'Use co-working spaces and virtual meetings instead',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 15, 'expenses': 8}
-                    },
-                    {
-                        'value': 'partnership_expansion',
-                        'label': 'Find a Local Partner',
-                        'description': 'Partner with an existing Manchester business',
-                        'impact': {'savings': -10, 'debt': 0, 'income': 20, 'expenses': 10}
-                    },
-                    {
-                        'value': 'delay_expansion',
-                        'label': 'Delay Expansion Plans',
-                        'description': 'Build more capital before expanding',
-                        'impact': {'savings': 10, 'debt': -5, 'income': 5, 'expenses': 0}
-                    }
-                ]
-            }
-        ],
-        'Artist': [
-            {
-                'scenario': "A popular gallery in Bristol offers to showcase your work, but you need to pay £600 for the space upfront. Is this a worthwhile investment?",
-                'options': [
-                    {
-                        'value': 'pay_gallery_fee',
-                        'label': 'Pay the Gallery Fee',
-                        'description': 'Invest £600 to showcase your work',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 25, 'expenses': 5}
-                    },
-                    {
-                        'value': 'negotiate_commission',
-                        'label': 'Negotiate a Commission Deal',
-                        'description': 'Offer a higher commission on sales instead of upfront fee',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 15, 'expenses': 0}
-                    },
-                    {
-                        'value': 'find_alternative_venue',
-                        'label': 'Look for a Different Venue',
-                        'description': 'Search for cafes or community spaces with lower fees',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 3}
-                    },
-                    {
-                        'value': 'online_exhibition',
-                        'label': 'Focus on Online Exhibition',
-                        'description': 'Invest in a virtual gallery on your website instead',
-                        'impact': {'savings': -8, 'debt': 0, 'income': 12, 'expenses': 2}
-                    }
-                ]
-            },
-            {
-                'scenario': "You need supplies for your next project. You can invest £400 in premium materials or £150 in basic supplies. What\'s your approach?",
-                'options': [
-                    {
-                        'value': 'premium_materials',
-                        'label': 'Buy Premium Materials',
-                        'description': 'Invest £400 in high-quality supplies',
-                        'impact': {'savings': -12, 'debt': 0, 'income': 20, 'expenses': 5}
-                    },
-                    {
-                        'value': 'basic_supplies',
-                        'label': 'Use Basic Supplies',
-                        'description': 'Spend £150 on standard materials',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 3}
-                    },
-                    {
-                        'value': 'mixed_approach',
-                        'label': 'Mix Premium and Basic',
-                        'description': 'Use premium materials for key elements only',
-                        'impact': {'savings': -8, 'debt': 0, 'income': 15, 'expenses': 4}
-                    },
-                    {
-                        'value': 'upcycled_materials',
-                        'label': 'Use Upcycled Materials',
-                        'description': 'Create art from repurposed or found objects',
-                        'impact': {'savings': -2, 'debt': 0, 'income': 8, 'expenses': 1}
-                    }
-                ]
-            },
-            {
-                'scenario': "A prestigious client offers a rush commission that pays £1,200, but you\'ll need to cancel other commitments worth £800. What do you do?",
-                'options': [
-                    {
-                        'value': 'accept_commission',
-                        'label': 'Accept the Rush Commission',
-                        'description': 'Take the £1,200 job and cancel other commitments',
-                        'impact': {'savings': 10, 'debt': 0, 'income': 12, 'expenses': 0}
-                    },
-                    {
-                        'value': 'negotiate_deadline',
-                        'label': 'Negotiate the Deadline',
-                        'description': 'Try to keep all commitments by adjusting timelines',
-                        'impact': {'savings': 15, 'debt': 0, 'income': 20, 'expenses': 5}
-                    },
-                    {
-                        'value': 'honor_commitments',
-                        'label': 'Honor Existing Commitments',
-                        'description': 'Decline the rush job to maintain relationships',
-                        'impact': {'savings': 5, 'debt': 0, 'income': 8, 'expenses': 0}
-                    },
-                    {
-                        'value': 'outsource_work',
-                        'label': 'Collaborate with Another Artist',
-                        'description': 'Share the commission with another artist to manage all work',
-                        'impact': {'savings': 3, 'debt': 0, 'income': 10, 'expenses': 4}
-                    }
-                ]
-            },
-            {
-                'scenario': "The Royal College of Art is offering a specialized workshop that could enhance your skills, but it costs £850. How do you handle this opportunity?",
-                'options': [
-                    {
-                        'value': 'pay_for_workshop',
-                        'label': 'Attend the Workshop',
-                        'description': 'Invest £850 in your professional development',
-                        'impact': {'savings': -20, 'debt': 5, 'income': 15, 'expenses': 0}
-                    },
-                    {
-                        'value': 'apply_for_grant',
-                        'label': 'Apply for an Arts Council Grant',
-                        'description': 'Seek funding to cover the workshop costs',
-                        'impact': {'savings': -5, 'debt': 0, 'income': 10, 'expenses': 0}
-                    },
-                    {
-                        'value': 'self_taught_alternative',
-                        'label': 'Learn Through Online Resources',
-                        'description': 'Find free or low-cost alternatives for skill development',
-                        'impact': {'savings': -2, 'debt': 0, 'income': 5, 'expenses': 0}
-                    },
-                    {
-                        'value': 'skill_exchange',
-                        'label': 'Offer a Skill Exchange',
-                        'description': 'Propose teaching a workshop in exchange for attendance',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 8, 'expenses': 3}
-                    }
-                ]
-            },
-            {
-                'scenario': "Not On The High Street wants to feature your work on their platform but takes a 35% commission. Will you join their marketplace?",
-                'options': [
-                    {
-                        'value': 'join_marketplace',
-                        'label': 'Join Not On The High Street',
-                        'description': 'Accept the 35% commission for greater exposure',
-                        'impact': {'savings': 5, 'debt': 0, 'income': 25, 'expenses': 8}
-                    },
-                    {
-                        'value': 'negotiate_terms',
-                        'label': 'Negotiate Commission Rate',
-                        'description': 'Try to secure a lower commission percentage',
-                        'impact': {'savings': 8, 'debt': 0, 'income': 15, 'expenses': 5}
-                    },
-                    {
-                        'value': 'independent_shop',
-                        'label': 'Focus on Your Own Shop',
-                        'description': 'Invest in your own Shopify or Etsy store instead',
-                        'impact': {'savings': -10, 'debt': 0, 'income': 18, 'expenses': 12}
-                    },
-                    {
-                        'value': 'selective_listing',
-                        'label': 'List Selected Items Only',
-                        'description': 'Put only high-margin items on the marketplace',
-                        'impact': {'savings': 3, 'debt': 0, 'income': 12, 'expenses': 4}
-                    }
-                ]
-            }
-        ],
-        'Banker': [
-            {
-                'scenario': "Your company offers share options as part of your bonus package. Will you exercise them (worth potentially £8,000) or take the cash equivalent of £5,500?",
-                'options': [
-                    {
-                        'value': 'exercise_options',
-                        'label': 'Exercise Share Options',
-                        'description': 'Take the £8,000 in company shares',
-                        'impact': {'savings': 20, 'debt': 0, 'income': 5, 'expenses': 0}
-                    },
-                    {
-                        'value': 'take_cash',
-                        'label': 'Take Cash Bonus',
-                        'description': 'Accept the £5,500 cash equivalent',
-                        'impact': {'savings': 15, 'debt': -10, 'income': 0, 'expenses': 0}
-                    },
-                    {
-                        'value': 'split_bonus',
-                        'label': 'Split Between Cash and Shares',
-                        'description': 'Take half in shares and half in cash',
-                        'impact': {'savings': 18, 'debt': -5, 'income': 3, 'expenses': 0}
-                    },
-                    {
-                        'value': 'defer_decision',
-                        'label': 'Defer the Decision',
-                        'description': 'Wait for a better share price before deciding',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 10, 'expenses': 0}
-                    }
-                ]
-            },
-            {
-                'scenario': "You\'ve spotted a promising investment opportunity in UK tech stocks, but it's relatively high-risk. Will you invest £10,000 from your portfolio?",
-                'options': [
-                    {
-                        'value': 'invest_tech_stocks',
-                        'label': 'Invest £10,000',
-                        'description': 'Make the full investment in UK tech stocks',
-                        'impact': {'savings': -25, 'debt': 0, 'income': 35, 'expenses': 0}
-                    },
-                    {
-                        'value': 'partial_investment',
-                        'label': 'Invest £5,000',
-                        'description': 'Make a smaller investment to limit exposure',
-                        'impact': {'savings': -12, 'debt': 0, 'income': 15, 'expenses': 0}
-                    },
-                    {
-                        'value': 'diversified_approach',
-                        'label': 'Diversify Your Investment',
-                        'description': 'Spread £10,000 across tech stocks and safer options',
-                        'impact': {'savings': -25, 'debt': 0, 'income': 20, 'expenses': 0}
-                    },
-                    {
-                        'value': 'research_further',
-                        'label': 'Conduct More Research',
-                        'description': 'Hold off on investing until you gather more information',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 5, 'expenses': 0}
-                    }
-                ]
-            },
-            {
-                'scenario': "A Chartered Financial Analyst qualification could advance your career but costs £5,000 and requires significant study time. Is this the right move?",
-                'options': [
-                    {
-                        'value': 'pursue_cfa',
-                        'label': 'Pursue CFA Qualification',
-                        'description': 'Invest £5,000 in the CFA program',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 30, 'expenses': 5}
-                    },
-                    {
-                        'value': 'employer_sponsorship',
-                        'label': 'Request Employer Sponsorship',
-                        'description': 'Ask your bank to cover the qualification costs',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 20, 'expenses': 0}
-                    },
-                    {
-                        'value': 'alternative_qualification',
-                        'label': 'Consider Alternative Certifications',
-                        'description': 'Look into less expensive qualifications with similar benefits',
-                        'impact': {'savings': -8, 'debt': 0, 'income': 15, 'expenses': 3}
-                    },
-                    {
-                        'value': 'focus_on_experience',
-                        'label': 'Focus on Practical Experience',
-                        'description': 'Build expertise through projects rather than certifications',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 10, 'expenses': 0}
-                    }
-                ]
-            },
-            {
-                'scenario': "You have £20,000 to invest. You can choose between a safe FTSE tracker fund or active management with higher potential returns. What\'s your strategy?",
-                'options': [
-                    {
-                        'value': 'ftse_tracker',
-                        'label': 'FTSE Tracker Fund',
-                        'description': 'Invest in a low-cost FTSE 100 index fund',
-                        'impact': {'savings': -20, 'debt': 0, 'income': 15, 'expenses': 0}
-                    },
-                    {
-                        'value': 'active_management',
-                        'label': 'Active Fund Management',
-                        'description': 'Choose a professionally managed fund with higher fees',
-                        'impact': {'savings': -20, 'debt': 0, 'income': 25, 'expenses': 5}
-                    },
-                    {
-                        'value': 'mixed_portfolio',
-                        'label': 'Build a Mixed Portfolio',
-                        'description': 'Allocate funds across both passive and active investments',
-                        'impact': {'savings': -20, 'debt': 0, 'income': 20, 'expenses': 3}
-                    },
-                    {
-                        'value': 'property_investment',
-                        'label': 'Invest in Property',
-                        'description': 'Use as deposit for a buy-to-let property investment',
-                        'impact': {'savings': -20, 'debt': 20, 'income': 30, 'expenses': 15}
-                    }
-                ]
-            },
-            {
-                'scenario': "A fintech startup approaches you to become an early investor with £15,000 for a 3% stake. How do you respond to this opportunity?",
-                'options': [
-                    {
-                        'value': 'invest_startup',
-                        'label': 'Invest in the Startup',
-                        'description': 'Provide £15,000 for a 3% equity stake',
-                        'impact': {'savings': -30, 'debt': 0, 'income': 40, 'expenses': 0}
-                    },
-                    {
-                        'value': 'negotiate_equity',
-                        'label': 'Negotiate for More Equity',
-                        'description': 'Counter with £15,000 for 5% stake',
-                        'impact': {'savings': -30, 'debt': 0, 'income': 20, 'expenses': 0}
-                    },
-                    {
-                        'value': 'smaller_investment',
-                        'label': 'Make a Smaller Investment',
-                        'description': 'Offer £7,500 for a 1.5% stake',
-                        'impact': {'savings': -15, 'debt': 0, 'income': 20, 'expenses': 0}
-                    },
-                    {
-                        'value': 'decline_opportunity',
-                        'label': 'Decline the Opportunity',
-                        'description': 'Focus on more established investments',
-                        'impact': {'savings': 0, 'debt': 0, 'income': 0, 'expenses': 0}
-                    }
-                ]
-            }
-        ]
-    }
-    
-    # Calculate financial metrics
-    monthly_savings = income - expenses
-    debt_to_income_ratio = (debt / (income * 12)) if income > 0 else float('inf')
-    savings_ratio = (savings / income) if income > 0 else 0
-    
-    # Check for achievements
-    achievements = []
-    if monthly_savings > 0:
-        achievements.append('Positive Cash Flow Master')
-    if savings_ratio > 0.2:
-        achievements.append('Strategic Saver')
-    if debt_to_income_ratio < 0.3:
-        achievements.append('Debt Management Expert')
-    if savings > 50000:
-        achievements.append('Wealth Builder')
-    if debt == 0:
-        achievements.append('Debt Free Champion')
-    
-    # Calculate XP
-    xp_earned = 50
-    if monthly_savings > 0:
-        xp_earned += 25
-    if len(achievements) > 0:
-        xp_earned += 25 * len(achievements)
-    
-    # Calculate level
-    level = math.floor(xp_earned / 100) + 1
-    
-    # Process financial decision impact (this would be better tied to specific decisions but keeping simple for now)
-    decision_lower = str(financial_decision).lower()
-    if 'invest' in decision_lower:
-        savings -= 1000
-        if random.random() < 0.7:
-            income += 200
-    elif 'save' in decision_lower:
-        savings += 500
-        achievements.append('Savings Milestone')
-    elif 'pay' in decision_lower and 'debt' in decision_lower:
-        debt_payment = min(2000, debt)
-        debt -= debt_payment
-        savings -= debt_payment
-    
-    # Random UK-specific crisis event (20% chance)
-    crisis_event = None
-    if random.random() < 0.2:
-        crisis_events = {
-            'NHS Dental Treatment': {'cost': 280, 'message': 'You needed unexpected dental work not fully covered by the NHS.'},
-            'Zero Hours Contract': {'income_reduction': 0.25, 'message': 'Your hours were cut on your zero-hours contract.'},
-            'Boiler Breakdown': {'cost': 850, 'message': 'Your home boiler broke down and needed emergency repairs.'},
-            'Council Tax Arrears': {'cost': 450, 'message': 'You received a notice for council tax arrears that must be paid.'},
-            'Train Fare Increase': {'cost': 200, 'message': 'Your monthly rail commuting costs increased unexpectedly.'},
-            'Letting Agency Fees': {'cost': 300, 'message': 'You faced unexpected letting agency fees during a house move.'}
-        }
-        crisis_type = random.choice(list(crisis_events.keys()))
-        crisis = crisis_events[crisis_type]
-        crisis_event = crisis['message']
-        
-        if 'cost' in crisis:
-            savings -= crisis['cost']
-        if 'income_reduction' in crisis:
-            income *= (1 - crisis['income_reduction'])
+        state_pence = [money.to_pence(value) for value in (2000, 1500, 1000, 10000)]
     
-    # Choose next scenario and matching options
+    # Apply the turn's rules: metrics, achievements, XP, the decision, a possible crisis and the next scenario
     career_path_str = str(career_path)
-    career_scenarios = scenarios_with_options.get(career_path_str, scenarios_with_options['Student'])
-    chosen_scenario = random.choice(career_scenarios)
+    state_before = tuple(money.to_pounds(value) for value in state_pence)
+    session = sessions.load(session_id)
+    deck = _session_deck(session, career_path_str) if session_id else None
+    turn = advance_turn_pence(career_path_str, *state_pence, financial_decision,
+                              achievement_state=session.get('achievements', {}).get('state'), deck=deck)
+    # Amounts are back in pounds from here on (responses, narration and projections)
+    income, expenses, savings, debt, monthly_savings = (money.to_pounds(turn[field]) for field in TURN_MONEY_FIELDS)
+    debt_to_income_ratio = turn['debt_to_income_ratio']
+    savings_ratio = turn['savings_ratio']
+    achievements = turn['achievements']
+    xp_earned = turn['xp_earned']
+    level = turn['level']
+    crisis_event = turn['crisis_event']
+    career_scenarios = SCENARIOS_WITH_OPTIONS.get(career_path_str, SCENARIOS_WITH_OPTIONS['Student'])
+    chosen_scenario = career_scenarios[turn['scenario_index']]
     next_scenario = chosen_scenario['scenario']
     decision_options = chosen_scenario['options']
     
+    # Best option for the new state from the precomputed policy (None until the career's policy is built)
+    recommended_option = None
+    if career_path_str in CAREER_DATA:
+        with tracing.span('policy.lookup'):
+            recommended_option = policy.recommended_option(career_path_str, turn['scenario_index'],
+                                                           income, expenses, savings, debt)
+    
     # Format the decision options for the next prompt
     formatted_options = ""
     for option in decision_options:
@@ -966,46 +1278,193 @@ def process_financial_decisions_function(
         next_scenario += f"\n\nYou need to choose from the following options:\n{formatted_options}"
     
     # Create response message with British pounds
-    response = f'''🎮 **Financial Twin Simulation Update** 🎮
-
-💫 **Current Status:**
-Level: {level} (XP: {xp_earned})
-🏆 Achievements: {', '.join(achievements)}
-
-💰 **Financial Metrics:**
-Monthly Income: £{income:,.2f}
-Monthly Expenses: £{expenses:,.2f}
-Savings: £{savings:,.2f}
-Debt: £{debt:,.2f}
-Monthly Savings: £{monthly_savings:,.2f}
-Debt-to-Income Ratio: {debt_to_income_ratio:.2%}
-Savings Ratio: {savings_ratio:.2%}
-
-✨ **Decision Impact:**
-Your choice to {financial_decision} has been processed.
-
-🎯 **Next Scenario:**
-{next_scenario}
-
-What\'s your decision?'''
+    response = narration.render(narration.TURN, {
+        'career': career_path_str,
+        'level': level,
+        'xp_earned': xp_earned,
+        'achievements_text': ', '.join(achievements),
+        'income': income,
+        'expenses': expenses,
+        'savings': savings,
+        'debt': debt,
+        'monthly_savings': monthly_savings,
+        'debt_to_income_ratio': debt_to_income_ratio,
+        'savings_ratio': savings_ratio,
+        'financial_decision': financial_decision,
+        'next_scenario': next_scenario
+    })
     
     # Return response with financial data
-    return AbacusResponse(
+    result = AbacusResponse(
         response,
         xp_earned=xp_earned,
         level=level,
         achievements=achievements,
         crisis_event=crisis_event,
+        crisis_type=turn['crisis_type'],
         monthly_savings=monthly_savings,
-        debt_to_income_ratio=debt_to_income_ratio,
+        # Capped so a turn without income doesn't send Infinity, which JSON.parse rejects
+        debt_to_income_ratio=health_metrics.capped_ratio(debt_to_income_ratio),
         savings_ratio=savings_ratio,
         next_step=next_step,
         income=income,
         expenses=expenses,
         savings=savings,
         debt=debt,
-        decision_options=decision_options
+        decision_options=decision_options,
+        scenario_index=turn['scenario_index'],
+        recommended_option=recommended_option,
+        decision_preview=decision_preview.preview(decision_options, income, expenses, savings, debt, career_path_str),
+        take_home=_take_home(career_path_str, income),
+        five_year_outlook=fast_forward.outlook(income, expenses, savings, debt, career_path_str),
+        goal_forecast=goals.turn_goals(income, expenses, savings, debt, career_path_str)
     )
+    
+    if not record_turn:
+        result.data['achievement_state'] = turn['achievement_state']
+        return result
+    
+    # Keep the turn in the session's event history
+    _log_turn(session_id, career_path_str, state_before, financial_decision, result.data)
+    
+    # Only achievements the session hasn't unlocked before are reported as new, and XP accumulates across turns
+    health_turn = (state_pence[2],) + tuple(turn[field] for field in ('income', 'expenses', 'savings', 'debt',
+                                                                       'debt_to_income_ratio'))
+    result.data.update(_record_session_turn(session_id, achievements, turn['achievement_state'], xp_earned,
+                                            deck.encode() if deck is not None else None, health_turn))
+    
+    # Precompute the outcome of each presented option while the player decides (from the state just recorded)
+    if speculating:
+        speculation.schedule(career_path_str, result.to_dict(), session_id)
+    return result
+
+def _take_home(career_path: str, income: float) -> Dict[str, Any]:
+    """Gross pay, tax, National Insurance and student loan behind a monthly take-home income"""
+    pay = CAREER_PAY.get(career_path, {})
+    return tax_engine.monthly_breakdown(income, pay.get('student_loan_plan'), pay.get('employment', 'employed'))
+
+def _session_deck(session: Dict[str, Any], career_path: str) -> scenario_deck.ScenarioDeck:
+    """The session's scenario deck for its career (a new one if it has none yet)"""
+    career_scenarios = SCENARIOS_WITH_OPTIONS.get(career_path, SCENARIOS_WITH_OPTIONS['Student'])
+    return scenario_deck.ScenarioDeck.decode(session.get('scenario_deck'), len(career_scenarios))
+
+def _log_turn(
+    session_id: Optional[str],
+    career_path: str,
+    state_before: Tuple[Any, Any, Any, Any],
+    financial_decision: str,
+    data: Dict[str, Any]
+) -> None:
+    """Append a turn's inputs and outcome to the session event log"""
+    if not session_id:
+        return
+    with tracing.span('event_log.append'):
+        event_log.append(session_id, 'turn', {
+            'career': career_path,
+            'decision': str(financial_decision),
+            'before': dict(zip(('income', 'expenses', 'savings', 'debt'), state_before)),
+            'after': {field: data.get(field) for field in ('income', 'expenses', 'savings', 'debt')},
+            'scenario_index': data.get('scenario_index'),
+            'monthly_savings': data.get('monthly_savings'),
+            'debt_to_income_ratio': data.get('debt_to_income_ratio'),
+            'savings_ratio': data.get('savings_ratio'),
+            'crisis_type': data.get('crisis_type'),
+            'crisis_event': data.get('crisis_event'),
+            'achievements': data.get('achievements', []),
+            'xp_earned': data.get('xp_earned', 0),
+            'level': data.get('level')
+        })
+
+def _record_session_turn(
+    session_id: Optional[str],
+    earned: List[str],
+    achievement_state: Optional[Dict[str, Any]],
+    xp_earned: int,
+    deck_token: Optional[str] = None,
+    health_turn: Optional[Tuple[Any, ...]] = None
+) -> Dict[str, Any]:
+    """
+    Record a turn in its session: achievements, the scenario deck and rolling health metrics in the
+    session, the new state in the session's history, achievements in the cohort index, XP in the ledger
+    
+    Args:
+        health_turn: Arguments of HealthMetrics.update for the turn (savings before, then the new
+                     income, expenses, savings and debt in pence, and the debt-to-income ratio)
+    
+    Returns:
+        Fields to add to the turn's response (newly unlocked achievements, cumulative XP/level and
+        the session's health metrics)
+    """
+    if not session_id:
+        return {}
+    with tracing.span('session.achievements'):
+        with sessions.update(session_id) as session:
+            record = session.setdefault('achievements', {'unlocked_mask': 0, 'state': None})
+            if 'player_ordinal' not in session:
+                session['player_ordinal'] = achievement_index.assign_ordinal()
+            unlocked_mask = record.get('unlocked_mask', 0)
+            new_mask = ACHIEVEMENT_CATALOG.encode(earned) & ~unlocked_mask
+            record['unlocked_mask'] = unlocked_mask | new_mask
+            if achievement_state is not None:
+                record['state'] = achievement_state
+            if deck_token is not None:
+                session['scenario_deck'] = deck_token
+            health = None
+            if health_turn is not None:
+                metrics = health_metrics.HealthMetrics.decode(session.get('health_metrics'))
+                metrics.update(*health_turn)
+                session['health_metrics'] = metrics.encode()
+                health = metrics.summary()
+                with tracing.span('state_history.append'):
+                    state_history.append(session_id, *health_turn[1:5])
+            if new_mask:
+                achievement_index.record(session['player_ordinal'], new_mask)
+    with tracing.span('xp_ledger.append'):
+        progression = xp_ledger.append(session_id, xp_earned, 'turn')
+    return {'session_id': session_id,
+            'new_achievements': ACHIEVEMENT_CATALOG.decode(new_mask),
+            'unlocked_achievements': ACHIEVEMENT_CATALOG.decode(record['unlocked_mask']),
+            'total_xp': progression['total_xp'],
+            'total_level': progression['level'],
+            'health_metrics': health}
+
+def _encode_achievement_fields(response: AbacusResponse) -> None:
+    """Replace achievement lists in a response with bitsets (labels come from the catalog table)"""
+    encoded = False
+    for field in ACHIEVEMENT_LIST_FIELDS:
+        if field in response.data:
+            response.data[field + '_mask'] = ACHIEVEMENT_CATALOG.encode(response.data.pop(field) or [])
+            encoded = True
+    if encoded:
+        response.data['achievement_catalog_version'] = ACHIEVEMENT_CATALOG.version
+
+def build_conclusion_prompt(
+    player_name: str,
+    career_path: str,
+    xp_earned: int,
+    level: int,
+    achievements: List[str],
+    financial_decision: str,
+    leaderboard_position: int,
+    tip_texts: List[str]
+) -> str:
+    """Build the LLM prompt for the end-of-game conclusion (the tips are retrieved, the LLM only words them)"""
+    tip_lines = '\n'.join(f"- {tip}" for tip in tip_texts)
+    return f'''
+The player, {player_name}, has completed their Financial Twin simulation as a {career_path}.
+
+Their final status:
+- XP Earned: {xp_earned}
+- Level: {level}
+- Achievements Unlocked: {', '.join(achievements)}
+- Last Decision Made: {financial_decision}
+- Leaderboard Position: {leaderboard_position}
+
+Financial tips for them:
+{tip_lines}
+
+Generate a congratulatory conclusion message summarizing their journey in the Financial Twin simulation. Highlight their achievements and work in the tips above, keeping their facts and figures unchanged.
+'''
 
 def conclude_session_function(
     player_name: str,
@@ -1013,7 +1472,11 @@ def conclude_session_function(
     xp_earned: int,
     level: int,
     achievements: List[str],
-    financial_decision: str
+    financial_decision: str,
+    progressive: bool = False,
+    narration_mode: Optional[str] = None,
+    session_id: Optional[str] = None,
+    polish: Optional[bool] = None
 ) -> AbacusResponse:
     """
     Conclude the game session and provide summary
@@ -1025,34 +1488,77 @@ def conclude_session_function(
         level: Final level achieved
         achievements: List of achievements unlocked
         financial_decision: Last financial decision made
+        progressive: Return a templated summary now and generate the LLM one as a background job
+        narration_mode: 'template' to narrate offline without the LLM (defaults to the environment setting)
+        session_id: Game session whose XP ledger decides the final XP and level (overrides xp_earned and level)
+        polish: Have the LLM reword the templated conclusion (defaults to FINANCIAL_TWIN_POLISH_CONCLUSION)
         
     Returns:
-        AbacusResponse containing conclusion message and summary
+        AbacusResponse containing conclusion message, the tips it gives and summary
     """
-    # ApiClient is already imported at the top of the file
-    client = ApiClient()
+    # The session's ledger is the source of truth for XP when there is one
+    progression = xp_ledger.totals(session_id)
+    if progression is not None:
+        xp_earned = progression['total_xp']
+        level = progression['level']
+    if session_id:
+        with tracing.span('event_log.append'):
+            event_log.append(session_id, 'conclude', {'career': str(career_path), 'xp_earned': xp_earned,
+                                                      'level': level, 'achievements': achievements,
+                                                      'financial_decision': str(financial_decision)})
     
     # Calculate leaderboard position (random for now)
     leaderboard_position = random.randint(1, 100)
     
+    # Tips come from the local tip index, matched to the career, achievements and recent finances
+    with tracing.span('tips.search'):
+        health = health_metrics.HealthMetrics.decode(sessions.load(session_id).get('health_metrics'))
+        recent = health.summary() if health.turns else {}
+        conclusion_tips = tips.tips_for(str(career_path), achievements, recent.get('average_debt_to_income_ratio'),
+                                        recent.get('average_cash_flow'))
+    
+    narration_context = {'player_name': player_name, 'career': str(career_path), 'xp_earned': xp_earned,
+                         'level': level, 'achievements': achievements, 'leaderboard_position': leaderboard_position,
+                         'tips': conclusion_tips}
+    
+    # Templated narration unless the LLM is asked to polish it (now or, when progressive, in the background)
+    if polish is None:
+        polish = os.environ.get('FINANCIAL_TWIN_POLISH_CONCLUSION') == '1'
+    if narration.offline_mode(narration_mode) or not (polish or progressive):
+        with tracing.span('narration.render', intent=narration.CONCLUSION):
+            response = narration.render(narration.CONCLUSION, narration_context)
+        return AbacusResponse(
+            response,
+            final_xp=xp_earned,
+            final_level=level,
+            final_achievements=achievements,
+            leaderboard_position=leaderboard_position,
+            tips=conclusion_tips
+        )
+    
     # Create prompt for the AI
-    prompt = f'''
-The player, {player_name}, has completed their Financial Twin simulation as a {career_path}.
-
-Their final status:
-- XP Earned: {xp_earned}
-- Level: {level}
-- Achievements Unlocked: {', '.join(achievements)}
-- Last Decision Made: {financial_decision}
-- Leaderboard Position: {leaderboard_position}
-
-Generate a congratulatory conclusion message summarizing their journey in the Financial Twin simulation. Highlight their achievements and give them 2-3 personalized financial tips based on their chosen career path ({career_path}) that are specific to the UK financial context.
-
-Use UK-specific financial terms and references (ISAs, Help to Buy, NS&I, UK tax bands, etc.) in your advice.
-'''
+    with tracing.span('build_prompt') as prompt_span:
+        prompt = build_conclusion_prompt(player_name, career_path, xp_earned, level, achievements,
+                                         financial_decision, leaderboard_position,
+                                         [tip['text'] for tip in conclusion_tips])
+        budgeted = prompt_budget.prepare('conclusion', prompt, CONCLUSION_SYSTEM_MESSAGE)
+        if prompt_span is not None:
+            prompt_span.set(**budgeted.stats)
     
-    # Generate conclusion message
-    response = client.evaluate_prompt(prompt=prompt, system_message='As a friendly game host, generate an uplifting conclusion message for the player. Be encouraging, positive, and provide specific financial advice relevant to their career path in the UK context.').content
+    narrative_job = {}
+    if progressive:
+        # Answer with the templated summary and let the LLM one follow
+        response = narration.render(narration.CONCLUSION, narration_context)
+        with tracing.span('narrative_job.submit'):
+            narrative_job = {'narrative_job_id': narrative_jobs.submit('conclusion', budgeted, response),
+                             'narrative_status': narrative_jobs.PENDING}
+    else:
+        # ApiClient is already imported at the top of the file
+        client = prompt_cache.wrap(ApiClient())
+        
+        # Generate conclusion message
+        with tracing.span('llm'):
+            response = budgeted.evaluate(client, narration.CONCLUSION, narration_context).content
     
     # Return response with final data
     return AbacusResponse(
@@ -1060,9 +1566,196 @@ Use UK-specific financial terms and references (ISAs, Help to Buy, NS&I, UK tax
         final_xp=xp_earned,
         final_level=level,
         final_achievements=achievements,
-        leaderboard_position=leaderboard_position
+        leaderboard_position=leaderboard_position,
+        tips=conclusion_tips,
+        **narrative_job
     )
 
+def get_narrative_job_function(job_id: str) -> AbacusResponse:
+    """
+    Poll the LLM narrative of a progressive response
+    
+    Args:
+        job_id: Job id returned as narrative_job_id
+        
+    Returns:
+        AbacusResponse with the narrative (templated until the job is done) and its status
+    """
+    job = narrative_jobs.get(job_id)
+    if job is None:
+        return AbacusResponse('', narrative_job_id=job_id, narrative_status='unknown')
+    return AbacusResponse(job['content'], narrative_job_id=job['job_id'], narrative_status=job['status'])
+
+def fast_forward_function(
+    career_path: str,
+    income: float,
+    expenses: float,
+    savings: float,
+    debt: float,
+    months: int,
+    savings_apr: Optional[float] = None,
+    debt_apr: Optional[float] = None,
+    debt_payment: Optional[float] = None,
+    include_schedule: bool = False
+) -> AbacusResponse:
+    """
+    Fast-forward the player's finances a number of months
+    
+    Args:
+        career_path: The player's career path
+        income: Monthly income
+        expenses: Monthly expenses
+        savings: Current savings
+        debt: Current debt
+        months: Number of months to fast-forward
+        savings_apr: Annual savings rate (optional)
+        debt_apr: Annual debt rate (optional)
+        debt_payment: Monthly debt payment (optional)
+        include_schedule: Also return month-by-month balances
+        
+    Returns:
+        AbacusResponse with the projected end state
+    """
+    with tracing.span('fast_forward', months=months):
+        projection = fast_forward.fast_forward(income, expenses, savings, debt, months, career_path,
+                                               savings_apr=savings_apr, debt_apr=debt_apr,
+                                               debt_payment=debt_payment, include_schedule=include_schedule)
+    
+    years, extra_months = divmod(projection['months'], 12)
+    horizon = f"{years} year{'s' if years != 1 else ''}" if not extra_months else f"{projection['months']} months"
+    content = (f"In {horizon} you'd have £{projection['savings']:,.2f} in savings and £{projection['debt']:,.2f} of debt, "
+               f"a net worth of £{projection['net_worth']:,.2f}.")
+    if projection['debt_free_month']:
+        content += f" You'd be debt-free in month {projection['debt_free_month']}."
+    return AbacusResponse(content, **projection)
+
+def solve_goals_function(goal_list: List[Dict[str, Any]]) -> AbacusResponse:
+    """
+    Solve savings-target and debt-free goals for one or many player states
+    
+    Args:
+        goal_list: Goals, each with the player's income, expenses, savings, debt and career_path,
+                   a 'kind' ('savings_target' or 'debt_free'), a 'target' for savings targets
+                   and an optional 'deadline' in months
+        
+    Returns:
+        AbacusResponse with one result per goal
+    """
+    with tracing.span('goals.solve', count=len(goal_list)):
+        results = goals.solve_batch(goal_list)
+    
+    reachable = sum(1 for result in results if result['reachable'])
+    return AbacusResponse(f"{reachable} of {len(results)} goals are reachable on the current plan.", goals=results)
+
+def preview_decisions_function(
+    career_path: str,
+    income: float,
+    expenses: float,
+    savings: float,
+    debt: float,
+    decision_options: Optional[List[Dict[str, Any]]] = None
+) -> AbacusResponse:
+    """
+    Compare every decision option from the player's current state
+    
+    Args:
+        career_path: The player's career path
+        income: Current monthly income
+        expenses: Current monthly expenses
+        savings: Current savings
+        debt: Current debt
+        decision_options: Options to compare (defaults to the career's initial options)
+        
+    Returns:
+        AbacusResponse with the comparison table
+    """
+    if not decision_options:
+        decision_options = CAREER_DECISIONS.get(str(career_path), [])
+    
+    with tracing.span('decision_preview', options=len(decision_options)):
+        table = decision_preview.preview(decision_options, income, expenses, savings, debt, str(career_path))
+    
+    best = next((option['label'] for option in table['options'] if option['value'] == table['best'].get('net_worth_12m')), None)
+    content = f"Best 12-month outcome: {best}." if best else "No options to compare."
+    return AbacusResponse(content, decision_preview=table)
+
+def get_achievement_catalog_function() -> AbacusResponse:
+    """
+    Get the achievement id-to-label table used to read achievement bitsets
+    
+    Returns:
+        AbacusResponse with the catalog version and labels by bit
+    """
+    return AbacusResponse('', **ACHIEVEMENT_CATALOG.table())
+
+def query_achievements_function(has: List[Any], lacks: List[Any]) -> AbacusResponse:
+    """
+    Count players with some achievements and without others, and report how rare each one is
+    
+    Args:
+        has: Achievements (labels or bits) the players must have
+        lacks: Achievements (labels or bits) the players must not have
+        
+    Returns:
+        AbacusResponse with the player count, the matching count and percentage, and rarity by label
+    """
+    def to_mask(achievements: List[Any]) -> int:
+        mask = 0
+        for item in achievements:
+            # bool is an int, but True meaning bit 1 is never what the caller meant
+            if isinstance(item, int) and not isinstance(item, bool) and item in ACHIEVEMENT_CATALOG.labels:
+                mask |= 1 << item
+            elif isinstance(item, str) and item in ACHIEVEMENT_CATALOG.bits:
+                mask |= 1 << ACHIEVEMENT_CATALOG.bits[item]
+            else:
+                raise ValueError(f"Unknown achievement: {item!r}")
+        return mask
+    
+    with tracing.span('achievements.query'):
+        cohorts = achievement_index.Cohorts(ACHIEVEMENT_CATALOG.labels)
+        matching = cohorts.count(to_mask(has), to_mask(lacks))
+        rarity = {ACHIEVEMENT_CATALOG.labels[bit]: percentage for bit, percentage in sorted(cohorts.rarity().items())}
+    
+    percentage = round(100 * matching / cohorts.players, 2) if cohorts.players else 0.0
+    return AbacusResponse(f"{matching} of {cohorts.players} players ({percentage}%) match.",
+                          players=cohorts.players, matching=matching, percentage=percentage, rarity=rarity)
+
+def get_health_history_function(session_id: str) -> AbacusResponse:
+    """
+    Get a session's rolling health metrics and the history behind them, for charts
+    
+    Args:
+        session_id: Game session
+        
+    Returns:
+        AbacusResponse with the current metrics and the windowed series, oldest turn first
+    """
+    metrics = health_metrics.HealthMetrics.decode(sessions.load(session_id).get('health_metrics'))
+    return AbacusResponse('', session_id=session_id, health_metrics=metrics.summary(),
+                          health_history=metrics.history())
+
+def get_state_history_function(
+    session_id: str,
+    resolution: int = state_history.DEFAULT_RESOLUTION,
+    method: str = 'lttb',
+    series: Optional[List[str]] = None
+) -> AbacusResponse:
+    """
+    Get a session's income, expenses, savings, debt and net worth by turn, downsampled for charts
+    
+    Args:
+        session_id: Game session
+        resolution: Points wanted per series
+        method: Downsampling method, 'lttb' or 'minmax'
+        series: Series to return (default all)
+        
+    Returns:
+        AbacusResponse with the number of turns and the downsampled series (amounts in pounds)
+    """
+    with tracing.span('state_history.query', resolution=resolution, method=method):
+        history = state_history.query(session_id, resolution, method, series)
+    return AbacusResponse('', session_id=session_id, state_history=history)
+
 def run_game_function(function_name: str, params: Dict[str, Any]) -> str:
     """
     Run a specific game function with the provided parameters
@@ -1074,47 +1767,133 @@ def run_game_function(function_name: str, params: Dict[str, Any]) -> str:
     Returns:
         JSON string containing the function response
     """
+    payload = game_function_payload(function_name, params)
     try:
-        # Call the appropriate function based on the function_name
-        if function_name == "welcome_node_function":
-            response = welcome_node_function(
-                player_name=params.get('player_name', 'Player'),
-                career_choice=params.get('career_choice', 'Student')
-            )
-        elif function_name == "initialize_financial_twin_function":
-            response = initialize_financial_twin_function(
-                career_path=params.get('career_path', 'Student'),
-                acknowledge_status=params.get('acknowledge_status', 'Acknowledged')
-            )
-        elif function_name == "process_financial_decisions_function":
-            response = process_financial_decisions_function(
-                career_path=params.get('career_path', 'Student'),
-                income=params.get('income', 0),
-                expenses=params.get('expenses', 0),
-                savings=params.get('savings', 0),
-                debt=params.get('debt', 0),
-                financial_decision=params.get('financial_decision', ''),
-                next_step=params.get('next_step', 'continue')
-            )
-        elif function_name == "conclude_session_function":
-            response = conclude_session_function(
-                player_name=params.get('player_name', 'Player'),
-                career_path=params.get('career_path', 'Student'),
-                xp_earned=params.get('xp_earned', 0),
-                level=params.get('level', 1),
-                achievements=params.get('achievements', []),
-                financial_decision=params.get('financial_decision', '')
-            )
-        else:
+        # Serialize once, with the span tree already attached
+        with tracing.span('serialize'):
+            return json.dumps(payload)
+    except (TypeError, ValueError) as e:
+        return json.dumps({"error": f"Error executing {function_name}: {str(e)}"})
+
+def game_function_payload(function_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a specific game function and return its response before serialization
+    
+    Args:
+        function_name: Name of the function to run
+        params: Dictionary of parameters for the function
+        
+    Returns:
+        Dictionary containing the function response (and the span tree when traced),
+        or an error dictionary
+    """
+    try:
+        with tracing.span('game_logic', function=function_name):
+            response = _dispatch_game_function(function_name, params)
+        
+        if response is None:
             # Return an error message if function name is not recognized
-            return json.dumps({"error": f"Unknown function: {function_name}"})
+            return {"error": f"Unknown function: {function_name}"}
+        
+        # Clients that cache the achievement catalog get bitsets instead of label lists
+        if params.get('achievement_format') == 'bits':
+            _encode_achievement_fields(response)
+        
+        payload = response.to_dict()
         
-        # Return the response as a JSON string
-        return response.to_json()
+        # Attach the span tree recorded so far when the request is being traced
+        trace = tracing.current_trace()
+        if trace is not None:
+            payload["trace"] = trace.to_dict()
+        return payload
     
     except Exception as e:
         # Return an error message if an exception occurs
-        return json.dumps({"error": f"Error executing {function_name}: {str(e)}"})
+        return {"error": f"Error executing {function_name}: {str(e)}"}
+
+def _dispatch_game_function(function_name: str, params: Dict[str, Any]) -> Optional[AbacusResponse]:
+    """Call the game function named by function_name, or return None if it is unknown"""
+    # Call the appropriate function based on the function_name
+    if function_name == "welcome_node_function":
+        return welcome_node_function(
+            player_name=params.get('player_name', 'Player'),
+            career_choice=params.get('career_choice', 'Student'),
+            use_narration_pool=params.get('use_narration_pool'),
+            narration_mode=params.get('narration')
+        )
+    elif function_name == "initialize_financial_twin_function":
+        return initialize_financial_twin_function(
+            career_path=params.get('career_path', 'Student'),
+            acknowledge_status=params.get('acknowledge_status', 'Acknowledged'),
+            use_narration_pool=params.get('use_narration_pool'),
+            progressive=bool(params.get('progressive', False)),
+            narration_mode=params.get('narration')
+        )
+    elif function_name == "process_financial_decisions_function":
+        return process_financial_decisions_function(
+            career_path=params.get('career_path', 'Student'),
+            income=params.get('income', 0),
+            expenses=params.get('expenses', 0),
+            savings=params.get('savings', 0),
+            debt=params.get('debt', 0),
+            financial_decision=params.get('financial_decision', ''),
+            next_step=params.get('next_step', 'continue'),
+            speculate=params.get('speculate'),
+            session_id=params.get('session_id')
+        )
+    elif function_name == "conclude_session_function":
+        return conclude_session_function(
+            player_name=params.get('player_name', 'Player'),
+            career_path=params.get('career_path', 'Student'),
+            xp_earned=params.get('xp_earned', 0),
+            level=params.get('level', 1),
+            achievements=params.get('achievements', []),
+            financial_decision=params.get('financial_decision', ''),
+            progressive=bool(params.get('progressive', False)),
+            narration_mode=params.get('narration'),
+            session_id=params.get('session_id'),
+            polish=params.get('polish')
+        )
+    elif function_name == "get_narrative_job_function":
+        return get_narrative_job_function(job_id=params.get('job_id', ''))
+    elif function_name == "fast_forward_function":
+        return fast_forward_function(
+            career_path=params.get('career_path', 'Student'),
+            income=params.get('income', 0),
+            expenses=params.get('expenses', 0),
+            savings=params.get('savings', 0),
+            debt=params.get('debt', 0),
+            months=params.get('months', 12),
+            savings_apr=params.get('savings_apr'),
+            debt_apr=params.get('debt_apr'),
+            debt_payment=params.get('debt_payment'),
+            include_schedule=bool(params.get('include_schedule', False))
+        )
+    elif function_name == "solve_goals_function":
+        return solve_goals_function(goal_list=params.get('goals', []))
+    elif function_name == "get_achievement_catalog_function":
+        return get_achievement_catalog_function()
+    elif function_name == "query_achievements_function":
+        return query_achievements_function(has=params.get('has', []), lacks=params.get('lacks', []))
+    elif function_name == "get_health_history_function":
+        return get_health_history_function(session_id=params.get('session_id', ''))
+    elif function_name == "get_state_history_function":
+        return get_state_history_function(
+            session_id=params.get('session_id', ''),
+            resolution=params.get('resolution', state_history.DEFAULT_RESOLUTION),
+            method=params.get('method', 'lttb'),
+            series=params.get('series')
+        )
+    elif function_name == "preview_decisions_function":
+        return preview_decisions_function(
+            career_path=params.get('career_path', 'Student'),
+            income=params.get('income', 0),
+            expenses=params.get('expenses', 0),
+            savings=params.get('savings', 0),
+            debt=params.get('debt', 0),
+            decision_options=params.get('decision_options')
+        )
+    return None
 
 # Main entry point when called directly
 if __name__ == "__main__":
@@ -12,20 +12,31 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     # Try importing from the updated module first
-    from python_modules.financial_twin_updated import run_game_function
+    from python_modules.financial_twin_updated import run_game_function, game_function_payload
 except ImportError:
     try:
         # Try importing as a module (when run as part of a package)
         from python_modules.financial_twin import run_game_function
+        game_function_payload = None
     except ImportError:
         # Fall back to a local import (when run directly)
         try:
-            from financial_twin_updated import run_game_function
+            from financial_twin_updated import run_game_function, game_function_payload
         except ImportError:
             from financial_twin import run_game_function
+            game_function_payload = None
+
+try:
+    from python_modules import tracing, profiling
+except ImportError:
+    import tracing
+    import profiling
 
 def main():
     """Main entry point for the script when called from Node.js"""
+    # Start timing before parsing; the trace is kept only if the caller asked for it
+    pending_trace = tracing.start_trace()
+    trace = None
     try:
         # Read the input data from stdin
         input_data = sys.stdin.read()
@@ -35,28 +46,62 @@ def main():
             f.write(f"Received input: {input_data}\n")
         
         # Parse the JSON data
-        data = json.loads(input_data)
+        with tracing.span('parse_input', bytes=len(input_data)):
+            data = json.loads(input_data)
+        
+        # Adopt the trace context propagated from Node.js, or stop tracing if there is none
+        if data.get('trace_id') or os.environ.get('FINANCIAL_TWIN_TRACE') == '1':
+            trace = pending_trace
+            trace.trace_id = data.get('trace_id') or trace.trace_id
+            trace.root.parent_id = data.get('parent_span_id')
+        else:
+            tracing.end_trace()
         
         # Extract the function name and parameters
         function_name = data.get('function')
         params = data.get('params', {})
+        if trace is not None:
+            trace.root.set(function=function_name)
         
         # Log the extracted data
         with open('/tmp/python_game_params.log', 'a') as f:
             f.write(f"Function: {function_name}, Params: {params}\n")
         
-        # Run the specified game function
-        result = run_game_function(function_name, params)
+        # Run the specified game function, under the profilers if requested
+        if game_function_payload is not None and profiling.profiling_requested(data):
+            payload, report = profiling.profile_call(
+                game_function_payload, function_name, params,
+                label=str(function_name),
+                memory=profiling.memory_profiling_requested(data)
+            )
+            profiling.write_profile_log(report)
+            
+            # Tell the caller where the profile artefacts were written
+            payload["profile"] = report
+            with tracing.span('serialize'):
+                result = json.dumps(payload)
+        else:
+            result = run_game_function(function_name, params)
         
         # Print the result as JSON to be captured by Node.js
         print(result)
         
+        # Record the complete span tree, including serialization and output
+        if trace is not None:
+            tracing.write_span_log(tracing.end_trace())
+        
     except Exception as e:
         # Log any errors
         error_msg = traceback.format_exc()
         with open('/tmp/python_game_error.log', 'a') as f:
             f.write(f"Error: {error_msg}\n")
         
+        # Keep the partial span tree so failed requests can be attributed too
+        trace_data = tracing.end_trace()
+        if trace is not None and trace_data is not None:
+            trace_data["error"] = str(e)
+            tracing.write_span_log(trace_data)
+        
         # Return an error message
         error_response = json.dumps({
             "content": f"Error running game: {str(e)}",
@@ -0,0 +1,201 @@
+"""
+Goal solver for the Financial Twin game
+Answers "when will I be debt-free?", "when do I hit £10k savings?" and "how much do I need to
+put away each month?" exactly, from the closed-form projection in fast_forward.
+"""
+import math
+import sys
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import fast_forward
+except ImportError:
+    import fast_forward
+
+# Goal kinds
+SAVINGS_TARGET = 'savings_target'
+DEBT_FREE = 'debt_free'
+
+# Months of expenses in the emergency-fund goal shown with every turn
+EMERGENCY_FUND_MONTHS = 3
+
+# Tolerance when rounding a fractional month up, so 12.0000000001 is still month 12
+_MONTH_EPSILON = 1e-9
+
+
+def _months_to_reach(savings: float, monthly_rate: float, contribution: float, target: float) -> float:
+    """
+    Smallest whole number of months after which a growing balance reaches a target
+
+    S(n) = (S + c/r)(1+r)^n - c/r is monotonic, so the crossing month is found in closed form
+    and then checked against the balance formula to make the rounding exact. Savings below
+    zero earn no interest and rise by c a month until they reach it.
+    """
+    if savings >= target:
+        return 0
+    if savings < 0 < contribution and monthly_rate > 0:
+        # Negative savings earn nothing: they climb linearly to zero before growing
+        switch = fast_forward.savings_switch_month(savings, monthly_rate, contribution)
+        at_switch = savings + contribution * switch
+        if at_switch < target:
+            return switch + _months_to_reach(at_switch, monthly_rate, contribution, target)
+        monthly_rate = 0.0
+    if monthly_rate == 0:
+        if contribution <= 0:
+            return math.inf
+        months = math.ceil((target - savings) / contribution - _MONTH_EPSILON)
+    else:
+        offset = contribution / monthly_rate
+        base = savings + offset
+        if base <= 0:
+            return math.inf
+        months = max(math.ceil(math.log((target + offset) / base) / math.log1p(monthly_rate) - _MONTH_EPSILON), 1)
+
+    # Correct an off-by-one from floating point rounding
+    balance = fast_forward.savings_after
+    if months > 1 and balance(savings, monthly_rate, contribution, months - 1) >= target:
+        months -= 1
+    elif balance(savings, monthly_rate, contribution, months) < target:
+        months += 1
+    return months
+
+
+def months_to_savings(plan: fast_forward.Plan, target: float) -> Optional[int]:
+    """
+    Months until savings reach a target, following the plan's debt and debt-free phases
+
+    Returns:
+        Number of months, or None if the target is never reached
+    """
+    # While repaying: savings receive the cash flow minus the debt payment
+    months = _months_to_reach(plan.savings, plan.savings_rate, plan.cash_flow - plan.payment, target)
+    if months <= plan.full_payments or plan.debt_free_month is None:
+        return None if math.isinf(months) else int(months)
+
+    # After the debt is cleared: the whole cash flow goes to savings
+    if plan.savings_when_debt_free >= target:
+        return plan.debt_free_month
+    months = _months_to_reach(plan.savings_when_debt_free, plan.savings_rate, plan.cash_flow, target)
+    return None if math.isinf(months) else plan.debt_free_month + int(months)
+
+
+def required_contribution(savings: float, target: float, months: int, monthly_rate: float) -> float:
+    """Monthly amount that must go into savings to reach a target in `months` months"""
+    if months <= 0:
+        return max(target - savings, 0.0)
+    growth = math.exp(months * math.log1p(monthly_rate))
+    return max((target - savings * growth) / fast_forward.growth_sum(monthly_rate, months), 0.0)
+
+
+def required_debt_payment(debt: float, months: int, monthly_rate: float) -> float:
+    """Monthly payment that clears a debt in `months` months (the annuity payment)"""
+    if debt <= 0:
+        return 0.0
+    if months <= 0:
+        return debt
+    growth = math.exp(months * math.log1p(monthly_rate))
+    return debt * growth / fast_forward.growth_sum(monthly_rate, months)
+
+
+def target_month(months: Optional[int], today: Optional[date] = None) -> Optional[str]:
+    """Calendar month (YYYY-MM) a number of months from today"""
+    if months is None:
+        return None
+    today = today or date.today()
+    year, month = divmod(today.year * 12 + today.month - 1 + int(months), 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def _plan_for(goal: Dict[str, Any]) -> fast_forward.Plan:
+    """Closed-form plan for the player state carried by a goal"""
+    return fast_forward.build_plan(goal.get('income', 0), goal.get('expenses', 0),
+                                   goal.get('savings', 0), goal.get('debt', 0),
+                                   goal.get('career_path'), goal.get('savings_apr'),
+                                   goal.get('debt_apr'), goal.get('debt_payment'))
+
+
+def solve(goal: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Solve one goal for one player state
+
+    Args:
+        goal: Player state (income, expenses, savings, debt, career_path, optional rates and
+              debt_payment) plus 'kind' (savings_target or debt_free), 'target' for savings
+              targets and an optional 'deadline' in months
+        today: Date the goal months count from (default today)
+
+    Returns:
+        Dictionary with the months to the goal, its calendar month and, with a deadline,
+        the monthly amount required to meet it
+    """
+    plan = _plan_for(goal)
+    kind = goal.get('kind', SAVINGS_TARGET)
+    deadline = goal.get('deadline')
+
+    if kind == DEBT_FREE:
+        months = plan.debt_free_month
+        required = (required_debt_payment(plan.debt, int(deadline), plan.debt_rate)
+                    if deadline is not None else None)
+    elif kind == SAVINGS_TARGET:
+        target = float(goal.get('target', 0))
+        months = months_to_savings(plan, target)
+        required = (required_contribution(plan.savings, target, int(deadline), plan.savings_rate)
+                    if deadline is not None else None)
+    else:
+        raise ValueError(f"Unknown goal kind: {kind}")
+
+    return _result(goal, kind, months, required, today)
+
+
+def _result(goal: Dict[str, Any], kind: str, months: Optional[int], required: Optional[float],
+            today: Optional[date]) -> Dict[str, Any]:
+    """Shape the answer for one goal"""
+    result: Dict[str, Any] = {
+        'kind': kind,
+        'reachable': months is not None,
+        'months': months,
+        'target_month': target_month(months, today)
+    }
+    if 'target' in goal:
+        result['target'] = float(goal['target'])
+    if 'id' in goal:
+        result['id'] = goal['id']
+    if required is not None:
+        result['deadline'] = int(goal['deadline'])
+        result['required_monthly'] = round(required, 2)
+    return result
+
+
+def solve_batch(goals: List[Dict[str, Any]], today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Solve many goals, for one or many players, in one call
+
+    Args:
+        goals: Goals as accepted by solve(), each carrying its player's state
+        today: Date the goal months count from (default today)
+
+    Returns:
+        One result per goal, in order
+    """
+    # Each goal is a few closed-form evaluations (~6us), so a plain loop is fast enough for large batches
+    today = today or date.today()
+    return [solve(goal, today) for goal in goals]
+
+
+def turn_goals(income: float, expenses: float, savings: float, debt: float, career_path: Optional[str] = None) -> Dict[str, Any]:
+    """Debt-free and emergency-fund forecasts shown next to every turn"""
+    plan = fast_forward.build_plan(income, expenses, savings, debt, career_path)
+    emergency_fund = round(max(float(expenses), 0.0) * EMERGENCY_FUND_MONTHS, 2)
+    emergency_months = months_to_savings(plan, emergency_fund)
+    return {
+        'debt_free_months': plan.debt_free_month,
+        'debt_free_month': target_month(plan.debt_free_month),
+        'emergency_fund_target': emergency_fund,
+        'emergency_fund_months': emergency_months,
+        'emergency_fund_month': target_month(emergency_months)
+    }
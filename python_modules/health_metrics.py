@@ -0,0 +1,258 @@
+"""
+Rolling financial health metrics for the Financial Twin game
+Each session keeps its last WINDOW turns in fixed-size ring buffers (arrays of pence, or
+floats for ratios) with running sums beside them, so a turn updates the rolling averages,
+the volatility of savings and the net worth trend in constant time, and the history charts
+are read straight from the buffers. Drawdown and cash-flow streaks run over the whole
+session. The buffers serialize to a little base64 in the session document, so memory per
+session stays bounded however long the game runs.
+"""
+import os
+import sys
+import math
+import base64
+import binascii
+from array import array
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import money
+except ImportError:
+    import money
+
+# Turns kept in the rolling window (a year of monthly turns by default)
+WINDOW = int(os.environ.get('FINANCIAL_TWIN_HEALTH_WINDOW', '12'))
+
+# Series kept per turn and their array typecodes (amounts in pence)
+SERIES = {
+    'cash_flow': 'q',
+    'savings': 'q',
+    'savings_change': 'q',
+    'net_worth': 'q',
+    'debt_to_income_ratio': 'd'
+}
+
+# Debt-to-income ratio recorded for a turn without income (whose ratio is infinite), so the
+# window's sums stay finite and the metrics JSON-safe
+MAX_DEBT_TO_INCOME_RATIO = 100.0
+
+STATE_VERSION = 1
+
+
+def capped_ratio(ratio: float) -> float:
+    """Debt-to-income ratio with an infinite one replaced by MAX_DEBT_TO_INCOME_RATIO"""
+    ratio = float(ratio)
+    return ratio if math.isfinite(ratio) else MAX_DEBT_TO_INCOME_RATIO
+
+
+def _to_base64(values: array) -> str:
+    """Array contents as base64 of their little-endian bytes"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _from_base64(typecode: str, text: str) -> array:
+    """Array from _to_base64 output"""
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+class RollingWindow:
+    """A ring buffer of the last capacity values with running sums for O(1) mean, deviation and slope"""
+
+    def __init__(self, typecode: str, capacity: int = WINDOW):
+        self.capacity = capacity
+        self.values = array(typecode, [0] * capacity)
+        self.head = 0
+        self.count = 0
+        # Sum of the values, of their squares, and of each value times its position (0 = oldest)
+        self.total: Any = 0
+        self.total_squares: Any = 0
+        self.weighted: Any = 0
+
+    def push(self, value: Any) -> None:
+        """Add the newest value, evicting the oldest once the window is full"""
+        if self.count < self.capacity:
+            self.weighted += self.count * value
+            self.count += 1
+        else:
+            oldest = self.values[self.head]
+            self.total -= oldest
+            self.total_squares -= oldest * oldest
+            # Every remaining value moves one position towards the oldest
+            self.weighted += (self.capacity - 1) * value - self.total
+        self.values[self.head] = value
+        self.total += value
+        self.total_squares += value * value
+        self.head = (self.head + 1) % self.capacity
+        # Float sums drift as values come and go, so they are recomputed once per lap of the ring
+        if self.head == 0 and self.values.typecode == 'd':
+            self._resum()
+
+    def _resum(self) -> None:
+        ordered = self.ordered()
+        self.total = sum(ordered)
+        self.total_squares = sum(value * value for value in ordered)
+        self.weighted = sum(position * value for position, value in enumerate(ordered))
+
+    def ordered(self) -> List[Any]:
+        """Values in the window, oldest first"""
+        if self.count < self.capacity:
+            return self.values[:self.count].tolist()
+        return (self.values[self.head:] + self.values[:self.head]).tolist()
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def deviation(self) -> float:
+        """Population standard deviation of the window"""
+        if self.count < 2:
+            return 0.0
+        variance = (self.count * self.total_squares - self.total * self.total) / (self.count * self.count)
+        return max(variance, 0) ** 0.5
+
+    def slope(self) -> float:
+        """Least-squares change per turn across the window"""
+        n = self.count
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self.weighted - sum_x * self.total) / (n * sum_xx - sum_x * sum_x)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'values': _to_base64(self.values), 'head': self.head, 'count': self.count,
+                'sums': [self.total, self.total_squares, self.weighted]}
+
+    @classmethod
+    def from_state(cls, typecode: str, capacity: int, state: Dict[str, Any]) -> 'RollingWindow':
+        window = cls(typecode, capacity)
+        values = _from_base64(typecode, state['values'])
+        if len(values) != capacity:
+            raise ValueError("Window size changed")
+        window.values = values
+        window.head, window.count = state['head'], state['count']
+        window.total, window.total_squares, window.weighted = state['sums']
+        return window
+
+
+class HealthMetrics:
+    """A session's rolling windows plus its whole-session drawdown and cash-flow streaks"""
+
+    def __init__(self, capacity: int = WINDOW):
+        self.capacity = capacity
+        self.windows = {name: RollingWindow(typecode, capacity) for name, typecode in SERIES.items()}
+        self.turns = 0
+        self.peak_net_worth: Optional[int] = None
+        self.max_drawdown = 0
+        self.streak = 0
+        self.longest_streak = 0
+
+    @classmethod
+    def decode(cls, state: Optional[Dict[str, Any]], capacity: int = WINDOW) -> 'HealthMetrics':
+        """Metrics from their session state, or fresh ones if there is none or it doesn't fit"""
+        metrics = cls(capacity)
+        if not state or state.get('version') != STATE_VERSION or state.get('window') != capacity:
+            return metrics
+        try:
+            metrics.windows = {name: RollingWindow.from_state(typecode, capacity, state['series'][name])
+                               for name, typecode in SERIES.items()}
+        except (KeyError, ValueError, TypeError, binascii.Error):
+            return cls(capacity)
+        ratios = metrics.windows['debt_to_income_ratio']
+        if not all(math.isfinite(value) for value in ratios.values):
+            # State saved before ratios were capped
+            for index, value in enumerate(ratios.values):
+                ratios.values[index] = capped_ratio(value)
+            ratios._resum()
+        metrics.turns = state.get('turns', 0)
+        metrics.peak_net_worth = state.get('peak_net_worth')
+        metrics.max_drawdown = state.get('max_drawdown', 0)
+        metrics.streak = state.get('streak', 0)
+        metrics.longest_streak = state.get('longest_streak', 0)
+        return metrics
+
+    def encode(self) -> Dict[str, Any]:
+        """State to keep in the session document"""
+        return {'version': STATE_VERSION, 'window': self.capacity, 'turns': self.turns,
+                'series': {name: window.to_state() for name, window in self.windows.items()},
+                'peak_net_worth': self.peak_net_worth, 'max_drawdown': self.max_drawdown,
+                'streak': self.streak, 'longest_streak': self.longest_streak}
+
+    def update(self, savings_before: int, income: int, expenses: int, savings: int, debt: int,
+               debt_to_income_ratio: float) -> None:
+        """
+        Add a turn
+
+        Args:
+            savings_before: Savings before the turn, in pence
+            income: Monthly income after the turn, in pence
+            expenses: Monthly expenses after the turn, in pence
+            savings: Savings after the turn, in pence
+            debt: Debt after the turn, in pence
+            debt_to_income_ratio: Debt-to-income ratio after the turn (infinite ones count as MAX_DEBT_TO_INCOME_RATIO)
+        """
+        cash_flow = income - expenses
+        net_worth = savings - debt
+        for name, value in (('cash_flow', cash_flow), ('savings', savings), ('savings_change', savings - savings_before),
+                            ('net_worth', net_worth), ('debt_to_income_ratio', capped_ratio(debt_to_income_ratio))):
+            self.windows[name].push(value)
+        self.turns += 1
+
+        if self.peak_net_worth is None or net_worth > self.peak_net_worth:
+            self.peak_net_worth = net_worth
+        self.max_drawdown = max(self.max_drawdown, self.peak_net_worth - net_worth)
+
+        self.streak = self.streak + 1 if cash_flow > 0 else 0
+        self.longest_streak = max(self.longest_streak, self.streak)
+
+    def summary(self) -> Dict[str, Any]:
+        """Current metrics, amounts in pounds"""
+        def pounds(pence: float) -> float:
+            return round(pence / money.PENCE_PER_POUND, 2)
+
+        windows = self.windows
+        return {
+            'turns': self.turns,
+            'window_turns': windows['cash_flow'].count,
+            'average_cash_flow': pounds(windows['cash_flow'].mean()),
+            'average_savings_change': pounds(windows['savings_change'].mean()),
+            'savings_volatility': pounds(windows['savings_change'].deviation()),
+            'net_worth_trend': pounds(windows['net_worth'].slope()),
+            'average_debt_to_income_ratio': round(windows['debt_to_income_ratio'].mean(), 4),
+            'peak_net_worth': pounds(self.peak_net_worth or 0),
+            'max_drawdown': pounds(self.max_drawdown),
+            'positive_cash_flow_streak': self.streak,
+            'longest_positive_cash_flow_streak': self.longest_streak
+        }
+
+    def history(self) -> Dict[str, List[Any]]:
+        """The window's series for charts, oldest turn first (amounts in pounds)"""
+        count = self.windows['cash_flow'].count
+        history: Dict[str, List[Any]] = {'turn': list(range(self.turns - count + 1, self.turns + 1))}
+        for name, window in self.windows.items():
+            values = window.ordered()
+            history[name] = values if SERIES[name] == 'd' else [money.to_pounds(value) for value in values]
+        return history
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    import json
+    if len(sys.argv) >= 2:
+        try:
+            from python_modules import sessions
+        except ImportError:
+            import sessions
+        metrics = HealthMetrics.decode(sessions.load(sys.argv[1]).get('health_metrics'))
+        print(json.dumps({'health': metrics.summary(), 'history': metrics.history()}, indent=2))
+    else:
+        print("Usage: python health_metrics.py <session_id>")
@@ -0,0 +1,53 @@
+"""
+Money arithmetic for the Financial Twin game
+Amounts are whole pence in integers, so adding up turns is exact. Percentages and rates
+are applied as exact fractions with rounding half up to the penny. Pounds only appear at
+the edges: parsing request values, building responses and formatting text.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Tuple
+
+PENCE_PER_POUND = 100
+
+
+def to_pence(pounds: Any) -> int:
+    """Whole pence in an amount of pounds (int, float, numeric string or Decimal), rounded half up"""
+    if isinstance(pounds, bool):
+        raise ValueError(f"Not an amount of money: {pounds!r}")
+    if isinstance(pounds, int):
+        return pounds * PENCE_PER_POUND
+    try:
+        amount = Decimal(str(pounds).strip().replace(',', '').lstrip('£'))
+    except InvalidOperation:
+        raise ValueError(f"Not an amount of money: {pounds!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Not an amount of money: {pounds!r}")
+    return int((amount * PENCE_PER_POUND).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_pounds(pence: int) -> float:
+    """Pounds for an amount in pence (the nearest float, exact to the penny when printed)"""
+    return pence / PENCE_PER_POUND
+
+
+def format_gbp(pence: int) -> str:
+    """An amount in pence as £1,234.56 (-£1,234.56 when negative)"""
+    sign = '-' if pence < 0 else ''
+    pounds, remainder = divmod(abs(pence), PENCE_PER_POUND)
+    return f"{sign}£{pounds:,}.{remainder:02d}"
+
+
+def mul_div(pence: int, numerator: int, denominator: int) -> int:
+    """pence * numerator / denominator, rounded half up to the penny"""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    return (2 * pence * numerator + denominator) // (2 * denominator)
+
+
+@lru_cache(maxsize=256)
+def ratio(factor: Any) -> Tuple[int, int]:
+    """A decimal factor (0.75, '1.1', 3) as an exact numerator and denominator"""
+    fraction = Fraction(str(factor))
+    return fraction.numerator, fraction.denominator
@@ -0,0 +1,329 @@
+"""
+Offline narration engine for the Financial Twin game
+Renders career-, scenario- and state-aware narratives from the game's structured data using
+precompiled templates and an intent index, so whole sessions can run without the LLM.
+"""
+import os
+import re
+import sys
+import zlib
+import string
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import money
+except ImportError:
+    import money
+
+# Careers with their own template variants and flavour text
+CAREERS = ('Student', 'Entrepreneur', 'Artist', 'Banker')
+
+# Narrative intents the engine can render
+WELCOME = 'welcome'
+INITIAL_STATUS = 'initial_status'
+TURN = 'turn'
+DECISION = 'decision'
+CONCLUSION = 'conclusion'
+GENERIC = 'generic'
+
+# Amounts in the context that templates show formatted, as <field>_text
+MONEY_FIELDS = ('income', 'expenses', 'savings', 'debt', 'monthly_savings')
+
+# Player moods derived from the state; used to pick state-aware variants
+POSITIVE = 'positive'
+STRETCHED = 'stretched'
+
+CAREER_FLAVOUR = {
+    'Student': "Between lectures, maintenance loan instalments and the odd night out, every pound has a job to do.",
+    'Entrepreneur': "Cash flow is the lifeblood of a young business, and you're the one keeping it pumping.",
+    'Artist': "Creative work rarely pays on a schedule, so a steady plan for irregular income is your secret weapon.",
+    'Banker': "A strong salary is a great start, but what you do with it decides how far it takes you."
+}
+
+CAREER_TIPS = {
+    'Student': "Keep an eye on your Plan 2 or Plan 5 repayment threshold - you only repay once you earn above it.",
+    'Entrepreneur': "Set aside money for your Self Assessment tax bill as you earn, not when it lands in January.",
+    'Artist': "Smooth out irregular income by paying yourself a fixed monthly 'salary' from a separate account.",
+    'Banker': "Use your full ISA allowance and check whether salary sacrifice into your pension saves you tax."
+}
+
+# Template sources keyed by (intent, career or None, mood or None). The most specific match wins.
+TEMPLATE_SOURCES: Dict[Tuple[str, Optional[str], Optional[str]], List[str]] = {
+    (WELCOME, None, None): [
+        """Welcome to the Financial Twin Simulation Game, {player_name}! 🎮
+
+You've chosen the {career} path - an exciting choice with its own challenges and opportunities. {career_flavour}
+
+As a {career}, you'll face realistic UK money decisions about budgeting, saving, investing and debt, and every choice shapes your virtual financial future.
+
+Ready to build some financial resilience? Let's dive in!""",
+        """Hello {player_name}, and welcome to your Financial Twin! 🎮
+
+Your journey as a {career} starts now. {career_flavour}
+
+Each scenario you face is drawn from real UK life, and your decisions will move your income, savings and debt. Think carefully, learn from the results and have fun!""",
+    ],
+    (INITIAL_STATUS, None, POSITIVE): [
+        """📊 Your Initial Financial Status as a {career}:
+• Monthly Income: {income_text}
+• Monthly Expenses: {expenses_text}
+• Savings: {savings_text}
+• Outstanding Debt: {debt_text}
+
+That leaves you {monthly_savings_text} a month to work with. Your first challenge is deciding where that money goes.
+
+{options_text}
+
+What approach would you like to take?""",
+    ],
+    (INITIAL_STATUS, None, STRETCHED): [
+        """📊 Your Initial Financial Status as a {career}:
+• Monthly Income: {income_text}
+• Monthly Expenses: {expenses_text}
+• Savings: {savings_text}
+• Outstanding Debt: {debt_text}
+
+Right now nothing is left over at the end of the month, so your first challenge is getting your budget back into balance.
+
+{options_text}
+
+What approach would you like to take?""",
+    ],
+    (TURN, None, None): [
+        """🎮 **Financial Twin Simulation Update** 🎮
+
+💫 **Current Status:**
+Level: {level} (XP: {xp_earned})
+🏆 Achievements: {achievements_text}
+
+💰 **Financial Metrics:**
+Monthly Income: {income_text}
+Monthly Expenses: {expenses_text}
+Savings: {savings_text}
+Debt: {debt_text}
+Monthly Savings: {monthly_savings_text}
+Debt-to-Income Ratio: {debt_to_income_ratio:.2%}
+Savings Ratio: {savings_ratio:.2%}
+
+✨ **Decision Impact:**
+Your choice to {financial_decision} has been processed.
+
+🎯 **Next Scenario:**
+{next_scenario}
+
+What's your decision?""",
+    ],
+    (DECISION, None, POSITIVE): [
+        """You've made your move: {financial_decision}. 👏
+
+Your finances now stand at {income_text} income and {expenses_text} expenses a month, leaving {monthly_savings_text} to put to work. Savings are {savings_text} and debt is {debt_text}.
+
+{career_flavour} What's your next move?""",
+    ],
+    (DECISION, None, STRETCHED): [
+        """You've made your move: {financial_decision}.
+
+Your spending of {expenses_text} a month is running ahead of your {income_text} income, so your {savings_text} savings are doing the heavy lifting while {debt_text} of debt remains.
+
+Closing that gap should be your next priority. What will you try next?""",
+    ],
+    (CONCLUSION, None, None): [
+        """🎉 Well played, {player_name}! You've completed the Financial Twin simulation as a {career}.
+
+🏆 Final Results:
+• XP Earned: {xp_earned}
+• Level: {level}
+• Achievements: {achievements_text}
+• Leaderboard Position: #{leaderboard_position}
+
+💡 Tips for your path:
+{tips_text}
+
+Keep building on the habits you practised here - a budget you stick to, an emergency fund and a plan for your debt go a long way.""",
+    ],
+    (GENERIC, None, None): [
+        """I've processed your financial information and have some insights to share.
+
+Making well-informed financial decisions is essential for building long-term wealth and security. Consider your current needs, future goals, and risk tolerance when evaluating your options.
+
+Would you like to continue with your current plan or explore alternatives?""",
+    ],
+}
+
+# Keywords that identify the intent of a free-text prompt (used when no intent is given)
+INTENT_KEYWORDS = {
+    'welcome': WELCOME,
+    'joined': WELCOME,
+    'initial': INITIAL_STATUS,
+    'conclusion': CONCLUSION,
+    'completed': CONCLUSION,
+    'congratulatory': CONCLUSION,
+    'decision': DECISION,
+    'decisions': DECISION,
+}
+# Priority when a prompt matches several intents
+INTENT_PRIORITY = (CONCLUSION, INITIAL_STATUS, WELCOME, DECISION)
+
+_WORD_PATTERN = re.compile(r"[a-z]+")
+_CAREER_PATTERN = re.compile(r"career path(?: of|:)\s*(\w+)|as an? (\w+)", re.IGNORECASE)
+_FORMATTER = string.Formatter()
+
+
+class CompiledTemplate:
+    """A template parsed once, with its required fields known up front"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields = frozenset(field.split('.')[0].split('[')[0]
+                                for _, field, _, _ in _FORMATTER.parse(source) if field)
+        self._render: Callable[[Dict[str, Any]], str] = source.format_map
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Render the template with a context that provides every field"""
+        return self._render(context)
+
+
+def _compile_index() -> Dict[Tuple[str, Optional[str], Optional[str]], Tuple[CompiledTemplate, ...]]:
+    """Compile every template source and index it by (intent, career, mood)"""
+    return {key: tuple(CompiledTemplate(source) for source in sources)
+            for key, sources in TEMPLATE_SOURCES.items()}
+
+
+_INDEX = _compile_index()
+
+
+def offline_mode(narration: Optional[str] = None) -> bool:
+    """Whether to narrate from templates instead of the LLM (per request, else FINANCIAL_TWIN_NO_LLM)"""
+    if narration is not None:
+        return narration == 'template'
+    return os.environ.get('FINANCIAL_TWIN_NO_LLM') == '1'
+
+
+def _mood(context: Dict[str, Any]) -> str:
+    """Derive the player's mood from their cash flow"""
+    income = context.get('income')
+    expenses = context.get('expenses')
+    if income is None or expenses is None:
+        return POSITIVE
+    return POSITIVE if float(income) - float(expenses) > 0 else STRETCHED
+
+
+def _variants(intent: str, career: Optional[str], mood: str) -> Tuple[CompiledTemplate, ...]:
+    """Look up the most specific template variants for an intent"""
+    for key in ((intent, career, mood), (intent, career, None), (intent, None, mood), (intent, None, None)):
+        variants = _INDEX.get(key)
+        if variants:
+            return variants
+    return _INDEX[(GENERIC, None, None)]
+
+
+def _prepare_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill derived fields (flavour text, formatted lists, cash flow) from the structured data"""
+    career = str(context.get('career') or context.get('career_path') or 'Student')
+    prepared = {
+        'player_name': 'Player',
+        'financial_decision': 'your decision',
+        'career': career,
+        'career_flavour': CAREER_FLAVOUR.get(career, ''),
+        'career_tip': CAREER_TIPS.get(career, "Build an emergency fund of three to six months of essential costs."),
+    }
+    prepared.update(context)
+    prepared['career'] = career
+
+    if 'income' in prepared and 'expenses' in prepared and 'monthly_savings' not in prepared:
+        prepared['monthly_savings'] = float(prepared['income']) - float(prepared['expenses'])
+    # Amounts arrive in pounds and are shown as £1,234.56 (-£1,234.56 when negative)
+    for field in MONEY_FIELDS:
+        if field in prepared and field + '_text' not in prepared:
+            prepared[field + '_text'] = money.format_gbp(money.to_pence(prepared[field]))
+    if 'achievements_text' not in prepared:
+        achievements = prepared.get('achievements') or []
+        prepared['achievements_text'] = ', '.join(achievements) if achievements else 'none yet - there is always next time'
+    if 'tips_text' not in prepared:
+        tips = prepared.get('tips') or [prepared['career_tip']]
+        prepared['tips_text'] = '\n'.join(f"• {tip['text'] if isinstance(tip, dict) else tip}" for tip in tips)
+    if 'options_text' not in prepared:
+        options = prepared.get('decision_options') or []
+        prepared['options_text'] = '\n'.join(f"{number}. {option['label']}: {option['description']}"
+                                             for number, option in enumerate(options, 1))
+    return prepared
+
+
+def render(intent: str, context: Dict[str, Any]) -> str:
+    """
+    Render a narrative for an intent from structured game data
+
+    Args:
+        intent: One of welcome, initial_status, turn, decision, conclusion, generic
+        context: Structured data (career, player_name, income, expenses, savings, debt, ...)
+
+    Returns:
+        The rendered narrative
+    """
+    prepared = _prepare_context(context)
+    variants = _variants(intent, prepared['career'], _mood(prepared))
+    if len(variants) == 1:
+        template = variants[0]
+    else:
+        # Stable per player so a narrative doesn't change between retries
+        seed = zlib.crc32(f"{prepared['player_name']}:{intent}".encode('utf-8'))
+        template = variants[seed % len(variants)]
+    try:
+        return template.render(prepared)
+    except (KeyError, ValueError, TypeError):
+        # Missing or malformed data: degrade to the generic narrative rather than failing
+        return _INDEX[(GENERIC, None, None)][0].render(prepared)
+
+
+def classify_prompt(prompt: str) -> Tuple[str, Optional[str]]:
+    """
+    Work out the intent and career of a free-text prompt in one pass
+
+    Returns:
+        Tuple of (intent, career or None)
+    """
+    words = set(_WORD_PATTERN.findall(prompt.lower()))
+    matched = {INTENT_KEYWORDS[word] for word in words.intersection(INTENT_KEYWORDS)}
+    intent = next((candidate for candidate in INTENT_PRIORITY if candidate in matched), GENERIC)
+
+    career = None
+    for match in _CAREER_PATTERN.finditer(prompt):
+        candidate = (match.group(1) or match.group(2) or '').title()
+        if candidate in CAREERS:
+            career = candidate
+            break
+    return intent, career
+
+
+def render_for_prompt(prompt: str, intent: Optional[str] = None, context: Optional[Dict[str, Any]] = None) -> str:
+    """Render a narrative for an LLM prompt that could not be answered, using its structured context when given"""
+    context = dict(context or {})
+    if intent is None:
+        intent, career = classify_prompt(prompt)
+        if career and 'career' not in context:
+            context['career'] = career
+    if intent == INITIAL_STATUS and 'income' not in context:
+        # Without the real figures, don't invent any
+        intent = GENERIC
+    return render(intent, context)
+
+
+def benchmark(count: int = 100000) -> float:
+    """Render `count` turn narratives and return narrations per second"""
+    import time
+    context = {'career': 'Banker', 'player_name': 'Alex', 'income': 5500.0, 'expenses': 4000.0,
+               'savings': 25000.0, 'debt': 8000.0, 'xp_earned': 150, 'level': 2,
+               'achievements': ['Strategic Saver'], 'debt_to_income_ratio': 0.12, 'savings_ratio': 4.5,
+               'financial_decision': 'take_cash', 'next_scenario': 'A new opportunity arrives.'}
+    started = time.perf_counter()
+    for _ in range(count):
+        render(TURN, context)
+    return count / (time.perf_counter() - started)
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    print(f"{benchmark():,.0f} narrations per second")
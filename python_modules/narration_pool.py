@@ -0,0 +1,181 @@
+"""
+Pre-generated narration pools for the Financial Twin game
+Welcome and initial-status narratives depend almost entirely on the career, so a few
+ready-made Mistral narratives are kept per career and refilled in the background.
+"""
+import os
+import sys
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background, prompt_budget
+except ImportError:
+    import background
+    import prompt_budget
+
+# Pool storage and sizing
+POOL_DIR = os.environ.get('FINANCIAL_TWIN_POOL_DIR', '/tmp/financial_twin_narration_pool')
+POOL_SIZE = int(os.environ.get('FINANCIAL_TWIN_POOL_SIZE', '3'))
+
+# How long a refill job may hold its claim before another one can take over
+REFILL_TTL_SECONDS = 300
+
+# Placeholder the LLM is asked to keep verbatim; replaced with the real name locally
+PLAYER_NAME_SLOT = '{{PLAYER_NAME}}'
+PLAYER_NAME_INSTRUCTION = f' Refer to the player only as {PLAYER_NAME_SLOT}, written exactly like that.'
+
+# Narrative kinds that can be pooled
+POOL_KINDS = ('welcome', 'initial_status')
+
+
+def pool_enabled(use_narration_pool: Optional[bool] = None) -> bool:
+    """Whether pooled narratives should be served (per request, else FINANCIAL_TWIN_NARRATION_POOL)"""
+    if use_narration_pool is not None:
+        return bool(use_narration_pool)
+    return os.environ.get('FINANCIAL_TWIN_NARRATION_POOL') == '1'
+
+
+def _game_module():
+    """Import the game module lazily (it imports this module)"""
+    try:
+        from python_modules import financial_twin_updated
+    except ImportError:
+        import financial_twin_updated
+    return financial_twin_updated
+
+
+def build_pool_prompt(kind: str, career: str) -> Tuple[str, str]:
+    """
+    Build the prompt and system message used to pre-generate a narrative
+
+    Args:
+        kind: Narrative kind ('welcome' or 'initial_status')
+        career: Career path the narrative is for
+
+    Returns:
+        Tuple of (prompt, system_message)
+    """
+    game = _game_module()
+    if kind == 'welcome':
+        return (game.build_welcome_prompt(PLAYER_NAME_SLOT, career),
+                game.WELCOME_SYSTEM_MESSAGE + PLAYER_NAME_INSTRUCTION)
+    if kind == 'initial_status':
+        return game.build_initial_status_prompt(career), game.INITIAL_STATUS_SYSTEM_MESSAGE
+    raise ValueError(f"Unknown narration pool kind: {kind}")
+
+
+def _pool_path(kind: str, career: str) -> str:
+    """Pool file for a kind and career, keyed by the prompt so edited prompts start a fresh pool"""
+    prompt, system_message = build_pool_prompt(kind, career)
+    fingerprint = hashlib.sha1((prompt + system_message).encode('utf-8')).hexdigest()[:12]
+    safe_career = ''.join(c for c in career if c.isalnum()) or 'unknown'
+    return os.path.join(POOL_DIR, f"{kind}_{safe_career}_{fingerprint}.json")
+
+
+def personalise(narrative: str, player_name: Optional[str]) -> str:
+    """Fill the cheap slots of a pooled narrative locally"""
+    return narrative.replace(PLAYER_NAME_SLOT, player_name or 'Player')
+
+
+def take(kind: str, career: str, player_name: Optional[str] = None) -> Optional[str]:
+    """
+    Take a ready-made narrative from the pool and schedule a refill if it runs low
+
+    Args:
+        kind: Narrative kind ('welcome' or 'initial_status')
+        career: Career path the narrative is for
+        player_name: Name substituted into the player name slot
+
+    Returns:
+        The personalised narrative, or None if the pool is empty
+    """
+    path = _pool_path(kind, career)
+    with background.file_lock(path):
+        narratives: List[str] = background.read_json(path, [])
+        narrative = narratives.pop(0) if narratives else None
+        if narrative is not None:
+            background.write_json_atomic(path, narratives)
+        remaining = len(narratives)
+
+    if remaining < POOL_SIZE:
+        request_refill(kind, career)
+
+    return personalise(narrative, player_name) if narrative is not None else None
+
+
+def request_refill(kind: str, career: str) -> None:
+    """Start a background refill for a pool unless one is already running"""
+    marker = _pool_path(kind, career) + '.refilling'
+    if os.path.exists(marker):
+        return
+    background.spawn(os.path.abspath(__file__), 'refill', kind, career)
+
+
+def refill(kind: str, career: str, size: int = POOL_SIZE) -> int:
+    """
+    Generate narratives until the pool holds `size` of them
+
+    Only real Mistral output is pooled; fallback text is discarded so players
+    never get canned text when the LLM is reachable.
+
+    Returns:
+        Number of narratives added
+    """
+    try:
+        from python_modules.abacusai import ApiClient
+    except ImportError:
+        from abacusai import ApiClient
+
+    path = _pool_path(kind, career)
+    marker = path + '.refilling'
+    if not background.claim_marker(marker, REFILL_TTL_SECONDS):
+        return 0
+
+    added = 0
+    try:
+        prompt, system_message = build_pool_prompt(kind, career)
+        budgeted = prompt_budget.prepare(kind, prompt, system_message)
+        client = ApiClient()
+        while len(background.read_json(path, [])) < size:
+            response = budgeted.evaluate(client)
+            if response.source == 'fallback':
+                # The LLM is unavailable; try again on the next drain
+                break
+            with background.file_lock(path):
+                narratives = background.read_json(path, [])
+                narratives.append(response.content)
+                background.write_json_atomic(path, narratives)
+            added += 1
+    finally:
+        background.release_marker(marker)
+    return added
+
+
+def pool_status() -> Dict[str, int]:
+    """Number of ready narratives per kind and career"""
+    game = _game_module()
+    return {f"{kind}:{career}": len(background.read_json(_pool_path(kind, career), []))
+            for kind in POOL_KINDS for career in game.CAREER_DATA}
+
+
+def warm_all(size: int = POOL_SIZE) -> Dict[str, int]:
+    """Fill every pool for every career (run at deploy time or from cron)"""
+    game = _game_module()
+    return {f"{kind}:{career}": refill(kind, career, size)
+            for kind in POOL_KINDS for career in game.CAREER_DATA}
+
+
+# Main entry point when called directly (used by background refills)
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == 'refill':
+        refill(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'warm':
+        print(warm_all())
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'status':
+        print(pool_status())
+    else:
+        print("Usage: python narration_pool.py refill <kind> <career> | warm | status")
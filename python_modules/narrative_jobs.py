@@ -0,0 +1,144 @@
+"""
+Background narrative jobs for the Financial Twin game
+In progressive mode the game returns its structured payload with a templated narrative
+straight away and the Mistral narrative is generated here; clients poll it by job id.
+"""
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background
+except ImportError:
+    import background
+
+# Job storage and how long finished jobs are kept
+JOBS_DIR = os.environ.get('FINANCIAL_TWIN_JOBS_DIR', '/tmp/financial_twin_jobs')
+JOB_TTL_SECONDS = int(os.environ.get('FINANCIAL_TWIN_JOB_TTL', '3600'))
+
+# Job states
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _job_path(job_id: str) -> str:
+    """File holding a job's state"""
+    safe_id = ''.join(c for c in str(job_id) if c.isalnum())
+    return os.path.join(JOBS_DIR, safe_id + '.json')
+
+
+def submit(kind: str, budgeted: Any, fallback_content: str) -> str:
+    """
+    Queue an LLM narrative and start generating it in the background
+
+    Args:
+        kind: Which narrative this is (e.g. 'initial_status', 'conclusion')
+        budgeted: BudgetedPrompt with the prompt and generation settings
+        fallback_content: Templated narrative served while the job is pending or if it fails
+
+    Returns:
+        The job id
+    """
+    job_id = uuid.uuid4().hex
+    background.write_json_atomic(_job_path(job_id), {
+        'job_id': job_id,
+        'kind': kind,
+        'status': PENDING,
+        'created': time.time(),
+        'prompt': budgeted.prompt,
+        'system_message': budgeted.system_message,
+        'max_tokens': budgeted.max_tokens,
+        'temperature': budgeted.temperature,
+        'fallback_content': fallback_content
+    })
+    if background.spawn(os.path.abspath(__file__), 'run', job_id) is None:
+        _finish(job_id, FAILED, fallback_content, 'fallback')
+    return job_id
+
+
+def _finish(job_id: str, status: str, content: str, source: str) -> None:
+    """Record the outcome of a job"""
+    path = _job_path(job_id)
+    with background.file_lock(path):
+        job = background.read_json(path, {})
+        job.update({'status': status, 'content': content, 'source': source, 'finished': time.time()})
+        background.write_json_atomic(path, job)
+
+
+def run(job_id: str) -> None:
+    """Generate the narrative for a queued job (runs in the background process)"""
+    try:
+        from python_modules.abacusai import ApiClient
+    except ImportError:
+        from abacusai import ApiClient
+
+    job = background.read_json(_job_path(job_id))
+    if not job or job.get('status') != PENDING:
+        return
+    try:
+        response = ApiClient().evaluate_prompt(prompt=job['prompt'],
+                                               system_message=job['system_message'],
+                                               max_tokens=job.get('max_tokens'),
+                                               temperature=job.get('temperature'))
+        if response.source == 'fallback':
+            # Keep the templated narrative rather than replacing it with canned text
+            _finish(job_id, FAILED, job['fallback_content'], 'fallback')
+        else:
+            _finish(job_id, DONE, response.content, response.source)
+    except Exception as e:
+        with open("/tmp/python_errors.log", "a") as f:
+            f.write(f"Error in narrative job {job_id}: {str(e)}\n")
+        _finish(job_id, FAILED, job['fallback_content'], 'fallback')
+
+
+def get(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a narrative job
+
+    Returns:
+        Dictionary with job_id, kind, status and content (the templated narrative until done),
+        or None if the job is unknown or expired
+    """
+    job = background.read_json(_job_path(job_id))
+    if not job:
+        return None
+    return {
+        'job_id': job['job_id'],
+        'kind': job.get('kind'),
+        'status': job.get('status'),
+        'content': job.get('content', job.get('fallback_content', ''))
+    }
+
+
+def purge_expired() -> int:
+    """Delete jobs older than the TTL; returns the number removed"""
+    removed = 0
+    if not os.path.isdir(JOBS_DIR):
+        return removed
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for name in os.listdir(JOBS_DIR):
+        path = os.path.join(JOBS_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Main entry point when called directly (used by background jobs)
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == 'run':
+        run(sys.argv[2])
+        purge_expired()
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'purge':
+        print(purge_expired())
+    else:
+        print("Usage: python narrative_jobs.py run <job_id> | purge")
@@ -0,0 +1,294 @@
+"""
+Best-move hints for the Financial Twin game
+Solves, per career, which option of each scenario maximises expected net worth over a
+horizon of turns by value iteration over a discretized state, and caches the policy on
+disk so a turn can recommend an option with a table lookup. Transitions come from the
+game's own turn rules: the decision step of the turn engine, then the crisis draw.
+"""
+import os
+import sys
+import json
+import base64
+import bisect
+import hashlib
+import itertools
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background, crisis_engine, money
+except ImportError:
+    import background
+    import crisis_engine
+    import money
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Policy storage
+POLICY_DIR = os.environ.get('FINANCIAL_TWIN_POLICY_DIR', '/tmp/financial_twin_policy')
+
+# How long a build may hold its claim before another one can take over
+BUILD_TTL_SECONDS = 600
+
+# Turns (one month each) the policy plans ahead
+HORIZON = 12
+
+# Grid points per dimension, relative to the career's starting state
+INCOME_FACTORS = (0.25, 0.5, 0.75, 0.9, 1.0, 1.1, 1.25, 1.5, 2.0)
+EXPENSE_FACTORS = (0.25, 0.5, 0.75, 0.9, 1.0, 1.1, 1.25, 1.5, 2.0)
+DEBT_FACTORS = (0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+# Savings are scaled by the larger of the starting savings and three months of income
+SAVINGS_FACTORS = (-1.0, -0.25, 0.0, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+# Policies loaded in this process, by career
+_LOADED: Dict[str, 'Policy'] = {}
+
+
+def _game_module():
+    """Import the game module lazily (it imports this module)"""
+    try:
+        from python_modules import financial_twin_updated
+    except ImportError:
+        import financial_twin_updated
+    return financial_twin_updated
+
+
+def state_grid(career: str) -> Tuple[Tuple[float, ...], ...]:
+    """Grid points of income, expenses, savings and debt for a career"""
+    start = _game_module().CAREER_DATA.get(career, _game_module().CAREER_DATA['Student'])
+    savings_scale = max(start['savings'], start['income'] * 3)
+    debt_scale = start['debt'] or start['income'] * 3
+    return (tuple(round(start['income'] * factor, 2) for factor in INCOME_FACTORS),
+            tuple(round(start['expenses'] * factor, 2) for factor in EXPENSE_FACTORS),
+            tuple(round(savings_scale * factor, 2) for factor in SAVINGS_FACTORS),
+            tuple(round(debt_scale * factor, 2) for factor in DEBT_FACTORS))
+
+
+def _midpoints(points: Sequence[float]) -> List[float]:
+    """Boundaries between neighbouring grid points, for nearest-point lookup"""
+    return [(low + high) / 2 for low, high in zip(points, points[1:])]
+
+
+def _model(career: str) -> Dict[str, Any]:
+    """Everything the policy depends on; its hash names the cache file"""
+    game = _game_module()
+    scenarios = game.SCENARIOS_WITH_OPTIONS.get(career, game.SCENARIOS_WITH_OPTIONS['Student'])
+    engine = game.CRISIS_ENGINE
+    crises = [(engine.events[name].get('cost', 0), engine.events[name].get('income_reduction', 0)) for name in engine.names]
+    return {
+        'career': career,
+        'horizon': HORIZON,
+        'grid': state_grid(career),
+        'scenarios': [[option['value'] for option in scenario['options']] for scenario in scenarios],
+        'crisis_probabilities': [engine.probabilities(career, band) for band in crisis_engine.BUFFER_BANDS],
+        'cushion_months': engine.cushion_months,
+        'crises': crises,
+        # The decision step of the turn rules (game.decision_outcomes) depends on these
+        'decision_rules': [game.INVESTMENT_COST, game.INVESTMENT_INCOME_GAIN, game.INVESTMENT_SUCCESS_PROBABILITY,
+                           game.SAVINGS_DEPOSIT, game.DEBT_PAYMENT_LIMIT]
+    }
+
+
+def _policy_path(model: Dict[str, Any]) -> str:
+    """Cache file for a model, keyed by its content so edited scenarios get a fresh policy"""
+    fingerprint = hashlib.sha1(json.dumps(model, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    safe_career = ''.join(c for c in model['career'] if c.isalnum()) or 'unknown'
+    return os.path.join(POLICY_DIR, f"policy_{safe_career}_{fingerprint}.json")
+
+
+def _transitions(model: Dict[str, Any]) -> List[List[Tuple[List[List[int]], List[List[float]]]]]:
+    """
+    Where each option leads, by the game's own turn rules: the decision's outcomes, each followed
+    by no crisis or by one of the crises its savings buffer makes likely (expenses never change)
+
+    Returns:
+        Per [scenario][option], the next-state indexes and their probabilities as [outcome][state]
+        lists (outcomes past a state's last one point back at it with probability 0)
+    """
+    game = _game_module()
+    engine = game.CRISIS_ENGINE
+    boundaries = [_midpoints(points) for points in model['grid']]
+    sizes = [len(points) for points in model['grid']]
+    band_probabilities = dict(zip(crisis_engine.BUFFER_BANDS, model['crisis_probabilities']))
+    crises = (None,) + tuple(engine.names)
+    states = [tuple(money.to_pence(value) for value in state) for state in itertools.product(*model['grid'])]
+    width = 2 * len(crises)
+
+    def index_of(values: Sequence[int]) -> int:
+        index = 0
+        for value, boundary, size in zip(values, boundaries, sizes):
+            index = index * size + bisect.bisect(boundary, money.to_pounds(value))
+        return index
+
+    # Most decisions share their results, so the crisis step is worked out once per decided state
+    after_decision: Dict[Tuple[int, ...], List[Tuple[int, float]]] = {}
+
+    def crisis_step(income: int, expense: int, saving: int, debt: int) -> List[Tuple[int, float]]:
+        key = (income, expense, saving, debt)
+        if key not in after_decision:
+            probabilities = band_probabilities[engine.band(saving, expense)]
+            reached = []
+            for crisis, probability in zip(crises, probabilities):
+                crisis_income, crisis_saving, _ = engine.apply(crisis, income, saving)
+                reached.append((index_of((crisis_income, expense, crisis_saving, debt)), probability))
+            after_decision[key] = reached
+        return after_decision[key]
+
+    by_value: Dict[str, Tuple[List[List[int]], List[List[float]]]] = {}
+    for value in {value for scenario in model['scenarios'] for value in scenario}:
+        targets: List[List[int]] = [[] for _ in range(width)]
+        weights: List[List[float]] = [[] for _ in range(width)]
+        for state_index, (income, expense, saving, debt) in enumerate(states):
+            outcomes, _ = game.decision_outcomes(value, income, saving, debt)
+            reached = [(target, probability * crisis_probability)
+                       for probability, new_income, new_saving, new_debt in outcomes
+                       for target, crisis_probability in crisis_step(new_income, expense, new_saving, new_debt)]
+            reached += [(state_index, 0.0)] * (width - len(reached))
+            for column, (target, probability) in enumerate(reached):
+                targets[column].append(target)
+                weights[column].append(probability)
+        by_value[value] = (targets, weights)
+    return [[by_value[value] for value in scenario] for scenario in model['scenarios']]
+
+
+def _solve_python(model: Dict[str, Any]) -> List[List[int]]:
+    """Value iteration with plain lists; returns the best option index per [scenario][state]"""
+    transitions = _transitions(model)
+    values = [saving - debt for _, _, saving, debt in itertools.product(*model['grid'])]
+    states = range(len(values))
+    scenario_count = len(transitions)
+
+    best: List[List[int]] = []
+    for _ in range(model['horizon']):
+        # Expected value of each option from each state, given the next turn's values
+        q_values = [[[sum(weight[state] * values[target[state]] for target, weight in zip(targets, weights))
+                      for state in states] for targets, weights in scenario]
+                    for scenario in transitions]
+        best = [[max(range(len(scenario)), key=lambda option: scenario[option][state]) for state in states]
+                for scenario in q_values]
+        # The next scenario is drawn uniformly, and the player then takes its best option
+        values = [sum(q_values[scenario][best[scenario][state]][state] for scenario in range(scenario_count)) / scenario_count
+                  for state in states]
+    return best
+
+
+def _solve_numpy(model: Dict[str, Any]) -> List[List[int]]:
+    """Value iteration over numpy arrays; returns the best option index per [scenario][state]"""
+    # targets[scenario] and weights[scenario]: arrays of shape (options, outcomes, states)
+    transitions = _transitions(model)
+    targets = [np.array([option[0] for option in scenario]) for scenario in transitions]
+    weights = [np.array([option[1] for option in scenario]) for scenario in transitions]
+    _, _, saving, debt = (axis.ravel() for axis in np.meshgrid(*(np.array(points) for points in model['grid']),
+                                                               indexing='ij'))
+
+    values = saving - debt
+    best = []
+    for _ in range(model['horizon']):
+        q_values = [(weight * values[target]).sum(axis=1) for target, weight in zip(targets, weights)]
+        best = [np.argmax(q, axis=0) for q in q_values]
+        values = np.mean([q.max(axis=0) for q in q_values], axis=0)
+    return [choice.astype(int).tolist() for choice in best]
+
+
+class Policy:
+    """A solved policy: the best option index for every scenario and grid state"""
+
+    def __init__(self, career: str, grid: Sequence[Sequence[float]], options: List[List[str]], table: List[bytes]):
+        self.career = career
+        self.options = options
+        self.table = table
+        self._boundaries = [_midpoints(points) for points in grid]
+        self._sizes = [len(points) for points in grid]
+
+    def state_index(self, income: float, expenses: float, savings: float, debt: float) -> int:
+        """Flat index of the grid state nearest to a player state"""
+        index = 0
+        for value, boundary, size in zip((income, expenses, savings, debt), self._boundaries, self._sizes):
+            index = index * size + bisect.bisect(boundary, float(value))
+        return index
+
+    def recommend(self, scenario_index: int, income: float, expenses: float, savings: float, debt: float) -> Optional[str]:
+        """Value of the best option for a scenario from a player state"""
+        if not 0 <= scenario_index < len(self.table):
+            return None
+        option = self.table[scenario_index][self.state_index(income, expenses, savings, debt)]
+        return self.options[scenario_index][option]
+
+
+def build(career: str) -> str:
+    """
+    Solve and cache the policy for a career (runs offline or in the background)
+
+    Returns:
+        Path of the cached policy
+    """
+    model = _model(career)
+    path = _policy_path(model)
+    best = _solve_numpy(model) if np is not None else _solve_python(model)
+    background.write_json_atomic(path, {
+        'career': career,
+        'horizon': model['horizon'],
+        'grid': model['grid'],
+        'options': model['scenarios'],
+        'policy': [base64.b64encode(bytes(choices)).decode('ascii') for choices in best]
+    })
+    return path
+
+
+def load(career: str) -> Optional[Policy]:
+    """Load the cached policy for a career, or None if it hasn't been built yet (checked again next time)"""
+    if career not in _LOADED:
+        data = background.read_json(_policy_path(_model(career)))
+        if not data:
+            return None
+        _LOADED[career] = Policy(career, data['grid'], data['options'],
+                                 [base64.b64decode(encoded) for encoded in data['policy']])
+    return _LOADED[career]
+
+
+def request_build(career: str) -> None:
+    """Start a background build for a career unless one is already running"""
+    marker = _policy_path(_model(career)) + '.building'
+    if os.path.exists(marker):
+        return
+    background.spawn(os.path.abspath(__file__), 'build', career)
+
+
+def _build_claimed(career: str) -> Optional[str]:
+    """Build a policy while holding its build marker"""
+    marker = _policy_path(_model(career)) + '.building'
+    if not background.claim_marker(marker, BUILD_TTL_SECONDS):
+        return None
+    try:
+        return build(career)
+    finally:
+        background.release_marker(marker)
+
+
+def recommended_option(career: str, scenario_index: int, income: float, expenses: float, savings: float, debt: float) -> Optional[str]:
+    """
+    Best option for a scenario from the player's state, by table lookup
+
+    Returns:
+        The option value, or None if the career's policy isn't built yet (a build is started)
+    """
+    policy = load(career)
+    if policy is None:
+        request_build(career)
+        return None
+    return policy.recommend(scenario_index, income, expenses, savings, debt)
+
+
+# Main entry point when called directly (used by background builds)
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == 'build':
+        print(_build_claimed(sys.argv[2]))
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'build-all':
+        print({career: _build_claimed(career) for career in _game_module().CAREER_DATA})
+    else:
+        print("Usage: python policy.py build <career> | build-all")
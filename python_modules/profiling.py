@@ -0,0 +1,175 @@
+"""
+On-demand profiling for the Financial Twin game
+This module runs a game call under cProfile and a sampling profiler (optionally with
+tracemalloc) and writes pstats, collapsed-stack flamegraph input and allocation reports.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Where profile artefacts are written
+PROFILE_DIR = os.environ.get('FINANCIAL_TWIN_PROFILE_DIR', '/tmp/financial_twin_profiles')
+
+# Default sampling interval for the stack sampler, in seconds
+DEFAULT_SAMPLE_INTERVAL = 0.001
+
+# Number of entries kept in the text reports
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+
+def profiling_requested(data: Dict[str, Any]) -> bool:
+    """Check whether a game_runner request (or the environment) asks for profiling"""
+    return bool(data.get('profile')) or os.environ.get('FINANCIAL_TWIN_PROFILE') == '1'
+
+
+def memory_profiling_requested(data: Dict[str, Any]) -> bool:
+    """Check whether tracemalloc snapshots should be taken as well"""
+    return bool(data.get('profile_memory')) or os.environ.get('FINANCIAL_TWIN_PROFILE_MEMORY') == '1'
+
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval and counts collapsed stacks"""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='financial-twin-sampler', daemon=True)
+
+    def start(self) -> None:
+        """Start sampling in a background thread"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit"""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Sampling loop"""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(frames))] += 1
+            self.sample_count += 1
+
+    def write_collapsed(self, path: str) -> None:
+        """Write the samples in collapsed-stack format (flamegraph.pl / speedscope input)"""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def profile_call(
+    func: Callable[..., Any],
+    *args: Any,
+    label: str = 'game',
+    memory: bool = False,
+    profile_dir: str = PROFILE_DIR,
+    sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    **kwargs: Any
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run a function under cProfile and the stack sampler, writing reports to profile_dir
+
+    Args:
+        func: Function to profile
+        *args: Positional arguments for func
+        label: Label used in the artefact file names (e.g. the game function name)
+        memory: Also take tracemalloc snapshots and report the top allocation sites
+        profile_dir: Directory the artefacts are written to
+        sample_interval: Sampling interval for the stack sampler in seconds
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Tuple of (func's return value, report dictionary with artefact paths and totals)
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    safe_label = ''.join(c for c in str(label) if c.isalnum() or c == '_') or 'call'
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}-{uuid.uuid4().hex[:8]}"
+    base_path = os.path.join(profile_dir, run_id)
+
+    # A shorter switch interval lets the sampler thread actually get the GIL at its rate
+    previous_switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(previous_switch_interval, sample_interval))
+
+    if memory:
+        tracemalloc.start(25)
+    sampler = StackSampler(threading.get_ident(), sample_interval)
+    profiler = cProfile.Profile()
+
+    started = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        sampler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        sys.setswitchinterval(previous_switch_interval)
+        snapshot = tracemalloc.take_snapshot() if memory else None
+        if memory:
+            tracemalloc.stop()
+
+    report: Dict[str, Any] = {
+        "run_id": run_id,
+        "wall_ms": round(elapsed_ms, 3),
+        "samples": sampler.sample_count
+    }
+
+    # Deterministic profile: raw pstats plus a readable top-functions report
+    profiler.dump_stats(base_path + '.pstats')
+    with open(base_path + '.top.txt', 'w') as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    report["pstats"] = base_path + '.pstats'
+    report["top_functions"] = base_path + '.top.txt'
+
+    # Sampled stacks for flamegraphs
+    sampler.write_collapsed(base_path + '.collapsed')
+    report["collapsed_stacks"] = base_path + '.collapsed'
+
+    # Allocation sites
+    if snapshot is not None:
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ])
+        top_stats = snapshot.statistics('lineno')
+        with open(base_path + '.alloc.txt', 'w') as f:
+            for stat in top_stats[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+        report["allocations"] = base_path + '.alloc.txt'
+        report["allocated_bytes"] = sum(stat.size for stat in top_stats)
+
+    return result, report
+
+
+def write_profile_log(report: Optional[Dict[str, Any]], path: str = '/tmp/python_game_profile.log') -> None:
+    """Append a profile report summary to the profile log"""
+    if report is None:
+        return
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(report) + "\n")
+    except OSError:
+        # Profiling output must never break a game request
+        pass
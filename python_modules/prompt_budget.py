@@ -0,0 +1,205 @@
+"""
+Prompt token budgeting for the Financial Twin game
+This module estimates prompt sizes locally, compacts repeated boilerplate, enforces
+per-function input budgets and picks per-function generation settings for Mistral.
+"""
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Where per-call budget reports are appended
+BUDGET_LOG_PATH = '/tmp/python_prompt_budget.log'
+
+# Words longer than this are counted as several tokens
+_CHARS_PER_WORD_TOKEN = 6
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Roughly how many English words Mistral writes per output token, with some margin
+WORDS_PER_OUTPUT_TOKEN = 0.6
+
+# Added to every system message so the model finishes within the output cap instead of being cut off
+LENGTH_INSTRUCTION = " Keep the message under {words} words."
+
+
+class PromptBudget:
+    """Input/output token budget and sampling settings for one game function"""
+
+    def __init__(self, max_input_tokens: int, max_output_tokens: int, temperature: float):
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.temperature = temperature
+
+    @property
+    def max_words(self) -> int:
+        """Message length to ask for, in words (a round number that fits the output cap)"""
+        return int(self.max_output_tokens * WORDS_PER_OUTPUT_TOKEN) // 10 * 10
+
+
+# Per-function budgets. Output caps follow the length each narrative actually needs.
+BUDGETS = {
+    'welcome': PromptBudget(max_input_tokens=220, max_output_tokens=220, temperature=0.8),
+    'initial_status': PromptBudget(max_input_tokens=380, max_output_tokens=420, temperature=0.7),
+    'conclusion': PromptBudget(max_input_tokens=380, max_output_tokens=350, temperature=0.7),
+    'default': PromptBudget(max_input_tokens=500, max_output_tokens=500, temperature=0.7)
+}
+
+# Verbose boilerplate repeated across the game prompts and its compact equivalent
+BOILERPLATE_REPLACEMENTS = [
+    ("Use examples that are relevant to the UK financial system (ISAs, Help to Buy, NS&I, UK tax bands, etc.) and British life scenarios rather than American ones.",
+     "Use UK examples (ISAs, Help to Buy, NS&I, UK tax bands) and British life scenarios."),
+    ("Use UK-specific financial terms and references (ISAs, Help to Buy, NS&I, UK tax bands, etc.) in your advice.",
+     "Use UK terms (ISAs, Help to Buy, NS&I, UK tax bands) in your advice."),
+    ("Present this initial financial status to the player, providing a clear breakdown using British pounds (£).",
+     "Present this status clearly in £."),
+    ("IMPORTANT: The scenario must relate directly to these exact options. Do not reference any other choices that aren't listed above. Ensure your challenge scenario logically connects to these specific options.",
+     "IMPORTANT: The scenario must lead only to these exact options."),
+    ("Explain that they can choose from one of the following career paths, each with unique financial challenges and story-driven missions:\n\n1. Student\n2. Entrepreneur\n3. Artist\n4. Banker",
+     "Careers available: Student, Entrepreneur, Artist, Banker; each has unique challenges and missions."),
+    ("Introduce the player to the Interactive Financial Simulation Game where they will create a virtual financial twin and navigate through life's financial challenges.",
+     "Introduce the Interactive Financial Simulation Game: they build a virtual financial twin and face life's financial challenges."),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text without calling a tokenizer"""
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text or ''):
+        tokens += 1 + (len(piece) - 1) // _CHARS_PER_WORD_TOKEN
+    return tokens
+
+
+def compact(text: str) -> str:
+    """Compact a prompt: shorten known boilerplate, drop repeated lines and collapse whitespace"""
+    for verbose, short in BOILERPLATE_REPLACEMENTS:
+        text = text.replace(verbose, short)
+    lines: List[str] = []
+    seen = set()
+    for line in text.splitlines():
+        line = ' '.join(line.split())
+        if not line:
+            # Keep single blank lines as paragraph breaks
+            if lines and lines[-1]:
+                lines.append('')
+            continue
+        if line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return '\n'.join(lines).strip()
+
+
+def _essential(line: str) -> bool:
+    """Whether a prompt line carries the player's data: list items (figures, options, tips) or amounts"""
+    return line.startswith('- ') or '£' in line or any(character.isdigit() for character in line)
+
+
+def _fit(text: str, max_tokens: int) -> Tuple[str, int, bool]:
+    """
+    Drop lines from the middle of a prompt until it fits, keeping its opening and closing
+    instructions and every essential line (figures and decision options are never dropped)
+
+    Returns:
+        Tuple of (prompt, number of lines dropped, whether it now fits)
+    """
+    lines = text.split('\n')
+    tokens = estimate_tokens(text)
+    middle = (len(lines) - 1) / 2
+    droppable = sorted((index for index in range(1, len(lines) - 1) if not _essential(lines[index])),
+                       key=lambda index: abs(index - middle))
+    dropped = set()
+    for index in droppable:
+        if tokens <= max_tokens:
+            break
+        dropped.add(index)
+        tokens -= estimate_tokens(lines[index])
+    return '\n'.join(line for index, line in enumerate(lines) if index not in dropped), len(dropped), tokens <= max_tokens
+
+
+class BudgetedPrompt:
+    """A compacted prompt with the generation settings chosen for it"""
+
+    def __init__(self, prompt: str, system_message: str, max_tokens: int, temperature: float, stats: Dict[str, Any]):
+        self.prompt = prompt
+        self.system_message = system_message
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.stats = stats
+
+    def evaluate(self, client: Any, intent: Optional[str] = None, context: Optional[Dict[str, Any]] = None) -> Any:
+        """Send the prompt through an ApiClient with the budgeted settings (intent/context feed the offline fallback)"""
+        return client.evaluate_prompt(prompt=self.prompt,
+                                      system_message=self.system_message,
+                                      max_tokens=self.max_tokens,
+                                      temperature=self.temperature,
+                                      intent=intent,
+                                      context=context)
+
+
+def prepare(function: str, prompt: str, system_message: str = '') -> BudgetedPrompt:
+    """
+    Compact a prompt and fit it to the budget of a game function, and ask for a message
+    length that fits its output cap
+
+    Args:
+        function: Budget name ('welcome', 'initial_status', 'conclusion')
+        prompt: The prompt built by the game function
+        system_message: The system message sent with it
+
+    Returns:
+        BudgetedPrompt with the compacted prompt and generation settings
+    """
+    budget = BUDGETS.get(function, BUDGETS['default'])
+    original_tokens = estimate_tokens(prompt) + estimate_tokens(system_message)
+
+    compact_system = compact(system_message) + LENGTH_INSTRUCTION.format(words=budget.max_words)
+    compact_prompt = compact(prompt)
+    prompt_budget = max(budget.max_input_tokens - estimate_tokens(compact_system), 1)
+    lines_dropped, fits = 0, True
+    if estimate_tokens(compact_prompt) > prompt_budget:
+        compact_prompt, lines_dropped, fits = _fit(compact_prompt, prompt_budget)
+
+    compacted_tokens = estimate_tokens(compact_prompt) + estimate_tokens(compact_system)
+    stats = {
+        'function': function,
+        'input_tokens_before': original_tokens,
+        'input_tokens_after': compacted_tokens,
+        'input_tokens_saved': original_tokens - compacted_tokens,
+        'input_budget': budget.max_input_tokens,
+        'lines_dropped': lines_dropped,
+        # Only essential lines were left and the prompt is sent over budget rather than without them
+        'over_budget': not fits,
+        'max_output_tokens': budget.max_output_tokens,
+        'output_tokens_saved': BUDGETS['default'].max_output_tokens - budget.max_output_tokens,
+        'temperature': budget.temperature
+    }
+    write_budget_log(stats)
+    return BudgetedPrompt(compact_prompt, compact_system, budget.max_output_tokens, budget.temperature, stats)
+
+
+def write_budget_log(stats: Dict[str, Any], path: str = BUDGET_LOG_PATH) -> None:
+    """Append a budget report to the budget log"""
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(stats) + "\n")
+    except OSError:
+        pass
+
+
+def summarize_log(path: str = BUDGET_LOG_PATH) -> Dict[str, Dict[str, float]]:
+    """Total calls and tokens saved per function from the budget log"""
+    summary: Dict[str, Dict[str, float]] = {}
+    if not os.path.exists(path):
+        return summary
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                stats = json.loads(line)
+            except ValueError:
+                continue
+            entry = summary.setdefault(stats.get('function', 'default'),
+                                       {'calls': 0, 'input_tokens_saved': 0, 'output_tokens_saved': 0})
+            entry['calls'] += 1
+            entry['input_tokens_saved'] += stats.get('input_tokens_saved', 0)
+            entry['output_tokens_saved'] += stats.get('output_tokens_saved', 0)
+    return summary
@@ -0,0 +1,286 @@
+"""
+Slot-templated prompt cache for the Financial Twin game
+Personalised prompts differ between players mostly in their names, pound amounts,
+percentages and labelled figures such as "Level: 3". The cache canonicalises a prompt by
+replacing those slots with placeholders such as {{PLAYER_NAME}} or {{AMOUNT_1}}, asks the LLM
+for a completion that keeps the placeholders, and fills in each player's real values locally.
+One generation then serves every player whose prompt has the same shape. Completions that
+write out amounts or numbers of their own, or mangle or invent placeholders, are not cached;
+the prompt is then sent again with the real values. Hit rates and per-slot substitution results are counted for the stats report.
+"""
+import os
+import re
+import sys
+import time
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules.abacusai import Response
+    from python_modules import background, narration, narration_pool, tracing
+except ImportError:
+    from abacusai import Response
+    import background
+    import tracing
+    import narration
+    import narration_pool
+
+# Cache storage and how long a completion is reused
+CACHE_DIR = os.environ.get('FINANCIAL_TWIN_PROMPT_CACHE_DIR', '/tmp/financial_twin_prompt_cache')
+CACHE_TTL_SECONDS = int(os.environ.get('FINANCIAL_TWIN_PROMPT_CACHE_TTL', str(7 * 86400)))
+STATS_PATH = os.path.join(CACHE_DIR, 'stats.json')
+
+# Slot kinds, with the pattern that finds their values in a prompt (names come from the context).
+# Numbers are the whole value of a "Label: 42" line, such as XP, level or leaderboard position.
+SLOT_PATTERNS = {
+    'amount': re.compile(r"-?£\d+(?:,\d{3})*(?:\.\d+)?"),
+    'percent': re.compile(r"-?\d+(?:\.\d+)?%"),
+    'number': re.compile(r"(?<=: )-?\d+(?:\.\d+)?(?=[ \t]*$)", re.MULTILINE)
+}
+SLOT_KINDS = ('name',) + tuple(SLOT_PATTERNS)
+_PLACEHOLDER_PREFIX = {'amount': 'AMOUNT', 'percent': 'PERCENT', 'number': 'NUMBER'}
+
+# Any figure in a completion; one the template doesn't contain was made up or leaked
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+# Anything that looks like a placeholder, well-formed or not
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([A-Z_]+\d*)\s*\}\}")
+_BRACES_PATTERN = re.compile(r"\{\{|\}\}")
+
+SLOT_INSTRUCTION = (" Values written as placeholders such as {example} are filled in later: copy each placeholder "
+                    "exactly where you mention its value, and never write the amounts, percentages or numbers yourself.")
+
+
+def cache_enabled() -> bool:
+    """Whether LLM calls go through the prompt cache (FINANCIAL_TWIN_PROMPT_CACHE)"""
+    return os.environ.get('FINANCIAL_TWIN_PROMPT_CACHE') == '1'
+
+
+def _slot_kind(placeholder: str) -> str:
+    if placeholder == narration_pool.PLAYER_NAME_SLOT:
+        return 'name'
+    prefix = placeholder.strip('{}').rstrip('0123456789').rstrip('_')
+    return next((kind for kind, name in _PLACEHOLDER_PREFIX.items() if name == prefix), 'unknown')
+
+
+def canonicalise(text: str, player_name: Optional[str] = None,
+                 values: Optional[Dict[str, str]] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Replace a text's slots with placeholders
+
+    Args:
+        text: Prompt or system message
+        player_name: The player's name, replaced wherever it appears as a word
+        values: Placeholders already assigned (shared between a prompt and its system message)
+
+    Returns:
+        Tuple of (canonical text, real value by placeholder). The same value always gets the same
+        placeholder, numbered in order of first appearance.
+    """
+    values = dict(values or {})
+    by_value = {value: placeholder for placeholder, value in values.items()}
+    if player_name and player_name != 'Player':
+        name_pattern = re.compile(r"(?<!\w)" + re.escape(player_name) + r"(?!\w)")
+        if name_pattern.search(text):
+            values[narration_pool.PLAYER_NAME_SLOT] = player_name
+            text = name_pattern.sub(lambda match: narration_pool.PLAYER_NAME_SLOT, text)
+
+    for kind, pattern in SLOT_PATTERNS.items():
+        def to_placeholder(match: 're.Match[str]') -> str:
+            value = match.group(0)
+            if value not in by_value:
+                count = sum(1 for placeholder in values if _slot_kind(placeholder) == kind)
+                by_value[value] = '{{%s_%d}}' % (_PLACEHOLDER_PREFIX[kind], count + 1)
+                values[by_value[value]] = value
+            return by_value[value]
+        text = pattern.sub(to_placeholder, text)
+    return text, values
+
+
+def substitute(completion: str, values: Dict[str, str]) -> Tuple[str, Dict[str, Dict[str, int]]]:
+    """
+    Fill a cached completion's placeholders with a player's values
+
+    Returns:
+        Tuple of (text, per slot kind counts of substituted and failed placeholders). A placeholder
+        fails if it isn't one of the player's slots; stray braces count as a failure of kind 'unknown'.
+    """
+    results = {kind: {'substituted': 0, 'failed': 0} for kind in SLOT_KINDS + ('unknown',)}
+
+    def fill(match: 're.Match[str]') -> str:
+        placeholder = '{{%s}}' % match.group(1)
+        kind = _slot_kind(placeholder)
+        if placeholder in values:
+            results[kind]['substituted'] += 1
+            return values[placeholder]
+        results[kind]['failed'] += 1
+        return match.group(0)
+
+    text = _PLACEHOLDER_PATTERN.sub(fill, completion)
+    # Braces left outside any placeholder are a mangled one
+    results['unknown']['failed'] += len(_BRACES_PATTERN.findall(_PLACEHOLDER_PATTERN.sub('', text)))
+    return text, results
+
+
+def _problems(completion: str, template: str, values: Dict[str, str]) -> Dict[str, int]:
+    """
+    Why a completion can't be reused for other players: slot literals it wrote out, figures
+    the template doesn't contain, placeholders it broke
+    """
+    problems: Dict[str, int] = {}
+    text = _PLACEHOLDER_PATTERN.sub('', completion)
+    for kind, pattern in SLOT_PATTERNS.items():
+        text, literals = pattern.subn('', text)
+        if literals:
+            problems[kind] = literals
+    known = set(_NUMBER_PATTERN.findall(_PLACEHOLDER_PATTERN.sub('', template)))
+    unknown = sum(1 for number in _NUMBER_PATTERN.findall(text) if number not in known)
+    if unknown:
+        problems['number'] = problems.get('number', 0) + unknown
+    _, results = substitute(completion, values)
+    for kind, counts in results.items():
+        if counts['failed']:
+            problems[kind] = problems.get(kind, 0) + counts['failed']
+    return problems
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key + '.json')
+
+
+def _record(**changes: Any) -> None:
+    """Add to the persistent counters (lookups, hits, stores, per-slot results)"""
+    with background.file_lock(STATS_PATH):
+        stats = background.read_json(STATS_PATH, {})
+        for name, amount in changes.items():
+            if isinstance(amount, dict):
+                slots = stats.setdefault(name, {})
+                for kind, counts in amount.items():
+                    totals = slots.setdefault(kind, {})
+                    for field, value in counts.items():
+                        totals[field] = totals.get(field, 0) + value
+            else:
+                stats[name] = stats.get(name, 0) + amount
+        background.write_json_atomic(STATS_PATH, stats)
+
+
+class CachedClient:
+    """Drop-in wrapper of an ApiClient that serves slot-templated completions from the cache"""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def evaluate_prompt(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        intent: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Same as ApiClient.evaluate_prompt; the player name slot is taken from context['player_name']"""
+        if narration.offline_mode():
+            return self.client.evaluate_prompt(prompt=prompt, system_message=system_message, max_tokens=max_tokens,
+                                               temperature=temperature, intent=intent, context=context)
+
+        player_name = (context or {}).get('player_name')
+        template, values = canonicalise(prompt, player_name)
+        system_template, values = canonicalise(system_message or '', player_name, values)
+        if values:
+            system_template += SLOT_INSTRUCTION.format(example=next(iter(values)))
+        key = hashlib.sha1('\x00'.join((template, system_template, str(max_tokens),
+                                        str(temperature))).encode('utf-8')).hexdigest()
+        path = _entry_path(key)
+
+        with tracing.span('prompt_cache.lookup', slots=len(values)) as lookup_span:
+            entry = background.read_json(path)
+            content = None
+            if entry and time.time() - entry.get('created', 0) < CACHE_TTL_SECONDS:
+                content, results = substitute(entry['completion'], values)
+                if any(counts['failed'] for counts in results.values()):
+                    content = None
+            if lookup_span is not None:
+                lookup_span.set(hit=content is not None)
+        if content is not None:
+            _record(lookups=1, hits=1, slots=results)
+            return Response(content, source='cache')
+
+        # Generate with the placeholders in, so the completion can be reused
+        response = self.client.evaluate_prompt(prompt=template, system_message=system_template, max_tokens=max_tokens,
+                                               temperature=temperature, intent=intent, context=context)
+        if response.source == 'fallback':
+            # Offline narration already used the real values from the context
+            _record(lookups=1, misses=1, unavailable=1)
+            return response
+        problems = _problems(response.content, template + '\n' + system_template, values)
+        content, results = substitute(response.content, values)
+        if problems:
+            _record(lookups=1, misses=1, rejected=1, slots=results,
+                    rejections={kind: {'count': count} for kind, count in problems.items()})
+            # Amounts written without seeing the real ones, or broken placeholders, can't be shown to the
+            # player: ask again with the real values
+            return self.client.evaluate_prompt(prompt=prompt, system_message=system_message, max_tokens=max_tokens,
+                                               temperature=temperature, intent=intent, context=context)
+        background.write_json_atomic(path, {'completion': response.content, 'created': time.time(),
+                                            'slots': sorted(_slot_kind(placeholder) for placeholder in values)})
+        _record(lookups=1, misses=1, stored=1, slots=results)
+        response.content = content
+        return response
+
+
+def wrap(client: Any) -> Any:
+    """The client behind the prompt cache when it's enabled, otherwise the client itself"""
+    return CachedClient(client) if cache_enabled() else client
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Cache effectiveness so far
+
+    Returns:
+        Dictionary with lookups, hits, misses, hit_rate, completions stored and rejected,
+        rejections by slot kind, and substituted/failed placeholders with an accuracy per slot kind
+    """
+    recorded = background.read_json(STATS_PATH, {})
+    lookups = recorded.get('lookups', 0)
+    slots = {}
+    for kind, counts in recorded.get('slots', {}).items():
+        substituted, failed = counts.get('substituted', 0), counts.get('failed', 0)
+        if substituted or failed:
+            slots[kind] = {'substituted': substituted, 'failed': failed,
+                           'accuracy': round(substituted / (substituted + failed), 4)}
+    return {'lookups': lookups, 'hits': recorded.get('hits', 0), 'misses': recorded.get('misses', 0),
+            'hit_rate': round(recorded.get('hits', 0) / lookups, 4) if lookups else 0.0,
+            'stored': recorded.get('stored', 0), 'rejected': recorded.get('rejected', 0),
+            'unavailable': recorded.get('unavailable', 0),
+            'rejections': {kind: counts.get('count', 0) for kind, counts in recorded.get('rejections', {}).items()},
+            'slots': slots}
+
+
+def clear() -> int:
+    """Delete every cached completion and the counters; returns the number of files removed"""
+    removed = 0
+    if not os.path.isdir(CACHE_DIR):
+        return removed
+    for name in os.listdir(CACHE_DIR):
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    import json
+    if len(sys.argv) >= 2 and sys.argv[1] == 'stats':
+        print(json.dumps(stats(), indent=2))
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'clear':
+        print(clear())
+    else:
+        print("Usage: python prompt_cache.py stats | clear")
@@ -0,0 +1,116 @@
+"""
+Non-repeating scenario decks for the Financial Twin game
+Each session deals its career's scenarios from a shuffled deck, so no scenario comes back
+before all the others have been played; an exhausted deck is reshuffled (never putting the
+last scenario on top). Draws can be weighted by the player's state, which changes the order
+within a round but not the no-repeat guarantee. A deck serializes to a few bytes of base64
+stored with the session.
+"""
+import base64
+import binascii
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+# Debt-to-income ratio above which scenarios involving debt are dealt more readily, and how much
+HIGH_DEBT_TO_INCOME = 0.5
+DEBT_SCENARIO_WEIGHT = 3.0
+
+
+class ScenarioDeck:
+    """A shuffled order of scenario indices and how far into it the session is"""
+
+    def __init__(self, order: List[int], position: int = 0):
+        self.order = order
+        self.position = position
+
+    @classmethod
+    def new(cls, size: int, rng: Any = random) -> 'ScenarioDeck':
+        """A freshly shuffled deck of size scenarios"""
+        order = list(range(size))
+        rng.shuffle(order)
+        return cls(order)
+
+    @classmethod
+    def decode(cls, token: Optional[str], size: int, rng: Any = random) -> 'ScenarioDeck':
+        """Deck from its serialized form, or a new one if there is none or it no longer fits the scenarios"""
+        if token:
+            try:
+                raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            except (binascii.Error, ValueError):
+                raw = b''
+            if len(raw) == size + 1 and raw[0] <= size and sorted(raw[1:]) == list(range(size)):
+                return cls(list(raw[1:]), raw[0])
+        return cls.new(size, rng)
+
+    def encode(self) -> str:
+        """Serialized deck: the position followed by the order, one byte each, in unpadded base64"""
+        return base64.urlsafe_b64encode(bytes([self.position] + self.order)).decode('ascii').rstrip('=')
+
+    def remaining(self) -> List[int]:
+        """Scenarios not yet dealt in this round"""
+        return self.order[self.position:]
+
+    def _reshuffle(self, rng: Any) -> None:
+        """Start a new round, without dealing the round's last scenario twice in a row"""
+        last = self.order[-1]
+        rng.shuffle(self.order)
+        if len(self.order) > 1 and self.order[0] == last:
+            swap = rng.randrange(1, len(self.order))
+            self.order[0], self.order[swap] = self.order[swap], self.order[0]
+        self.position = 0
+
+    def _deal(self, offset: int) -> int:
+        """Deal the card offset places from the top of the remaining cards"""
+        chosen = self.position + offset
+        self.order[self.position], self.order[chosen] = self.order[chosen], self.order[self.position]
+        self.position += 1
+        return self.order[self.position - 1]
+
+    def draw(self, rng: Any = random, weights: Optional[Sequence[float]] = None) -> int:
+        """
+        Deal the next scenario
+
+        Args:
+            rng: Source of random draws (the random module or a random.Random)
+            weights: Optional weight per scenario index; picks among the round's remaining scenarios
+
+        Returns:
+            Scenario index
+        """
+        previous = None
+        if self.position >= len(self.order):
+            previous = self.order[-1] if len(self.order) > 1 else None
+            self._reshuffle(rng)
+        if weights is None:
+            return self._deal(0)
+        # The previous round's last scenario can't open the new round
+        remaining = [0.0 if index == previous else weights[index] for index in self.remaining()]
+        target = rng.random() * sum(remaining)
+        for offset, weight in enumerate(remaining):
+            target -= weight
+            if target < 0:
+                return self._deal(offset)
+        return self._deal(max(range(len(remaining)), key=remaining.__getitem__))
+
+    def take(self, index: int, rng: Any = random) -> bool:
+        """Deal a particular scenario (one chosen elsewhere) if that doesn't repeat one; returns whether it was dealt"""
+        if self.position >= len(self.order):
+            if len(self.order) > 1 and self.order[-1] == index:
+                return False
+            self._reshuffle(rng)
+        if index not in self.remaining():
+            return False
+        self._deal(self.order.index(index, self.position) - self.position)
+        return True
+
+
+def state_weights(scenarios: Sequence[Dict[str, Any]], debt_to_income_ratio: float) -> Optional[List[float]]:
+    """
+    Scenario weights for a player's state, or None to deal in shuffled order
+
+    Scenarios with an option that changes debt are favoured while debt is high relative to income.
+    """
+    if not debt_to_income_ratio > HIGH_DEBT_TO_INCOME:
+        return None
+    return [DEBT_SCENARIO_WEIGHT if any(option.get('impact', {}).get('debt', 0) for option in scenario['options']) else 1.0
+            for scenario in scenarios]
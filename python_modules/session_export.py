@@ -0,0 +1,260 @@
+"""
+Columnar export of session histories for the Financial Twin game
+Turn events from the session event log are written out one column per field: Parquet when
+pyarrow is installed, otherwise a directory of .npy files. Text fields (session, career,
+decision, crisis type) are stored as integer codes with their dictionaries in meta.json, and
+amounts as int64 pence.
+The loader memory-maps the columns, so aggregations read only the columns they use and never
+decode JSON row by row.
+"""
+import os
+import sys
+import ast
+import json
+import mmap
+import struct
+from array import array
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import event_log, money
+except ImportError:
+    import event_log
+    import money
+
+# Optional dependencies: NumPy for vectorized loading, pyarrow for Parquet
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Default export location
+EXPORT_DIR = os.environ.get('FINANCIAL_TWIN_EXPORT_DIR', '/tmp/financial_twin_export')
+
+# Columns and their array typecodes; the ones in DICTIONARY_COLUMNS hold codes into meta.json
+COLUMNS = {
+    'session': 'i',
+    'time': 'd',
+    'career': 'b',
+    'scenario_index': 'h',
+    'decision': 'h',
+    'income': 'q',
+    'expenses': 'q',
+    'savings': 'q',
+    'debt': 'q',
+    'monthly_savings': 'q',
+    'debt_to_income_ratio': 'd',
+    'savings_ratio': 'd',
+    'xp_earned': 'i',
+    'level': 'h',
+    'crisis_type': 'b'
+}
+DICTIONARY_COLUMNS = ('session', 'career', 'decision', 'crisis_type')
+
+# Amount columns, held in whole pence
+MONEY_COLUMNS = ('income', 'expenses', 'savings', 'debt', 'monthly_savings')
+
+# Code stored for a missing value (no crisis, unknown scenario)
+MISSING = -1
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+_NPY_DESCR = {'b': 'i1', 'h': 'i2', 'i': 'i4', 'q': 'i8', 'd': 'f8'}
+_ARROW_TYPES = {'b': 'int8', 'h': 'int16', 'i': 'int32', 'q': 'int64', 'd': 'float64'}
+
+
+def _encode(dictionary: Dict[str, int], value: Optional[str]) -> int:
+    """Code of a text value, adding it to the column's dictionary on first sight"""
+    if value is None:
+        return MISSING
+    if value not in dictionary:
+        dictionary[value] = len(dictionary)
+    return dictionary[value]
+
+
+def collect(from_segment: int = 0) -> Dict[str, Any]:
+    """
+    Gather every logged turn into columns
+
+    Args:
+        from_segment: Skip event log segments numbered below this
+
+    Returns:
+        Dictionary with the columns (arrays), the text dictionaries and the number of rows
+    """
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    dictionaries: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+    for event in event_log.replay(kinds=('turn',), from_segment=from_segment, verify=False):
+        data = event['data']
+        after = data.get('after', {})
+        columns['session'].append(_encode(dictionaries['session'], event['session']))
+        columns['time'].append(event['time'])
+        columns['career'].append(_encode(dictionaries['career'], data.get('career')))
+        scenario_index = data.get('scenario_index')
+        columns['scenario_index'].append(MISSING if scenario_index is None else scenario_index)
+        columns['decision'].append(_encode(dictionaries['decision'], data.get('decision')))
+        for field in ('income', 'expenses', 'savings', 'debt'):
+            columns[field].append(money.to_pence(after.get(field) or 0))
+        columns['monthly_savings'].append(money.to_pence(data.get('monthly_savings') or 0))
+        for field in ('debt_to_income_ratio', 'savings_ratio'):
+            value = data.get(field)
+            columns[field].append(float('nan') if value is None else float(value))
+        columns['xp_earned'].append(int(data.get('xp_earned') or 0))
+        columns['level'].append(int(data.get('level') or 0))
+        columns['crisis_type'].append(_encode(dictionaries['crisis_type'], data.get('crisis_type')))
+    return {'columns': columns,
+            'dictionaries': {name: list(values) for name, values in dictionaries.items()},
+            'rows': len(columns['time'])}
+
+
+def _write_npy(path: str, values: array) -> None:
+    """Write a 1-D array in the .npy format (readable by numpy.load without NumPy here)"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    header = "{'descr': '<%s', 'fortran_order': False, 'shape': (%d,), }" % (_NPY_DESCR[values.typecode], len(values))
+    # Pad so the data starts on a 64-byte boundary, as NumPy does
+    unpadded = len(_NPY_MAGIC) + 2 + len(header) + 1
+    header += ' ' * (-unpadded % 64) + '\n'
+    with open(path, 'wb') as f:
+        f.write(_NPY_MAGIC + struct.pack('<H', len(header)) + header.encode('latin1'))
+        values.tofile(f)
+
+
+def export(directory: str = EXPORT_DIR, fmt: Optional[str] = None, from_segment: int = 0) -> Dict[str, Any]:
+    """
+    Export logged turns as columns
+
+    Args:
+        directory: Output directory
+        fmt: 'parquet' or 'npy' (default Parquet when pyarrow is installed)
+        from_segment: Skip event log segments numbered below this
+
+    Returns:
+        Dictionary with the directory, format and number of rows written
+    """
+    fmt = fmt or ('parquet' if pq is not None else 'npy')
+    if fmt == 'parquet' and pq is None:
+        raise ValueError("Parquet export needs pyarrow")
+    if fmt not in ('parquet', 'npy'):
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    collected = collect(from_segment)
+    os.makedirs(directory, exist_ok=True)
+    if fmt == 'parquet':
+        table = pa.table({name: pa.array(values, type=getattr(pa, _ARROW_TYPES[values.typecode])())
+                          for name, values in collected['columns'].items()})
+        pq.write_table(table, os.path.join(directory, 'turns.parquet'), compression='zstd')
+    else:
+        for name, values in collected['columns'].items():
+            _write_npy(os.path.join(directory, name + '.npy'), values)
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump({'format': fmt, 'rows': collected['rows'], 'columns': list(COLUMNS),
+                   'dictionaries': collected['dictionaries'], 'missing': MISSING}, f)
+    return {'directory': directory, 'format': fmt, 'rows': collected['rows']}
+
+
+def _map_npy(path: str) -> Any:
+    """Memory-map an .npy column (a NumPy memmap, or a typed memoryview without NumPy)"""
+    if np is not None:
+        return np.load(path, mmap_mode='r')
+    with open(path, 'rb') as f:
+        view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if view[:len(_NPY_MAGIC)] != _NPY_MAGIC:
+        raise ValueError(f"Not a version 1.0 .npy file: {path}")
+    header_length = struct.unpack_from('<H', view, len(_NPY_MAGIC))[0]
+    data_start = len(_NPY_MAGIC) + 2 + header_length
+    header = ast.literal_eval(view[len(_NPY_MAGIC) + 2:data_start].decode('latin1'))
+    typecode = {descr: code for code, descr in _NPY_DESCR.items()}[header['descr'].lstrip('<|')]
+    return memoryview(view)[data_start:data_start + header['shape'][0] * array(typecode).itemsize].cast(typecode)
+
+
+class Export:
+    """An exported set of turns, loaded column by column on first use"""
+
+    def __init__(self, directory: str = EXPORT_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        self.rows: int = self.meta['rows']
+        self.dictionaries: Dict[str, List[str]] = self.meta['dictionaries']
+        self._table = None
+        self._columns: Dict[str, Any] = {}
+
+    def column(self, name: str) -> Any:
+        """One column: memory-mapped for .npy exports, read from the memory-mapped file for Parquet"""
+        if name not in self._columns:
+            if self.meta['format'] == 'parquet':
+                if self._table is None:
+                    self._table = pq.read_table(os.path.join(self.directory, 'turns.parquet'), memory_map=True)
+                column = self._table.column(name)
+                self._columns[name] = column.to_numpy() if np is not None else column.to_pylist()
+            else:
+                self._columns[name] = _map_npy(os.path.join(self.directory, name + '.npy'))
+        return self._columns[name]
+
+    def code(self, column: str, value: str) -> int:
+        """Code of a text value in a dictionary column (MISSING if it never occurs)"""
+        try:
+            return self.dictionaries[column].index(value)
+        except ValueError:
+            return MISSING
+
+    @staticmethod
+    def _unit(column: str) -> int:
+        """Divisor that turns a column's values into reported units (pounds for amounts)"""
+        return money.PENCE_PER_POUND if column in MONEY_COLUMNS else 1
+
+    def summary(self, career: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregate the turns, optionally of one career only
+
+        Returns:
+            Dictionary with the turn and session counts, the means of the state (in pounds) and
+            ratio columns, and the crisis rate
+        """
+        fields = ('income', 'expenses', 'savings', 'debt', 'monthly_savings', 'savings_ratio', 'xp_earned')
+        careers = self.column('career')
+        crises = self.column('crisis_type')
+        sessions = self.column('session')
+        career_code = self.code('career', career) if career is not None else None
+
+        if np is not None:
+            selected = np.ones(self.rows, dtype=bool) if career_code is None else np.asarray(careers) == career_code
+            turns = int(selected.sum())
+            means = {field: round(float(np.asarray(self.column(field))[selected].mean()) / self._unit(field), 2)
+                     if turns else 0.0 for field in fields}
+            crisis_turns = int((np.asarray(crises)[selected] != MISSING).sum())
+            session_count = int(np.unique(np.asarray(sessions)[selected]).size)
+        else:
+            rows = [row for row in range(self.rows) if career_code is None or careers[row] == career_code]
+            turns = len(rows)
+            means = {}
+            for field in fields:
+                values = self.column(field)
+                means[field] = round(sum(values[row] for row in rows) / turns / self._unit(field), 2) if turns else 0.0
+            crisis_turns = sum(1 for row in rows if crises[row] != MISSING)
+            session_count = len({sessions[row] for row in rows})
+
+        return {'career': career, 'turns': turns, 'sessions': session_count, 'means': means,
+                'crisis_rate': round(crisis_turns / turns, 4) if turns else 0.0}
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'export':
+        arguments = sys.argv[2:] + [None] * 2
+        print(json.dumps(export(arguments[0] or EXPORT_DIR, arguments[1])))
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'summary':
+        arguments = sys.argv[2:] + [None] * 2
+        print(json.dumps(Export(arguments[0] or EXPORT_DIR).summary(arguments[1]), indent=2))
+    else:
+        print("Usage: python session_export.py export [directory] [parquet|npy] | summary [directory] [career]")
@@ -0,0 +1,77 @@
+"""
+Per-session state for the Financial Twin game
+Each game request runs in a fresh process, so what a session accumulates across turns
+(unlocked achievements and the like) is kept in a small JSON document per session on disk.
+"""
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background
+except ImportError:
+    import background
+
+# Session storage and how long idle sessions are kept
+SESSIONS_DIR = os.environ.get('FINANCIAL_TWIN_SESSIONS_DIR', '/tmp/financial_twin_sessions')
+SESSION_TTL_SECONDS = int(os.environ.get('FINANCIAL_TWIN_SESSION_TTL', '86400'))
+
+
+def new_session_id() -> str:
+    """Create an id for a new game session"""
+    return uuid.uuid4().hex
+
+
+def _session_path(session_id: str) -> str:
+    """File holding a session's state"""
+    safe_id = ''.join(c for c in str(session_id) if c.isalnum())
+    return os.path.join(SESSIONS_DIR, safe_id + '.json')
+
+
+def load(session_id: Optional[str]) -> Dict[str, Any]:
+    """Read a session's state (empty if the session is unknown)"""
+    if not session_id:
+        return {}
+    return background.read_json(_session_path(session_id), {})
+
+
+@contextmanager
+def update(session_id: str) -> Iterator[Dict[str, Any]]:
+    """Lock a session, yield its state for changes and write it back"""
+    path = _session_path(session_id)
+    with background.file_lock(path):
+        session = background.read_json(path, {})
+        yield session
+        session['updated'] = time.time()
+        background.write_json_atomic(path, session)
+
+
+def purge_expired() -> int:
+    """Delete sessions idle for longer than the TTL; returns the number removed"""
+    removed = 0
+    if not os.path.isdir(SESSIONS_DIR):
+        return removed
+    cutoff = time.time() - SESSION_TTL_SECONDS
+    for name in os.listdir(SESSIONS_DIR):
+        path = os.path.join(SESSIONS_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'purge':
+        print(purge_expired())
+    else:
+        print("Usage: python sessions.py purge")
@@ -0,0 +1,174 @@
+"""
+Speculative next-turn precomputation for the Financial Twin game
+While the player reads a scenario, the outcome of every presented option is computed in
+a background process and cached, so the option they pick can be served immediately.
+Outcomes are computed and kept per session, from that session's achievement state and
+scenario deck.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+from typing import Any, Dict, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background
+except ImportError:
+    import background
+
+# Cache storage and lifetime of a precomputed outcome
+SPECULATION_DIR = os.environ.get('FINANCIAL_TWIN_SPECULATION_DIR', '/tmp/financial_twin_speculation')
+SPECULATION_TTL_SECONDS = int(os.environ.get('FINANCIAL_TWIN_SPECULATION_TTL', '1800'))
+
+
+def speculation_enabled(speculate: Optional[bool] = None) -> bool:
+    """Whether next turns should be precomputed (per request, else FINANCIAL_TWIN_SPECULATE)"""
+    if speculate is not None:
+        return bool(speculate)
+    return os.environ.get('FINANCIAL_TWIN_SPECULATE') == '1'
+
+
+def _state_key(session_id: Optional[str], career_path: str, income: Any, expenses: Any, savings: Any, debt: Any) -> str:
+    """Canonical key of a session's player state (amounts rounded to pence)"""
+    try:
+        amounts = [round(float(value), 2) for value in (income, expenses, savings, debt)]
+    except (ValueError, TypeError):
+        amounts = [str(value) for value in (income, expenses, savings, debt)]
+    return json.dumps([str(session_id or ''), str(career_path), amounts])
+
+
+def _cache_path(state_key: str, financial_decision: str, next_step: str) -> str:
+    """Cache file for the outcome of one decision taken from one state"""
+    digest = hashlib.sha1(json.dumps([state_key, str(financial_decision), str(next_step)]).encode('utf-8')).hexdigest()
+    return os.path.join(SPECULATION_DIR, digest + '.json')
+
+
+def take(
+    career_path: str,
+    income: Any,
+    expenses: Any,
+    savings: Any,
+    debt: Any,
+    financial_decision: str,
+    next_step: str,
+    session_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Take the precomputed outcome for a decision, if one is ready and fresh
+
+    Each outcome is served at most once, since it contains its own random draws.
+
+    Returns:
+        The response payload as a dictionary (with the achievement state it was computed with),
+        or None on a miss
+    """
+    path = _cache_path(_state_key(session_id, career_path, income, expenses, savings, debt),
+                       financial_decision, next_step)
+    try:
+        os.rename(path, path + '.taken')
+    except OSError:
+        return None
+    entry = background.read_json(path + '.taken')
+    background.release_marker(path + '.taken')
+    if not entry or time.time() - entry.get('created', 0) > SPECULATION_TTL_SECONDS:
+        return None
+    return entry.get('payload')
+
+
+def schedule(career_path: str, payload: Dict[str, Any], session_id: Optional[str] = None) -> None:
+    """
+    Precompute, in the background, the outcome of every option presented in a response
+
+    Args:
+        career_path: Player's career path
+        payload: Response dictionary from process_financial_decisions_function
+        session_id: Game session the response belongs to (its turn must already be recorded)
+    """
+    options = [option.get('value') for option in payload.get('decision_options') or [] if option.get('value')]
+    if not options or payload.get('next_step') != 'continue':
+        return
+    job = {
+        'session_id': session_id,
+        'career_path': career_path,
+        'income': payload.get('income'),
+        'expenses': payload.get('expenses'),
+        'savings': payload.get('savings'),
+        'debt': payload.get('debt'),
+        'options': options
+    }
+    background.spawn(os.path.abspath(__file__), 'precompute', json.dumps(job))
+
+
+def precompute(job: Dict[str, Any]) -> int:
+    """
+    Compute and cache the outcome of each option for a state
+
+    Returns:
+        Number of outcomes cached
+    """
+    try:
+        from python_modules.financial_twin_updated import process_financial_decisions_function
+    except ImportError:
+        from financial_twin_updated import process_financial_decisions_function
+
+    state_key = _state_key(job.get('session_id'), job['career_path'], job['income'], job['expenses'],
+                           job['savings'], job['debt'])
+    marker = os.path.join(SPECULATION_DIR, hashlib.sha1(state_key.encode('utf-8')).hexdigest() + '.running')
+    if not background.claim_marker(marker, SPECULATION_TTL_SECONDS):
+        return 0
+
+    cached = 0
+    try:
+        for option in job['options']:
+            path = _cache_path(state_key, option, 'continue')
+            if os.path.exists(path):
+                continue
+            response = process_financial_decisions_function(
+                career_path=job['career_path'],
+                income=job['income'],
+                expenses=job['expenses'],
+                savings=job['savings'],
+                debt=job['debt'],
+                financial_decision=option,
+                next_step='continue',
+                speculate=False,
+                session_id=job.get('session_id'),
+                record_turn=False
+            )
+            background.write_json_atomic(path, {'created': time.time(), 'payload': response.to_dict()})
+            cached += 1
+    finally:
+        background.release_marker(marker)
+    return cached
+
+
+def purge_expired() -> int:
+    """Delete cached outcomes older than the TTL; returns the number removed"""
+    removed = 0
+    if not os.path.isdir(SPECULATION_DIR):
+        return removed
+    cutoff = time.time() - SPECULATION_TTL_SECONDS
+    for name in os.listdir(SPECULATION_DIR):
+        path = os.path.join(SPECULATION_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Main entry point when called directly (used by background precomputation)
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == 'precompute':
+        precompute(json.loads(sys.argv[2]))
+        purge_expired()
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'purge':
+        print(purge_expired())
+    else:
+        print("Usage: python speculation.py precompute <job_json> | purge")
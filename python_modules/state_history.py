@@ -0,0 +1,199 @@
+"""
+Per-session state history for the Financial Twin game
+Every turn's income, expenses, savings and debt are appended to a session file as four
+little-endian int64 amounts in pence, so a turn costs 32 bytes and the whole history loads
+with one array read. Charts ask for a resolution and get each series downsampled to about
+that many points (Largest-Triangle-Three-Buckets by default, or min/max per bucket), so the
+payload stays the same size however long the session runs.
+"""
+import os
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background, money
+except ImportError:
+    import background
+    import money
+
+# History storage and how long idle histories are kept
+HISTORY_DIR = os.environ.get('FINANCIAL_TWIN_HISTORY_DIR', '/tmp/financial_twin_history')
+HISTORY_TTL_SECONDS = int(os.environ.get('FINANCIAL_TWIN_HISTORY_TTL', '86400'))
+
+# Amounts stored per turn, in record order
+FIELDS = ('income', 'expenses', 'savings', 'debt')
+
+# Series a query can ask for (net worth is derived from savings and debt)
+SERIES = FIELDS + ('net_worth',)
+
+DEFAULT_RESOLUTION = 300
+MAX_RESOLUTION = 5000
+
+
+def _history_path(session_id: str) -> str:
+    """File holding a session's history"""
+    safe_id = ''.join(c for c in str(session_id) if c.isalnum())
+    return os.path.join(HISTORY_DIR, safe_id + '.bin')
+
+
+def append(session_id: str, income: int, expenses: int, savings: int, debt: int) -> None:
+    """Append a turn's state (amounts in pence) to a session's history"""
+    record = array('q', (income, expenses, savings, debt))
+    if sys.byteorder != 'little':
+        record.byteswap()
+    path = _history_path(session_id)
+    with background.file_lock(path):
+        with open(path, 'ab') as f:
+            f.write(record.tobytes())
+
+
+def load(session_id: str) -> Dict[str, array]:
+    """
+    A session's history as columns
+
+    Returns:
+        Dictionary of int64 pence arrays by series name, one entry per turn (empty for an unknown session)
+    """
+    records = array('q')
+    try:
+        with open(_history_path(session_id), 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b''
+    # Ignore a partly written record at the end
+    records.frombytes(data[:len(data) - len(data) % (records.itemsize * len(FIELDS))])
+    if sys.byteorder != 'little':
+        records.byteswap()
+    columns = {field: records[index::len(FIELDS)] for index, field in enumerate(FIELDS)}
+    columns['net_worth'] = array('q', (saving - owed for saving, owed in zip(columns['savings'], columns['debt'])))
+    return columns
+
+
+def lttb(values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: indexes of about threshold points that keep a series' visual shape
+
+    The first and last points are kept. The points between are split into threshold - 2 buckets,
+    and each bucket keeps the point forming the largest triangle with the point kept before it
+    and the average of the next bucket.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    step = (count - 2) / (threshold - 2)
+    kept = [0]
+    for bucket in range(threshold - 2):
+        start = int(bucket * step) + 1
+        end = int((bucket + 1) * step) + 1
+        next_end = min(int((bucket + 2) * step) + 1, count)
+        # The next bucket's centre (the last point stands in for it at the end)
+        if next_end > end:
+            next_x = (end + next_end - 1) / 2
+            next_y = sum(values[end:next_end]) / (next_end - end)
+        else:
+            next_x, next_y = count - 1, values[count - 1]
+        previous = kept[-1]
+        previous_y = values[previous]
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((previous - next_x) * (values[index] - previous_y)
+                       - (previous - index) * (next_y - previous_y))
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+    kept.append(count - 1)
+    return kept
+
+
+def min_max(values: Sequence[float], threshold: int) -> List[int]:
+    """Indexes of the lowest and highest point of each bucket, plus the first and last points (about threshold)"""
+    count = len(values)
+    if threshold >= count:
+        return list(range(count))
+    if threshold < 4:
+        # No room for a bucket's low and high: keep the one point that stands out most, as LTTB does
+        return lttb(values, 3)
+    buckets = (threshold - 2) // 2
+    kept = {0, count - 1}
+    for bucket in range(buckets):
+        start = bucket * count // buckets
+        end = (bucket + 1) * count // buckets
+        if end > start:
+            indexes = range(start, end)
+            kept.add(min(indexes, key=values.__getitem__))
+            kept.add(max(indexes, key=values.__getitem__))
+    return sorted(kept)
+
+
+METHODS: Dict[str, Callable[[Sequence[float], int], List[int]]] = {'lttb': lttb, 'minmax': min_max}
+
+
+def query(
+    session_id: str,
+    resolution: int = DEFAULT_RESOLUTION,
+    method: str = 'lttb',
+    series: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    A session's history downsampled for charting
+
+    Args:
+        session_id: Game session
+        resolution: Points wanted per series (series this short or shorter come back whole)
+        method: 'lttb' or 'minmax'
+        series: Series to return (default all of SERIES)
+
+    Returns:
+        Dictionary with the number of turns, the method and resolution used and, per series,
+        the kept turn numbers and their values in pounds
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    unknown = [name for name in series or () if name not in SERIES]
+    if unknown:
+        raise ValueError(f"Unknown series: {', '.join(unknown)}")
+    resolution = max(3, min(int(resolution), MAX_RESOLUTION))
+
+    columns = load(session_id)
+    turns = len(columns['income'])
+    downsampled = {}
+    for name in series or SERIES:
+        values = columns[name]
+        kept = METHODS[method](values, resolution)
+        downsampled[name] = {'turn': [index + 1 for index in kept],
+                             'value': [money.to_pounds(values[index]) for index in kept]}
+    return {'turns': turns, 'method': method, 'resolution': resolution, 'series': downsampled}
+
+
+def purge_expired() -> int:
+    """Delete histories idle for longer than the TTL; returns the number removed"""
+    removed = 0
+    if not os.path.isdir(HISTORY_DIR):
+        return removed
+    cutoff = time.time() - HISTORY_TTL_SECONDS
+    for name in os.listdir(HISTORY_DIR):
+        path = os.path.join(HISTORY_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    import json
+    if len(sys.argv) >= 2 and sys.argv[1] == 'purge':
+        print(purge_expired())
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'query':
+        arguments = sys.argv[3:] + [None] * 2
+        print(json.dumps(query(sys.argv[2], int(arguments[0] or DEFAULT_RESOLUTION), arguments[1] or 'lttb')))
+    else:
+        print("Usage: python state_history.py query <session_id> [resolution] [lttb|minmax] | purge")
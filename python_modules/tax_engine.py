@@ -0,0 +1,212 @@
+"""
+Take-home pay for the Financial Twin game
+Income tax (England, Wales and Northern Ireland bands), National Insurance (Class 1 for
+employees, Class 4 for the self-employed) and Plan 1/2/5 student loan repayments, from
+gross annual pay. Each tax year's rules are tables of marginal rates above thresholds,
+compiled once into piecewise-linear schedules in pence: a deduction is a bisect and one
+multiply, the net-to-gross inverse is exact, and batches are evaluated with NumPy.
+"""
+import os
+import sys
+import bisect
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import money
+except ImportError:
+    import money
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Marginal rates (percent) above annual thresholds (pounds), per tax year
+TAX_YEARS = {
+    '2024-25': {
+        # Personal allowance £12,570, basic rate to £50,270, higher rate to £125,140, additional above.
+        # Between £100,000 and £125,140 the allowance is withdrawn £1 for every £2, a 60% marginal rate.
+        'income_tax': [(0, 0), (12570, 20), (50270, 40), (100000, 60), (125140, 45)],
+        'national_insurance': {
+            'employed': [(0, 0), (12570, 8), (50270, 2)],
+            'self_employed': [(0, 0), (12570, 6), (50270, 2)]
+        },
+        'student_loan': {'plan_1': (24990, 9), 'plan_2': (27295, 9), 'plan_5': (25000, 9)}
+    },
+    '2025-26': {
+        'income_tax': [(0, 0), (12570, 20), (50270, 40), (100000, 60), (125140, 45)],
+        'national_insurance': {
+            'employed': [(0, 0), (12570, 8), (50270, 2)],
+            'self_employed': [(0, 0), (12570, 6), (50270, 2)]
+        },
+        'student_loan': {'plan_1': (26065, 9), 'plan_2': (28470, 9), 'plan_5': (25000, 9)}
+    }
+}
+DEFAULT_TAX_YEAR = '2025-26'
+
+DEDUCTIONS = ('income_tax', 'national_insurance', 'student_loan')
+
+
+class Schedule:
+    """A piecewise-linear annual amount: a marginal rate (percent) above each threshold, in pence"""
+
+    def __init__(self, bands: Sequence[Tuple[int, int]]):
+        """
+        Args:
+            bands: (threshold in pence, marginal rate in percent) pairs, starting at threshold 0
+        """
+        self.thresholds = [threshold for threshold, _ in bands]
+        self.rates = [rate for _, rate in bands]
+        # Amount due at each threshold, as an exact fraction of a penny (numerator over 100)
+        self._bases = [0]
+        for (low, rate), high in zip(bands, self.thresholds[1:]):
+            self._bases.append(self._bases[-1] + (high - low) * rate)
+
+    @classmethod
+    def from_pounds(cls, bands: Sequence[Tuple[int, int]]) -> 'Schedule':
+        return cls([(money.to_pence(threshold), rate) for threshold, rate in bands])
+
+    def amount(self, gross: int) -> int:
+        """Amount due on gross annual pay in pence (rounded down to the penny)"""
+        band = bisect.bisect_right(self.thresholds, gross) - 1
+        if band < 0:
+            return 0
+        return (self._bases[band] + (gross - self.thresholds[band]) * self.rates[band]) // 100
+
+    def amount_array(self, gross: Any) -> Any:
+        """amount over an int64 array of gross annual pay in pence"""
+        gross = np.asarray(gross, dtype=np.int64)
+        band = np.searchsorted(np.asarray(self.thresholds, dtype=np.int64), gross, side='right') - 1
+        clipped = np.maximum(band, 0)
+        due = (np.asarray(self._bases, dtype=np.int64)[clipped]
+               + (gross - np.asarray(self.thresholds, dtype=np.int64)[clipped]) * np.asarray(self.rates)[clipped]) // 100
+        return np.where(band < 0, 0, due)
+
+    def combined(self, *others: 'Schedule') -> 'Schedule':
+        """One schedule whose marginal rate is the sum of this and others' at every point"""
+        schedules = (self,) + others
+        thresholds = sorted({threshold for schedule in schedules for threshold in schedule.thresholds})
+        return Schedule([(threshold, sum(schedule.rates[bisect.bisect_right(schedule.thresholds, threshold) - 1]
+                                         for schedule in schedules)) for threshold in thresholds])
+
+
+class PayTables:
+    """Compiled deductions for one tax year, student loan plan and kind of employment"""
+
+    def __init__(self, tax_year: str, student_loan_plan: Optional[str], employment: str):
+        if tax_year not in TAX_YEARS:
+            raise ValueError(f"Unknown tax year: {tax_year}")
+        rules = TAX_YEARS[tax_year]
+        if student_loan_plan is not None and student_loan_plan not in rules['student_loan']:
+            raise ValueError(f"Unknown student loan plan: {student_loan_plan}")
+        if employment not in rules['national_insurance']:
+            raise ValueError(f"Unknown employment type: {employment}")
+        loan_bands = [(0, 0)]
+        if student_loan_plan is not None:
+            loan_bands.append(rules['student_loan'][student_loan_plan])
+        self.schedules = {
+            'income_tax': Schedule.from_pounds(rules['income_tax']),
+            'national_insurance': Schedule.from_pounds(rules['national_insurance'][employment]),
+            'student_loan': Schedule.from_pounds(loan_bands)
+        }
+        self.total = self.schedules['income_tax'].combined(self.schedules['national_insurance'],
+                                                           self.schedules['student_loan'])
+        # Net pay at each threshold of the combined schedule, for inverting net to gross
+        self._net_at = [threshold - self._deductions(threshold) for threshold in self.total.thresholds]
+
+    def _deductions(self, gross: int) -> int:
+        return sum(schedule.amount(gross) for schedule in self.schedules.values())
+
+    def breakdown(self, gross: int) -> Dict[str, int]:
+        """Annual gross, each deduction and net pay, in pence"""
+        amounts = {name: schedule.amount(gross) for name, schedule in self.schedules.items()}
+        amounts['gross'] = gross
+        amounts['net'] = gross - sum(amounts[name] for name in DEDUCTIONS)
+        return amounts
+
+    def net(self, gross: int) -> int:
+        """Annual net pay for annual gross pay, in pence"""
+        return gross - self._deductions(gross)
+
+    def gross_for_net(self, net: int) -> int:
+        """Smallest annual gross pay (in pence) with at least the given annual net pay"""
+        band = max(0, bisect.bisect_right(self._net_at, net) - 1)
+        low = self.total.thresholds[band]
+        gross = low + money.mul_div(net - self._net_at[band], 100, 100 - self.total.rates[band])
+        # Per-deduction rounding can leave the estimate a penny or two out
+        while self.net(gross) < net:
+            gross += 1
+        while gross > 0 and self.net(gross - 1) >= net:
+            gross -= 1
+        return gross
+
+    def net_array(self, gross: Any) -> Any:
+        """Annual net pay over an int64 array of annual gross pay, in pence"""
+        gross = np.asarray(gross, dtype=np.int64)
+        return gross - sum(schedule.amount_array(gross) for schedule in self.schedules.values())
+
+
+@lru_cache(maxsize=64)
+def tables(tax_year: str = DEFAULT_TAX_YEAR, student_loan_plan: Optional[str] = None,
+           employment: str = 'employed') -> PayTables:
+    """Compiled tables for a tax year, student loan plan and kind of employment (built once)"""
+    return PayTables(tax_year, student_loan_plan, employment)
+
+
+def net_monthly_income(gross_salary: float, student_loan_plan: Optional[str] = None, employment: str = 'employed',
+                       tax_year: str = DEFAULT_TAX_YEAR) -> float:
+    """Monthly take-home pay in pounds for a gross annual salary in pounds"""
+    annual_net = tables(tax_year, student_loan_plan, employment).net(money.to_pence(gross_salary))
+    return money.to_pounds(money.mul_div(annual_net, 1, 12))
+
+
+def monthly_breakdown(net_monthly: float, student_loan_plan: Optional[str] = None, employment: str = 'employed',
+                      tax_year: str = DEFAULT_TAX_YEAR) -> Dict[str, Any]:
+    """
+    Gross pay and deductions behind a monthly take-home income
+
+    Args:
+        net_monthly: Monthly take-home pay in pounds
+        student_loan_plan: 'plan_1', 'plan_2', 'plan_5' or None
+        employment: 'employed' (Class 1 NI) or 'self_employed' (Class 4 NI)
+        tax_year: Tax year of the rules, e.g. '2025-26'
+
+    Returns:
+        Dictionary with monthly gross, income_tax, national_insurance, student_loan and net in
+        pounds, plus the annual gross salary, the plan, the employment type and the tax year
+    """
+    pay_tables = tables(tax_year, student_loan_plan, employment)
+    annual = pay_tables.breakdown(pay_tables.gross_for_net(money.to_pence(net_monthly) * 12))
+    monthly = {name: money.to_pounds(money.mul_div(annual[name], 1, 12)) for name in ('gross',) + DEDUCTIONS + ('net',)}
+    monthly.update({'gross_salary': money.to_pounds(annual['gross']), 'student_loan_plan': student_loan_plan,
+                    'employment': employment, 'tax_year': tax_year})
+    return monthly
+
+
+def net_annual_array(gross_salaries: Any, student_loan_plan: Optional[str] = None, employment: str = 'employed',
+                     tax_year: str = DEFAULT_TAX_YEAR) -> Any:
+    """Annual take-home pay for an array of gross annual salaries, both int64 pence (needs NumPy)"""
+    return tables(tax_year, student_loan_plan, employment).net_array(gross_salaries)
+
+
+def take_home_table(gross_salaries: Sequence[float], student_loan_plan: Optional[str] = None,
+                    employment: str = 'employed', tax_year: str = DEFAULT_TAX_YEAR) -> List[Dict[str, float]]:
+    """Annual breakdowns in pounds for a list of gross salaries in pounds"""
+    pay_tables = tables(tax_year, student_loan_plan, employment)
+    return [{name: money.to_pounds(amount) for name, amount in pay_tables.breakdown(money.to_pence(salary)).items()}
+            for salary in gross_salaries]
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    import json
+    if len(sys.argv) >= 2:
+        arguments = sys.argv[1:] + [None] * 3
+        print(json.dumps(take_home_table([float(arguments[0])], arguments[1] if arguments[1] != 'none' else None,
+                                         arguments[2] or 'employed', arguments[3] or DEFAULT_TAX_YEAR)[0], indent=2))
+    else:
+        print("Usage: python tax_engine.py <gross_salary> [plan_1|plan_2|plan_5|none] [employed|self_employed] [tax_year]")
@@ -0,0 +1,8 @@
+"""
+Shared pytest setup for the Financial Twin game modules
+"""
+import os
+import sys
+
+# Add the project root to the Python path so tests import the modules as python_modules.<name>
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
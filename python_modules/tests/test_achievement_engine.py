@@ -0,0 +1,53 @@
+"""
+Tests for the achievement rule engine
+"""
+import operator
+
+import pytest
+
+from python_modules import achievement_engine
+
+COMPARE = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq}
+
+# Several rules per operator, including repeated thresholds
+RULES = [
+    {'name': f'{op} {threshold} #{copy}', 'metric': 'ratio', 'op': op, 'threshold': threshold}
+    for op in achievement_engine.OPERATORS
+    for threshold in (-1, 0, 0.3, 0.3, 2, 10)
+    for copy in (1, 2)
+]
+
+
+def test_satisfied_matches_every_rule_checked_directly():
+    engine = achievement_engine.AchievementEngine(RULES)
+    table = engine.tables['ratio']
+    for value in (-5, -1, -0.5, 0, 0.1, 0.3, 0.30000001, 1, 2, 9.99, 10, 11, float('inf')):
+        expected = [index for index, rule in enumerate(engine.rules) if COMPARE[rule.op](value, rule.threshold)]
+        assert sorted(table.satisfied(value)) == expected, value
+
+
+def test_evaluate_reuses_unchanged_metrics():
+    engine = achievement_engine.AchievementEngine([
+        {'name': 'Saver', 'metric': 'savings', 'op': '>', 'threshold': 1000},
+        {'name': 'Debt Free', 'metric': 'debt', 'op': '<=', 'threshold': 0}
+    ])
+    names, state = engine.evaluate({'savings': 1500, 'debt': 200})
+    assert names == ['Saver']
+    # A stale result for an unchanged metric is kept, a changed metric is re-checked
+    state['satisfied']['savings'] = []
+    names, _ = engine.evaluate({'savings': 1500, 'debt': 0}, state)
+    assert names == ['Debt Free']
+
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(ValueError):
+        achievement_engine.AchievementRule('Odd', 'ratio', '!=', 1)
+
+
+def test_catalog_round_trips_bitsets():
+    catalog = achievement_engine.AchievementCatalog({'Saver': 0, 'Debt Free': 3, 'Investor': 1})
+    mask = catalog.encode(['Debt Free', 'Saver', 'Unknown'])
+    assert mask == 0b1001
+    assert catalog.decode(mask) == ['Saver', 'Debt Free']
+    with pytest.raises(ValueError):
+        achievement_engine.AchievementCatalog({'Saver': 0, 'Investor': 0})
@@ -0,0 +1,79 @@
+"""
+Tests for the crisis alias tables
+"""
+import random
+
+import pytest
+
+from python_modules import crisis_engine, financial_twin_updated as game
+
+
+def implied_probabilities(sampler):
+    """Chance of each index under an alias table: its own column share plus what other columns alias to it"""
+    implied = [0.0] * sampler.size
+    for column in range(sampler.size):
+        implied[column] += sampler.probability[column] / sampler.size
+        implied[sampler.alias[column]] += (1.0 - sampler.probability[column]) / sampler.size
+    return implied
+
+
+@pytest.mark.parametrize('weights', [[1], [1, 1], [0, 3, 1], [0.1, 5, 0, 2.5, 0.01], [7] * 9, list(range(1, 40))])
+def test_alias_table_reproduces_weights(weights):
+    sampler = crisis_engine.AliasSampler(weights)
+    total = sum(weights)
+    assert implied_probabilities(sampler) == pytest.approx([weight / total for weight in weights], abs=1e-12)
+
+
+@pytest.mark.parametrize('weights', [[], [0, 0]])
+def test_alias_table_needs_positive_weight(weights):
+    with pytest.raises(ValueError):
+        crisis_engine.AliasSampler(weights)
+
+
+def test_pick_never_returns_zero_weight_index():
+    sampler = crisis_engine.AliasSampler([0, 3, 0, 1])
+    rng = random.Random(7)
+    picks = {sampler.pick(rng.random()) for _ in range(2000)}
+    assert picks == {1, 3}
+    assert sampler.pick(0.0) in (1, 3) and sampler.pick(1 - 1e-12) in (1, 3)
+
+
+@pytest.mark.parametrize('career', list(game.CAREER_DATA) + [None])
+@pytest.mark.parametrize('band', crisis_engine.BUFFER_BANDS)
+def test_game_tables_match_declared_probabilities(career, band):
+    engine = game.CRISIS_ENGINE
+    probabilities = engine.probabilities(career, band)
+    assert sum(probabilities) == pytest.approx(1.0)
+    assert probabilities[0] == pytest.approx(1.0 - game.CRISIS_PROBABILITY_BY_BUFFER[band])
+    assert implied_probabilities(engine._sampler(career, band)) == pytest.approx(probabilities, abs=1e-12)
+
+
+def test_career_and_band_weights_shift_events():
+    engine = game.CRISIS_ENGINE
+    arrears = engine.names.index('Council Tax Arrears') + 1
+    assert engine.probabilities('Student', 'thin')[arrears] < engine.probabilities('Banker', 'thin')[arrears]
+    assert engine.probabilities('Banker', 'no_buffer')[arrears] > engine.probabilities('Banker', 'cushioned')[arrears]
+
+
+def test_band_boundaries():
+    engine = game.CRISIS_ENGINE
+    assert engine.band(0, 1000) == 'no_buffer'
+    assert engine.band(2999.99, 1000) == 'thin'
+    assert engine.band(3000, 1000) == 'cushioned'
+
+
+def test_apply_uses_exact_pence():
+    engine = game.CRISIS_ENGINE
+    assert engine.apply(None, 200000, 50000) == (200000, 50000, None)
+    income, savings, message = engine.apply('Zero Hours Contract', 200000, 50000)
+    assert (income, savings) == (150000, 50000)
+    assert message == game.CRISIS_EVENTS['Zero Hours Contract']['message']
+    assert engine.apply('Boiler Breakdown', 200000, 50000)[:2] == (200000, 50000 - 85000)
+
+
+def test_batch_draws_follow_the_tables():
+    np = pytest.importorskip('numpy')
+    engine = game.CRISIS_ENGINE
+    codes = engine.draw_many('Student', np.zeros(200000), 1000.0, np.random.default_rng(3))
+    frequencies = np.bincount(codes + 1, minlength=len(engine.names) + 1) / codes.size
+    assert frequencies.tolist() == pytest.approx(engine.probabilities('Student', 'no_buffer'), abs=0.005)
@@ -0,0 +1,97 @@
+"""
+Tests for the closed-form fast-forward, checked against a month-by-month simulation
+"""
+import math
+
+import pytest
+
+from python_modules import fast_forward
+
+MONTHS = 80
+
+
+def simulate(income, expenses, savings, debt, savings_rate, debt_rate, payment, months):
+    """Balances at the end of each month, stepped one month at a time"""
+    cash_flow = income - expenses
+    balances = []
+    for _ in range(months):
+        paid = 0.0
+        if debt > 0:
+            due = debt * (1 + debt_rate)
+            paid = min(payment, due)
+            debt = due - paid
+            if debt < 1e-9:
+                debt = 0.0
+        savings = savings * (1 + savings_rate if savings > 0 else 1) + cash_flow - paid
+        balances.append((savings, debt))
+    return balances
+
+
+CASES = [
+    # Repaying a debt while saving
+    (2000, 1500, 1000, 5000, 0.04 / 12, 0.06 / 12, 250),
+    # Negative savings climbing to zero, then earning interest
+    (2000, 1500, -3000, 0, 0.04 / 12, 0.06 / 12, 0),
+    # Positive savings run down past zero by a negative cash flow
+    (1500, 1700, 4000, 0, 0.04 / 12, 0.06 / 12, 0),
+    # Debt payments larger than the cash flow push savings negative, then they recover
+    (2000, 1900, -500, 3000, 0.04 / 12, 0.05 / 12, 300),
+    # No interest at all
+    (2000, 1000, 0, 10000, 0, 0, 400),
+    # Payment that never covers the interest
+    (1000, 900, 100, 5000, 0.003, 0.01, 40)
+]
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_plan_matches_month_by_month_simulation(case):
+    plan = fast_forward.Plan(*case)
+    for month, (savings, debt) in enumerate(simulate(*case, MONTHS), start=1):
+        point = plan.at(month)
+        assert point['savings'] == pytest.approx(savings, abs=1e-6)
+        assert point['debt'] == pytest.approx(debt, abs=1e-6)
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_debt_free_month_is_first_month_without_debt(case):
+    plan = fast_forward.Plan(*case)
+    debt_free = [month for month, (_, debt) in enumerate(simulate(*case, MONTHS), start=1) if debt == 0]
+    if case[3] <= 0:
+        assert plan.debt_free_month == 0
+    elif debt_free:
+        assert plan.debt_free_month == debt_free[0]
+    else:
+        assert plan.debt_free_month is None
+
+
+def test_payoff_months_never_when_payment_only_covers_interest():
+    assert math.isinf(fast_forward.payoff_months(1200, 0.01, 12))
+    assert fast_forward.payoff_months(1200, 0, 100) == 12
+
+
+def test_savings_switch_month():
+    # -£1,000 rising by £300 a month is back above zero after 4 months
+    assert fast_forward.savings_switch_month(-1000, 0.01, 300) == 4
+    # Interest outpaces the withdrawals, so the balance never reaches zero
+    assert math.isinf(fast_forward.savings_switch_month(10000, 0.01, -50))
+
+
+def test_fast_forward_accounts_for_every_pound():
+    result = fast_forward.fast_forward(2000, 1500, 1000, 5000, 36, 'Banker')
+    cash_in = (2000 - 1500) * 36
+    assert result['debt'] == 0
+    assert result['savings'] == pytest.approx(1000 + cash_in - 5000 - result['debt_interest_paid']
+                                              + result['savings_interest_earned'], abs=0.02)
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_schedule_matches_plan(case):
+    income, expenses, savings, debt, savings_rate, debt_rate, payment = case
+    result = fast_forward.fast_forward(income, expenses, savings, debt, 24, savings_apr=savings_rate * 12,
+                                       debt_apr=debt_rate * 12, debt_payment=payment, include_schedule=True)
+    plan = fast_forward.Plan(*case)
+    schedule = result['schedule']
+    assert schedule['month'] == list(range(1, 25))
+    for month, savings_point, debt_point in zip(schedule['month'], schedule['savings'], schedule['debt']):
+        assert savings_point == pytest.approx(round(plan.at(month)['savings'], 2), abs=0.011)
+        assert debt_point == pytest.approx(round(plan.at(month)['debt'], 2), abs=0.011)
@@ -0,0 +1,66 @@
+"""
+Tests for the closed-form goal solver, checked against a search over the fast-forward plan
+"""
+from datetime import date
+
+import pytest
+
+from python_modules import fast_forward, goals
+
+HORIZON = 600
+
+
+def first_month_reaching(plan, target):
+    """First month whose end-of-month savings reach the target, searching month by month"""
+    return next((month for month in range(HORIZON + 1) if plan.at(month)['savings'] >= target), None)
+
+
+PLANS = [
+    # income, expenses, savings, debt, monthly savings rate, monthly debt rate, debt payment
+    (2000, 1500, 1000, 0, 0.04 / 12, 0.06 / 12, 0),
+    (2000, 1500, 1000, 5000, 0.04 / 12, 0.06 / 12, 250),
+    (2000, 1500, -3000, 0, 0.04 / 12, 0.06 / 12, 0),
+    (2000, 1900, -500, 3000, 0.04 / 12, 0.05 / 12, 300),
+    (2000, 1000, 0, 10000, 0, 0, 400),
+    (1500, 1700, 4000, 0, 0.04 / 12, 0.06 / 12, 0)
+]
+
+
+@pytest.mark.parametrize('case', PLANS)
+@pytest.mark.parametrize('target', [0, 750.25, 4500, 12345.67, 60000])
+def test_months_to_savings_matches_search(case, target):
+    plan = fast_forward.Plan(*case)
+    assert goals.months_to_savings(plan, target) == first_month_reaching(plan, target)
+
+
+@pytest.mark.parametrize('savings, contribution, target', [
+    (100, 250, 1000), (0, 1, 5000), (-2500, 400, 1200), (9999.99, 0.01, 10000)
+])
+def test_months_to_reach_is_exact_at_the_boundary(savings, contribution, target):
+    months = goals._months_to_reach(savings, 0.003, contribution, target)
+    assert fast_forward.savings_after(savings, 0.003, contribution, months) >= target
+    assert months == 0 or fast_forward.savings_after(savings, 0.003, contribution, months - 1) < target
+
+
+def test_required_contribution_reaches_target_on_deadline():
+    required = goals.required_contribution(2000, 10000, 24, 0.004)
+    assert fast_forward.savings_after(2000, 0.004, required, 24) == pytest.approx(10000)
+
+
+def test_required_debt_payment_clears_debt_on_deadline():
+    payment = goals.required_debt_payment(8000, 36, 0.005)
+    assert fast_forward.debt_after(8000, 0.005, payment, 36) == pytest.approx(0, abs=1e-6)
+
+
+def test_target_month_rolls_over_the_year():
+    assert goals.target_month(3, date(2026, 11, 5)) == '2027-02'
+    assert goals.target_month(None) is None
+
+
+def test_solve_unreachable_and_unknown_goals():
+    never = goals.solve({'kind': goals.SAVINGS_TARGET, 'target': 5000, 'income': 1000, 'expenses': 1200},
+                        date(2026, 1, 1))
+    assert never == {'kind': goals.SAVINGS_TARGET, 'reachable': False, 'months': None, 'target_month': None,
+                     'target': 5000.0}
+    with pytest.raises(ValueError):
+        goals.solve({'kind': 'retire_early'})
@@ -0,0 +1,69 @@
+"""
+Tests for prompt canonicalisation and placeholder substitution in the prompt cache
+"""
+import pytest
+
+from python_modules import narration_pool, prompt_cache
+
+NAME = narration_pool.PLAYER_NAME_SLOT
+
+PROMPT = ("Alice has £1,200.50 in savings and owes £300. Her rate is 4.5%, Alice!\n"
+          "Level: 3\n"
+          "XP: 120\n"
+          "Alicea saved £300 too.")
+
+
+def test_canonicalise_numbers_slots_in_order_of_appearance():
+    text, values = prompt_cache.canonicalise(PROMPT, 'Alice')
+    assert text == (NAME + " has {{AMOUNT_1}} in savings and owes {{AMOUNT_2}}. Her rate is {{PERCENT_1}}, "
+                    + NAME + "!\nLevel: {{NUMBER_1}}\nXP: {{NUMBER_2}}\nAlicea saved {{AMOUNT_2}} too.")
+    assert values == {NAME: 'Alice', '{{AMOUNT_1}}': '£1,200.50', '{{AMOUNT_2}}': '£300',
+                      '{{PERCENT_1}}': '4.5%', '{{NUMBER_1}}': '3', '{{NUMBER_2}}': '120'}
+
+
+def test_canonicalise_shares_placeholders_with_earlier_text():
+    _, values = prompt_cache.canonicalise(PROMPT, 'Alice')
+    text, shared = prompt_cache.canonicalise("Owes £300 at 4.5%, now £50", None, values)
+    assert text == "Owes {{AMOUNT_2}} at {{PERCENT_1}}, now {{AMOUNT_3}}"
+    assert shared == dict(values, **{'{{AMOUNT_3}}': '£50'})
+
+
+def test_default_player_name_is_not_a_slot():
+    text, values = prompt_cache.canonicalise("Player, welcome", 'Player')
+    assert text == "Player, welcome"
+    assert values == {}
+
+
+def test_same_template_for_different_players():
+    first, _ = prompt_cache.canonicalise("Bob has £10 and 2%", 'Bob')
+    second, _ = prompt_cache.canonicalise("Zoë has £99,000.01 and 12.25%", 'Zoë')
+    assert first == second
+
+
+def test_substitute_restores_the_original_text():
+    text, values = prompt_cache.canonicalise(PROMPT, 'Alice')
+    restored, results = prompt_cache.substitute(text, values)
+    assert restored == PROMPT
+    assert results['name'] == {'substituted': 2, 'failed': 0}
+    assert results['amount'] == {'substituted': 3, 'failed': 0}
+    assert all(counts['failed'] == 0 for counts in results.values())
+
+
+@pytest.mark.parametrize('completion, kind', [
+    ("Only {{AMOUNT_9}} left", 'amount'),
+    ("Hello {{ PERCENT_4 }}", 'percent'),
+    ("Broken {{AMOUNT_1} brace", 'unknown'),
+    ("Stray }} brace", 'unknown')
+])
+def test_substitute_counts_failures(completion, kind):
+    _, values = prompt_cache.canonicalise("£5 and 5%", None)
+    text, results = prompt_cache.substitute(completion, values)
+    assert results[kind]['failed'] == 1
+    assert sum(counts['substituted'] for counts in results.values()) == 0
+
+
+def test_problems_flag_literals_and_invented_figures():
+    template, values = prompt_cache.canonicalise("You have £500 after 3 months", None)
+    assert prompt_cache._problems("Nice work with {{AMOUNT_1}} in 3 months", template, values) == {}
+    assert prompt_cache._problems("Nice work with £500", template, values) == {'amount': 1}
+    assert prompt_cache._problems("Keep {{AMOUNT_1}} for 12 months", template, values) == {'number': 1}
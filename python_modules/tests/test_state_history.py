@@ -0,0 +1,81 @@
+"""
+Tests for the state history store and its downsampling
+"""
+import math
+
+import pytest
+
+from python_modules import state_history
+
+
+def series(count):
+    """A wavy series with one sharp spike and one sharp dip"""
+    values = [round(1000 * math.sin(index / 7.0)) + index for index in range(count)]
+    values[count // 3] = 50000
+    values[2 * count // 3] = -50000
+    return values
+
+
+@pytest.mark.parametrize('count', [3, 10, 101, 997, 5000])
+@pytest.mark.parametrize('threshold', [3, 4, 7, 50, 300])
+def test_lttb_keeps_threshold_points_one_per_bucket(count, threshold):
+    kept = state_history.lttb(series(count), threshold)
+    if threshold >= count:
+        assert kept == list(range(count))
+        return
+    assert len(kept) == threshold
+    assert kept[0] == 0 and kept[-1] == count - 1
+    step = (count - 2) / (threshold - 2)
+    for bucket, index in enumerate(kept[1:-1]):
+        assert int(bucket * step) + 1 <= index < int((bucket + 1) * step) + 1
+
+
+def test_lttb_keeps_spikes():
+    values = series(2000)
+    kept = state_history.lttb(values, 100)
+    assert values.index(50000) in kept
+    assert values.index(-50000) in kept
+
+
+def test_lttb_picks_largest_triangle():
+    # The middle bucket's point furthest from the line between its neighbours wins
+    assert state_history.lttb([0, 1, 9, 2, 0], 3) == [0, 2, 4]
+
+
+@pytest.mark.parametrize('count', [5, 101, 5000])
+@pytest.mark.parametrize('threshold', [3, 6, 50, 300])
+def test_min_max_keeps_extremes_within_threshold(count, threshold):
+    values = series(count)
+    kept = state_history.min_max(values, threshold)
+    if threshold >= count:
+        assert kept == list(range(count))
+        return
+    assert len(kept) <= threshold
+    assert kept == sorted(set(kept))
+    assert kept[0] == 0 and kept[-1] == count - 1
+    if threshold >= 4:
+        assert values.index(max(values)) in kept
+        assert values.index(min(values)) in kept
+
+
+def test_query_downsamples_stored_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_history, 'HISTORY_DIR', str(tmp_path))
+    for turn in range(50):
+        state_history.append('session-1', 200000, 150000, 10000 * turn, 500000 - 10000 * turn)
+    result = state_history.query('session 1', resolution=10, series=['savings', 'net_worth'])
+    assert result['turns'] == 50
+    assert result['resolution'] == 10
+    assert list(result['series']) == ['savings', 'net_worth']
+    savings = result['series']['savings']
+    assert len(savings['turn']) == 10
+    assert savings['turn'][0] == 1 and savings['turn'][-1] == 50
+    assert savings['value'][-1] == 4900.00
+    assert result['series']['net_worth']['value'][0] == -5000.00
+
+
+def test_query_rejects_unknown_method_and_series(tmp_path, monkeypatch):
+    monkeypatch.setattr(state_history, 'HISTORY_DIR', str(tmp_path))
+    with pytest.raises(ValueError):
+        state_history.query('session1', method='average')
+    with pytest.raises(ValueError):
+        state_history.query('session1', series=['wealth'])
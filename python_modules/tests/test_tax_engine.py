@@ -0,0 +1,73 @@
+"""
+Tests for the take-home pay engine
+"""
+import pytest
+
+from python_modules import money, tax_engine
+
+
+def test_net_below_personal_allowance_is_gross():
+    assert tax_engine.tables().net(money.to_pence(12000)) == money.to_pence(12000)
+
+
+@pytest.mark.parametrize('gross, income_tax, national_insurance', [
+    # Basic rate: 20% and 8% above £12,570
+    (30000, 3486.00, 1394.40),
+    # Higher rate: 40% and 2% above £50,270
+    (60000, 11432.00, 3210.60),
+    # Allowance fully withdrawn at £125,140: 20% of £37,700 plus 40% of the rest
+    (125140, 42516.00, 4513.40)
+])
+def test_breakdown_matches_hand_calculation(gross, income_tax, national_insurance):
+    breakdown = tax_engine.take_home_table([gross])[0]
+    assert breakdown['income_tax'] == income_tax
+    assert breakdown['national_insurance'] == national_insurance
+    assert breakdown['student_loan'] == 0
+    assert breakdown['net'] == round(gross - income_tax - national_insurance, 2)
+
+
+def test_student_loan_is_nine_percent_above_threshold():
+    breakdown = tax_engine.take_home_table([40000], 'plan_2')[0]
+    assert breakdown['student_loan'] == 1037.70
+
+
+def test_self_employed_pay_class_4_rates():
+    breakdown = tax_engine.take_home_table([30000], employment='self_employed')[0]
+    assert breakdown['national_insurance'] == 1045.80
+
+
+def test_net_monthly_income():
+    assert tax_engine.net_monthly_income(30000) == 2093.30
+
+
+@pytest.mark.parametrize('plan', [None, 'plan_1', 'plan_2', 'plan_5'])
+def test_gross_for_net_is_smallest_gross_reaching_net(plan):
+    pay_tables = tax_engine.tables(student_loan_plan=plan)
+    for net in (0, 100, money.to_pence(11000), money.to_pence(25119.60), money.to_pence(45000),
+                money.to_pence(80000), money.to_pence(150000)):
+        gross = pay_tables.gross_for_net(net)
+        assert pay_tables.net(gross) >= net
+        assert gross == 0 or pay_tables.net(gross - 1) < net
+
+
+def test_monthly_breakdown_inverts_net_monthly_income():
+    breakdown = tax_engine.monthly_breakdown(2093.30)
+    # Deductions are rounded down to the penny, so a couple of pence under £30,000 already nets the same
+    assert 29999.95 <= breakdown['gross_salary'] <= 30000.00
+    assert breakdown['net'] == 2093.30
+
+
+def test_unknown_rules_are_rejected():
+    with pytest.raises(ValueError):
+        tax_engine.PayTables('1999-00', None, 'employed')
+    with pytest.raises(ValueError):
+        tax_engine.PayTables(tax_engine.DEFAULT_TAX_YEAR, 'plan_9', 'employed')
+    with pytest.raises(ValueError):
+        tax_engine.PayTables(tax_engine.DEFAULT_TAX_YEAR, None, 'retired')
+
+
+def test_net_array_matches_scalar():
+    np = pytest.importorskip('numpy')
+    pay_tables = tax_engine.tables(student_loan_plan='plan_1')
+    gross = np.arange(0, money.to_pence(200000), 123457, dtype=np.int64)
+    assert tax_engine.net_annual_array(gross, 'plan_1').tolist() == [pay_tables.net(int(value)) for value in gross]
@@ -0,0 +1,275 @@
+"""
+Personalised financial tips for the Financial Twin game
+A curated corpus of UK money tips, each tagged with the careers, achievements and financial
+states it suits. The tags are indexed at import into an inverted index whose postings carry
+their precomputed BM25 weights, so picking a player's tips is a few dictionary lookups and
+additions instead of an LLM round-trip.
+"""
+import os
+import sys
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import scenario_deck
+except ImportError:
+    import scenario_deck
+
+# BM25 parameters: term frequency saturation and document length normalisation
+K1 = 1.2
+B = 0.75
+
+# Tips returned for a conclusion
+DEFAULT_TIP_COUNT = 3
+
+# Tags are 'career:<career>', 'achievement:<achievement>', 'debt:none|manageable|high',
+# 'cash_flow:positive|negative' and 'topic:<topic>', each with a weight: how strongly the tip is
+# about it, used as the tag's term frequency in BM25.
+TIPS: List[Dict[str, Any]] = [
+    {'id': 'emergency-fund', 'topic': 'emergency_fund',
+     'text': "Build an emergency fund of three to six months of essential costs in an easy-access savings "
+             "account before you invest, so a surprise bill never lands on a credit card.",
+     'tags': {'cash_flow:negative': 1, 'cash_flow:positive': 1, 'debt:manageable': 1, 'career:student': 1,
+              'career:banker': 1}},
+    {'id': 'emergency-fund-irregular', 'topic': 'emergency_fund',
+     'text': "With irregular income, aim for a bigger buffer - six to twelve months of costs - held in an "
+             "easy-access account and topped up in the good months.",
+     'tags': {'career:artist': 2, 'career:entrepreneur': 1, 'cash_flow:negative': 1}},
+    {'id': 'cash-isa', 'topic': 'isa',
+     'text': "Use your £20,000 annual ISA allowance: interest in a Cash ISA is tax-free and doesn't eat into "
+             "your Personal Savings Allowance (£1,000 for basic-rate taxpayers, £500 for higher-rate).",
+     'tags': {'achievement:strategic_saver': 2, 'cash_flow:positive': 1, 'career:banker': 1}},
+    {'id': 'stocks-and-shares-isa', 'topic': 'isa',
+     'text': "Once your emergency fund is in place, money you won't need for five years or more can go into a "
+             "Stocks and Shares ISA - low-cost global index funds keep fees down and growth is tax-free.",
+     'tags': {'achievement:wealth_builder': 2, 'achievement:debt_free_champion': 1, 'achievement:strategic_saver': 1,
+              'debt:none': 1}},
+    {'id': 'lifetime-isa', 'topic': 'home_buying',
+     'text': "If you're 18 to 39, a Lifetime ISA adds a 25% government bonus on up to £4,000 a year towards "
+             "a first home (up to £450,000) or retirement - but other withdrawals cost a 25% charge.",
+     'tags': {'career:student': 2, 'achievement:strategic_saver': 1, 'career:artist': 1, 'debt:none': 1}},
+    {'id': 'help-to-buy-isa', 'topic': 'home_buying',
+     'text': "Help to Buy ISAs closed to new savers in 2019, but if you have one you can keep paying in until "
+             "November 2029 and must claim the 25% bonus by December 2030 - don't leave it unclaimed.",
+     'tags': {'achievement:strategic_saver': 1, 'career:banker': 1, 'debt:none': 1}},
+    {'id': 'premium-bonds', 'topic': 'nsi',
+     'text': "NS&I Premium Bonds are 100% backed by HM Treasury and prizes are tax-free - a useful home for "
+             "savings above the FSCS limit, though the average return can trail the best savings accounts.",
+     'tags': {'achievement:wealth_builder': 2, 'career:banker': 1}},
+    {'id': 'fscs-limit', 'topic': 'nsi',
+     'text': "FSCS protection covers up to £120,000 per person per banking licence, so spread larger savings "
+             "across banks that don't share a licence.",
+     'tags': {'achievement:wealth_builder': 1, 'career:banker': 1, 'career:entrepreneur': 1}},
+    {'id': 'workplace-pension', 'topic': 'pension',
+     'text': "Never opt out of your workplace pension: your employer adds at least 3% of qualifying earnings "
+             "and tax relief tops up your own contributions - it's part of your pay.",
+     'tags': {'career:banker': 1, 'cash_flow:positive': 1, 'achievement:positive_cash_flow_master': 1}},
+    {'id': 'salary-sacrifice-taper', 'topic': 'pension',
+     'text': "Between £100,000 and £125,140 your Personal Allowance is withdrawn, an effective 60% tax rate - "
+             "pension contributions through salary sacrifice can bring your income back below £100,000.",
+     'tags': {'career:banker': 3, 'achievement:wealth_builder': 1}},
+    {'id': 'self-employed-pension', 'topic': 'pension',
+     'text': "Self-employed? There's no employer pension, so open a SIPP: 20% tax relief is added to what you "
+             "pay in, and higher-rate relief is claimed through your Self Assessment.",
+     'tags': {'career:entrepreneur': 2, 'career:artist': 2, 'cash_flow:positive': 1}},
+    {'id': 'self-assessment', 'topic': 'tax',
+     'text': "Set aside a share of every payment for Self Assessment: the bill is due by 31 January, and "
+             "payments on account for the next year fall on 31 January and 31 July.",
+     'tags': {'career:entrepreneur': 2, 'career:artist': 2}},
+    {'id': 'vat-threshold', 'topic': 'tax',
+     'text': "Keep an eye on your rolling 12-month turnover: you must register for VAT once it passes £90,000.",
+     'tags': {'career:entrepreneur': 2, 'achievement:wealth_builder': 1}},
+    {'id': 'allowable-expenses', 'topic': 'tax',
+     'text': "Keep receipts for materials, studio or workspace costs and equipment - allowable expenses reduce "
+             "the profit you pay Income Tax and Class 4 National Insurance on.",
+     'tags': {'career:artist': 2, 'career:entrepreneur': 1, 'cash_flow:negative': 1}},
+    {'id': 'trading-allowance', 'topic': 'tax',
+     'text': "The first £1,000 a year of side-hustle income is tax-free under the trading allowance - handy "
+             "for selling work or freelancing alongside study.",
+     'tags': {'career:student': 1, 'career:artist': 1, 'cash_flow:negative': 1}},
+    {'id': 'voluntary-ni', 'topic': 'state_pension',
+     'text': "If your profits are below the small profits threshold, consider voluntary Class 2 National "
+             "Insurance - it's a cheap way to keep building your State Pension. Check your forecast on GOV.UK.",
+     'tags': {'career:artist': 2, 'career:entrepreneur': 1, 'cash_flow:negative': 1}},
+    {'id': 'student-loan-threshold', 'topic': 'student_loan',
+     'text': "Student loan repayments are 9% of what you earn above the threshold (£28,470 for Plan 2, "
+             "£25,000 for Plan 5) and are written off after 30 or 40 years, so overpaying rarely makes sense.",
+     'tags': {'career:student': 3, 'debt:high': 1, 'debt:manageable': 1}},
+    {'id': 'student-overdraft', 'topic': 'overdraft',
+     'text': "Use an interest-free student overdraft as a safety net, not spending money, and have a plan to "
+             "clear it before the interest-free period ends after graduation.",
+     'tags': {'career:student': 2, 'debt:manageable': 1, 'debt:high': 1, 'cash_flow:negative': 1}},
+    {'id': 'maintenance-budget', 'topic': 'budgeting',
+     'text': "Divide each maintenance loan instalment by the weeks until the next one and give yourself a "
+             "weekly allowance - it stops the end-of-term squeeze.",
+     'tags': {'career:student': 2, 'cash_flow:negative': 2}},
+    {'id': 'pay-yourself-salary', 'topic': 'budgeting',
+     'text': "Smooth out irregular income by paying everything into a business account and paying yourself "
+             "a fixed monthly 'salary' from it.",
+     'tags': {'career:artist': 2, 'career:entrepreneur': 1, 'cash_flow:negative': 1,
+              'achievement:positive_cash_flow_master': 1}},
+    {'id': 'fifty-thirty-twenty', 'topic': 'budgeting',
+     'text': "Try a 50/30/20 budget: about half your take-home pay on needs, 30% on wants and 20% on saving or "
+             "paying down debt.",
+     'tags': {'cash_flow:negative': 2, 'achievement:positive_cash_flow_master': 1, 'debt:manageable': 1}},
+    {'id': 'highest-interest-first', 'topic': 'debt',
+     'text': "Clear your most expensive debt first - store cards, credit cards and overdrafts - while paying "
+             "the minimum on the rest; a 0% balance transfer card can buy you time if you stick to a plan.",
+     'tags': {'debt:high': 2, 'debt:manageable': 1, 'achievement:debt_management_expert': 1}},
+    {'id': 'free-debt-advice', 'topic': 'debt_help',
+     'text': "If repayments are getting on top of you, free and confidential help is available from "
+             "MoneyHelper, StepChange and Citizens Advice - including the Breathing Space scheme, which pauses "
+             "interest and enforcement for 60 days in England and Wales.",
+     'tags': {'debt:high': 2, 'cash_flow:negative': 2}},
+    {'id': 'credit-file', 'topic': 'credit',
+     'text': "Check your credit file for free with the main credit reference agencies, make sure you're on the "
+             "electoral roll, and pay every bill on time - it makes a mortgage cheaper later.",
+     'tags': {'debt:manageable': 1, 'achievement:debt_management_expert': 1, 'career:student': 1, 'debt:none': 1}},
+    {'id': 'debt-free-next-step', 'topic': 'investing',
+     'text': "Now you're debt-free, redirect what you were repaying into saving and investing automatically on "
+             "payday, so the money never gets spent.",
+     'tags': {'achievement:debt_free_champion': 2, 'debt:none': 2}},
+    {'id': 'tax-wrappers', 'topic': 'investing',
+     'text': "Outside ISAs and pensions only £3,000 of gains and £500 of dividends a year are tax-free, so fill "
+             "your tax wrappers first as your wealth grows.",
+     'tags': {'achievement:wealth_builder': 2, 'career:banker': 2}},
+    {'id': 'child-benefit-charge', 'topic': 'tax',
+     'text': "If you claim Child Benefit and earn over £60,000, the High Income Child Benefit Charge claws it "
+             "back; pension contributions reduce the income it's measured on.",
+     'tags': {'career:banker': 2}},
+    {'id': 'savings-rate', 'topic': 'saving',
+     'text': "Automate your saving with a standing order on payday and raise it each time your pay goes up - "
+             "you won't miss money you never see.",
+     'tags': {'achievement:positive_cash_flow_master': 2, 'cash_flow:positive': 1, 'achievement:strategic_saver': 1}},
+    {'id': 'business-buffer', 'topic': 'business',
+     'text': "Keep business and personal money in separate accounts, and hold a cash reserve covering at least "
+             "three months of business costs before you expand.",
+     'tags': {'career:entrepreneur': 3, 'debt:manageable': 1}},
+]
+
+
+def _slug(text: str) -> str:
+    return '_'.join(str(text).lower().split())
+
+
+class TipIndex:
+    """Inverted index over tip tags with BM25 weights folded into the postings"""
+
+    def __init__(self, tips: Sequence[Dict[str, Any]], k1: float = K1, b: float = B):
+        self.tips = list(tips)
+        lengths = [sum(tip['tags'].values()) for tip in self.tips]
+        average_length = sum(lengths) / len(lengths) if lengths else 1.0
+        frequencies: Dict[str, Dict[int, float]] = {}
+        for position, tip in enumerate(self.tips):
+            for tag, weight in tip['tags'].items():
+                frequencies.setdefault(tag, {})[position] = weight
+        # postings[term] = [(tip position, the term's BM25 contribution to that tip), ...]
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        total = len(self.tips)
+        for term, counts in frequencies.items():
+            idf = math.log(1 + (total - len(counts) + 0.5) / (len(counts) + 0.5))
+            self.postings[term] = [
+                (position, idf * count * (k1 + 1) / (count + k1 * (1 - b + b * lengths[position] / average_length)))
+                for position, count in counts.items()
+            ]
+
+    def search(self, terms: Iterable[str], count: int = DEFAULT_TIP_COUNT) -> List[Dict[str, Any]]:
+        """
+        Best tips for the query terms, at most one per topic
+
+        Args:
+            terms: Query terms (a term given twice counts twice)
+            count: Number of tips wanted
+
+        Returns:
+            Tips (id, topic, text and score), best first
+        """
+        scores: Dict[int, float] = {}
+        for term in terms:
+            for position, weight in self.postings.get(term, ()):
+                scores[position] = scores.get(position, 0.0) + weight
+        results = []
+        topics = set()
+        for position in sorted(scores, key=lambda position: (-scores[position], position)):
+            tip = self.tips[position]
+            if tip['topic'] in topics:
+                continue
+            topics.add(tip['topic'])
+            results.append({'id': tip['id'], 'topic': tip['topic'], 'text': tip['text'],
+                            'score': round(scores[position], 4)})
+            if len(results) == count:
+                break
+        return results
+
+
+def query_terms(
+    career: str,
+    achievements: Sequence[str] = (),
+    debt_to_income_ratio: Optional[float] = None,
+    cash_flow: Optional[float] = None
+) -> List[str]:
+    """
+    Query terms for a player
+
+    Args:
+        career: The player's career
+        achievements: Achievements the player unlocked
+        debt_to_income_ratio: Recent debt-to-income ratio, if known
+        cash_flow: Recent monthly income minus expenses, if known
+
+    Returns:
+        Terms in the tag vocabulary (the career counts double)
+    """
+    terms = [f"career:{_slug(career)}"] * 2
+    terms += [f"achievement:{_slug(achievement)}" for achievement in achievements]
+    if debt_to_income_ratio is not None:
+        if debt_to_income_ratio <= 0:
+            terms.append('debt:none')
+        elif debt_to_income_ratio > scenario_deck.HIGH_DEBT_TO_INCOME:
+            terms.append('debt:high')
+        else:
+            terms.append('debt:manageable')
+    if cash_flow is not None:
+        terms.append('cash_flow:positive' if cash_flow > 0 else 'cash_flow:negative')
+    return terms
+
+
+# Built once per process, at import
+INDEX = TipIndex(TIPS)
+
+
+def tips_for(
+    career: str,
+    achievements: Sequence[str] = (),
+    debt_to_income_ratio: Optional[float] = None,
+    cash_flow: Optional[float] = None,
+    count: int = DEFAULT_TIP_COUNT
+) -> List[Dict[str, Any]]:
+    """Best tips for a player's career, achievements and finances (see query_terms and TipIndex.search)"""
+    return INDEX.search(query_terms(career, achievements, debt_to_income_ratio, cash_flow), count)
+
+
+def benchmark(count: int = 100000) -> float:
+    """Microseconds per tips_for lookup"""
+    started = time.perf_counter()
+    for _ in range(count):
+        tips_for('Entrepreneur', ['Positive Cash Flow Master', 'Strategic Saver'], 0.6, -120.0)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    import json
+    if len(sys.argv) >= 2 and sys.argv[1] == 'benchmark':
+        print(f"{benchmark():.2f} us per lookup")
+    elif len(sys.argv) >= 2:
+        arguments = sys.argv[2:] + [None] * 3
+        print(json.dumps(tips_for(sys.argv[1], [name for name in (arguments[0] or '').split(',') if name],
+                                  float(arguments[1]) if arguments[1] is not None else None,
+                                  float(arguments[2]) if arguments[2] is not None else None), indent=2))
+    else:
+        print("Usage: python tips.py <career> [achievement,achievement] [debt_to_income_ratio] [cash_flow] | benchmark")
@@ -0,0 +1,176 @@
+"""
+Request tracing for the Financial Twin game
+This module records timed spans for a single game request so latency can be attributed
+across the Node.js -> game_runner -> run_game_function -> ApiClient -> Mistral hops.
+"""
+import os
+import json
+import time
+import uuid
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Where finished span trees are appended (one JSON document per line)
+SPAN_LOG_PATH = os.environ.get('FINANCIAL_TWIN_SPAN_LOG', '/tmp/python_game_spans.log')
+
+# The trace and span that are active for the current request
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('financial_twin_trace', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('financial_twin_span', default=None)
+
+
+def _new_id() -> str:
+    """Generate a short random identifier for a span"""
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """A single timed operation inside a trace"""
+
+    def __init__(self, name: str, parent_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.children: List['Span'] = []
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+
+    def set(self, **attributes: Any) -> None:
+        """Attach extra attributes to the span"""
+        self.attributes.update(attributes)
+
+    def finish(self) -> None:
+        """Mark the span as finished"""
+        if self._end is None:
+            self._end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        """Elapsed time in milliseconds (up to now if the span is still open)"""
+        end = self._end if self._end is not None else time.perf_counter()
+        return (end - self._start) * 1000.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span and its children to a dictionary for JSON serialization"""
+        result = {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "children": [child.to_dict() for child in self.children]
+        }
+        if self.attributes:
+            result["attributes"] = self.attributes
+        if self._end is None:
+            result["in_progress"] = True
+        return result
+
+
+class Trace:
+    """A tree of spans for one game request"""
+
+    def __init__(self, trace_id: Optional[str] = None, parent_span_id: Optional[str] = None, name: str = 'game_request'):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.root = Span(name, parent_id=parent_span_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the trace to a dictionary for JSON serialization"""
+        return {"trace_id": self.trace_id, "root": self.root.to_dict()}
+
+
+def start_trace(trace_id: Optional[str] = None, parent_span_id: Optional[str] = None, name: str = 'game_request') -> Trace:
+    """
+    Start a new trace and make its root span the current span
+
+    Args:
+        trace_id: Trace id propagated from the caller (a new one is generated if missing)
+        parent_span_id: Span id of the caller's span, if any
+        name: Name of the root span
+
+    Returns:
+        The active Trace
+    """
+    trace = Trace(trace_id, parent_span_id, name)
+    _current_trace.set(trace)
+    _current_span.set(trace.root)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the active trace, or None when tracing is disabled"""
+    return _current_trace.get()
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost open span, or None when tracing is disabled"""
+    return _current_span.get()
+
+
+def end_trace() -> Optional[Dict[str, Any]]:
+    """
+    Finish the active trace and stop recording spans
+
+    Returns:
+        The finished span tree, or None if no trace was active
+    """
+    trace = _current_trace.get()
+    _current_trace.set(None)
+    _current_span.set(None)
+    if trace is None:
+        return None
+    trace.root.finish()
+    return trace.to_dict()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Record a child span of the current span for the duration of the block
+
+    Yields None (and records nothing) when no trace is active, so callers
+    can instrument code unconditionally.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, parent_id=parent.span_id, attributes=attributes)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set(error=str(e) or type(e).__name__)
+        raise
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+
+def propagation_headers() -> Dict[str, str]:
+    """Headers that carry the trace context to downstream HTTP calls"""
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    if trace is None or parent is None:
+        return {}
+    return {"X-Trace-Id": trace.trace_id, "X-Parent-Span-Id": parent.span_id}
+
+
+def propagation_env() -> Dict[str, str]:
+    """Environment variables that carry the trace context to child processes"""
+    return {key.replace('X-', '').replace('-', '_').upper(): value
+            for key, value in propagation_headers().items()}
+
+
+def write_span_log(trace_data: Dict[str, Any], path: str = SPAN_LOG_PATH) -> None:
+    """Append a finished span tree to the span log"""
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(trace_data) + "\n")
+    except OSError:
+        # Tracing must never break a game request
+        pass
@@ -0,0 +1,171 @@
+"""
+XP progression ledger for the Financial Twin game
+Every XP award in a session is appended to that session's ledger. A snapshot of the running
+totals is written every few events, so reading the current XP and level only replays the
+short tail since the last snapshot. Old sessions can be compacted to a single event.
+"""
+import os
+import sys
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path to support both direct and relative imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from python_modules import background
+except ImportError:
+    import background
+
+# Ledger storage
+LEDGER_DIR = os.environ.get('FINANCIAL_TWIN_XP_LEDGER_DIR', '/tmp/financial_twin_xp_ledger')
+
+# Events between snapshots (the most a read ever replays)
+SNAPSHOT_INTERVAL = 16
+
+# Sessions idle for longer than this are compacted
+COMPACT_AFTER_SECONDS = int(os.environ.get('FINANCIAL_TWIN_XP_COMPACT_AFTER', '86400'))
+
+# Reason recorded on the single event a compacted ledger keeps
+COMPACTED = 'compacted'
+
+
+def _get_level(xp: int) -> int:
+    """Level for an XP total, using the game's own rule"""
+    try:
+        from python_modules.financial_twin_updated import get_level
+    except ImportError:
+        from financial_twin_updated import get_level
+    return get_level(xp)
+
+
+def _paths(session_id: str) -> Dict[str, str]:
+    """Ledger and snapshot files of a session"""
+    safe_id = ''.join(c for c in str(session_id) if c.isalnum())
+    base = os.path.join(LEDGER_DIR, safe_id)
+    return {'log': base + '.log', 'snapshot': base + '.snapshot.json'}
+
+
+def _empty_snapshot() -> Dict[str, Any]:
+    return {'events': 0, 'total_xp': 0, 'offset': 0}
+
+
+def _replay_tail(log_path: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Totals from a snapshot plus the events appended after it"""
+    totals = dict(snapshot)
+    try:
+        with open(log_path, 'rb') as f:
+            f.seek(snapshot['offset'])
+            for line in f:
+                event = json.loads(line)
+                totals['events'] = event['seq']
+                totals['total_xp'] += event['xp']
+            totals['offset'] = f.tell()
+    except FileNotFoundError:
+        pass
+    return totals
+
+
+def _with_level(totals: Dict[str, Any]) -> Dict[str, Any]:
+    return {'total_xp': totals['total_xp'], 'level': _get_level(totals['total_xp']), 'events': totals['events']}
+
+
+def append(session_id: str, xp: int, reason: str, **details: Any) -> Dict[str, Any]:
+    """
+    Append an XP award to a session's ledger
+
+    Args:
+        session_id: Game session
+        xp: XP awarded
+        reason: What the XP was awarded for (e.g. 'turn')
+        **details: Extra fields stored with the event
+
+    Returns:
+        Dictionary with the session's total_xp, level and number of events
+    """
+    paths = _paths(session_id)
+    with background.file_lock(paths['log']):
+        snapshot = background.read_json(paths['snapshot'], None) or _empty_snapshot()
+        totals = _replay_tail(paths['log'], snapshot)
+        event = {'seq': totals['events'] + 1, 'xp': int(xp), 'reason': reason, 'time': time.time(), **details}
+        with open(paths['log'], 'ab') as f:
+            f.write((json.dumps(event) + '\n').encode('utf-8'))
+            totals['offset'] = f.tell()
+        totals['events'] = event['seq']
+        totals['total_xp'] += event['xp']
+        if totals['events'] - snapshot['events'] >= SNAPSHOT_INTERVAL:
+            background.write_json_atomic(paths['snapshot'], totals)
+    return _with_level(totals)
+
+
+def totals(session_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Current total_xp, level and event count of a session, or None if it has no ledger"""
+    if not session_id:
+        return None
+    paths = _paths(session_id)
+    if not os.path.exists(paths['log']):
+        return None
+    snapshot = background.read_json(paths['snapshot'], None) or _empty_snapshot()
+    return _with_level(_replay_tail(paths['log'], snapshot))
+
+
+def history(session_id: str) -> List[Dict[str, Any]]:
+    """Every event in a session's ledger, oldest first"""
+    try:
+        with open(_paths(session_id)['log'], 'r') as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def compact(session_id: str) -> Optional[Dict[str, Any]]:
+    """Replace a session's events with one event carrying its totals"""
+    paths = _paths(session_id)
+    if not os.path.exists(paths['log']):
+        return None
+    with background.file_lock(paths['log']):
+        snapshot = background.read_json(paths['snapshot'], None) or _empty_snapshot()
+        current = _replay_tail(paths['log'], snapshot)
+        event = {'seq': current['events'], 'xp': current['total_xp'], 'reason': COMPACTED, 'time': time.time()}
+        line = (json.dumps(event) + '\n').encode('utf-8')
+        tmp_path = paths['log'] + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(line)
+        os.replace(tmp_path, paths['log'])
+        current['offset'] = len(line)
+        background.write_json_atomic(paths['snapshot'], current)
+    return _with_level(current)
+
+
+def compact_idle(idle_seconds: int = COMPACT_AFTER_SECONDS) -> int:
+    """Compact every session ledger idle for longer than idle_seconds; returns the number compacted"""
+    compacted = 0
+    if not os.path.isdir(LEDGER_DIR):
+        return compacted
+    cutoff = time.time() - idle_seconds
+    for name in os.listdir(LEDGER_DIR):
+        if not name.endswith('.log'):
+            continue
+        path = os.path.join(LEDGER_DIR, name)
+        try:
+            if os.path.getmtime(path) >= cutoff:
+                continue
+            with open(path, 'r') as f:
+                first = f.readline()
+                already_compacted = not f.readline() and json.loads(first or '{}').get('reason') == COMPACTED
+        except (OSError, ValueError):
+            continue
+        if not already_compacted and compact(name[:-len('.log')]) is not None:
+            compacted += 1
+    return compacted
+
+
+# Main entry point when called directly
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'compact':
+        print(compact_idle(int(sys.argv[2])) if len(sys.argv) >= 3 else compact_idle())
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'totals':
+        print(totals(sys.argv[2]))
+    else:
+        print("Usage: python xp_ledger.py compact [idle_seconds] | totals <session_id>")
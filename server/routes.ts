@@ -12,8 +12,17 @@ import {
   initializeFinancialTwin,
   processFinancialDecision,
   concludeGameSession,
+  getNarrativeJob,
+  fastForward,
+  solveGoals,
+  previewDecisions,
+  getAchievementCatalog,
+  queryAchievements,
+  getHealthHistory,
+  getStateHistory,
   FinancialGameData,
-  DecisionOption
+  DecisionOption,
+  StateHistorySeries
 } from './services/financial-game';
 
 export async function registerRoutes(app: Express, isAuthenticated?: (req: Request, res: Response, next: NextFunction) => void): Promise<Server> {
@@ -969,7 +978,7 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
   // Initialize the financial twin with career path
   app.post("/api/financial-game/initialize", async (req: Request, res: Response) => {
     try {
-      const { careerPath, acknowledgeStatus } = req.body;
+      const { careerPath, acknowledgeStatus, progressive } = req.body;
       
       if (!careerPath) {
         return res.status(400).json({ message: "Career path is required" });
@@ -977,7 +986,8 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
       
       const result = await initializeFinancialTwin(
         careerPath, 
-        acknowledgeStatus || "I understand my initial financial status"
+        acknowledgeStatus || "I understand my initial financial status",
+        Boolean(progressive)
       );
       
       res.json(result);
@@ -997,7 +1007,9 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
         savings, 
         debt, 
         financialDecision,
-        nextStep 
+        nextStep,
+        sessionId,
+        achievementFormat 
       } = req.body;
       
       if (!careerPath || income === undefined || expenses === undefined || 
@@ -1012,7 +1024,9 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
         savings, 
         debt, 
         financialDecision, 
-        nextStep
+        nextStep,
+        sessionId,
+        achievementFormat === 'bits' ? 'bits' : 'labels'
       );
       
       res.json(result);
@@ -1031,7 +1045,10 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
         xpEarned, 
         level, 
         achievements, 
-        financialDecision 
+        financialDecision,
+        progressive,
+        sessionId,
+        polish
       } = req.body;
       
       if (!playerName || !careerPath || xpEarned === undefined || 
@@ -1045,7 +1062,10 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
         xpEarned, 
         level, 
         achievements, 
-        financialDecision
+        financialDecision,
+        Boolean(progressive),
+        sessionId,
+        polish === undefined ? undefined : Boolean(polish)
       );
       
       res.json(result);
@@ -1055,6 +1075,184 @@ export async function registerRoutes(app: Express, isAuthenticated?: (req: Reque
     }
   });
   
+  // Poll the LLM narrative of a progressive initialize/conclude response
+  app.get("/api/financial-game/narrative/:jobId", async (req: Request, res: Response) => {
+    try {
+      const result = await getNarrativeJob(req.params.jobId);
+      
+      if (result.narrative_status === 'unknown') {
+        return res.status(404).json(result);
+      }
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error fetching narrative job:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // Fast-forward the player's finances a number of months
+  app.post("/api/financial-game/fast-forward", async (req: Request, res: Response) => {
+    try {
+      const { 
+        careerPath, 
+        income, 
+        expenses, 
+        savings, 
+        debt, 
+        months,
+        savingsApr,
+        debtApr,
+        debtPayment,
+        includeSchedule
+      } = req.body;
+      
+      if (!careerPath || income === undefined || expenses === undefined || 
+          savings === undefined || debt === undefined || months === undefined) {
+        return res.status(400).json({ message: "Missing required fields" });
+      }
+      
+      const result = await fastForward(
+        careerPath, 
+        income, 
+        expenses, 
+        savings, 
+        debt, 
+        months,
+        { savingsApr, debtApr, debtPayment, includeSchedule }
+      );
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error fast-forwarding finances:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // Solve savings-target and debt-free goals
+  app.post("/api/financial-game/goals", async (req: Request, res: Response) => {
+    try {
+      const { goals } = req.body;
+      
+      if (!Array.isArray(goals) || goals.length === 0) {
+        return res.status(400).json({ message: "Missing required fields" });
+      }
+      
+      const result = await solveGoals(goals);
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error solving goals:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // Compare every decision option before the player chooses
+  app.post("/api/financial-game/preview-decisions", async (req: Request, res: Response) => {
+    try {
+      const { 
+        careerPath, 
+        income, 
+        expenses, 
+        savings, 
+        debt, 
+        decisionOptions 
+      } = req.body;
+      
+      if (!careerPath || income === undefined || expenses === undefined || 
+          savings === undefined || debt === undefined) {
+        return res.status(400).json({ message: "Missing required fields" });
+      }
+      
+      const result = await previewDecisions(
+        careerPath, 
+        income, 
+        expenses, 
+        savings, 
+        debt, 
+        decisionOptions
+      );
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error previewing decisions:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // Rolling health metrics of a session and their per-turn history, for charts
+  app.get("/api/financial-game/health/:sessionId", async (req: Request, res: Response) => {
+    try {
+      const result = await getHealthHistory(req.params.sessionId);
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error fetching health history:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // A session's savings, debt and other state by turn, downsampled for charts
+  app.get("/api/financial-game/history/:sessionId", async (req: Request, res: Response) => {
+    try {
+      const { resolution, method, series } = req.query;
+      
+      if (method !== undefined && method !== 'lttb' && method !== 'minmax') {
+        return res.status(400).json({ message: "method must be 'lttb' or 'minmax'" });
+      }
+      
+      const result = await getStateHistory(
+        req.params.sessionId,
+        resolution !== undefined ? Number(resolution) : undefined,
+        method as 'lttb' | 'minmax' | undefined,
+        typeof series === 'string' ? series.split(',') as StateHistorySeries[] : undefined
+      );
+      
+      if (result.error) {
+        return res.status(400).json(result);
+      }
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error fetching state history:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // Achievement id-to-label table for clients reading achievement bitsets
+  app.get("/api/financial-game/achievements/catalog", async (req: Request, res: Response) => {
+    try {
+      const result = await getAchievementCatalog();
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error fetching achievement catalog:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
+  // Count players with some achievements and without others
+  app.post("/api/financial-game/achievements/query", async (req: Request, res: Response) => {
+    try {
+      const { has, lacks } = req.body;
+      
+      if (!Array.isArray(has)) {
+        return res.status(400).json({ message: "Missing required fields" });
+      }
+      
+      const result = await queryAchievements(has, Array.isArray(lacks) ? lacks : []);
+      
+      if (result.error) {
+        return res.status(400).json(result);
+      }
+      
+      res.json(result);
+    } catch (error) {
+      console.error("Error querying achievements:", error);
+      res.status(500).json({ message: "Internal server error", error: `${error}` });
+    }
+  });
+  
   // Forum Routes
   app.get("/api/forum/categories", async (req: Request, res: Response) => {
     try {
@@ -4,6 +4,7 @@
  */
 import { PythonShell } from 'python-shell';
 import path from 'path';
+import { randomUUID } from 'crypto';
 import { log } from '../vite';
 
 /**
@@ -30,8 +31,19 @@ export interface FinancialGameData {
   debt?: number;
   xp_earned?: number;
   level?: number;
+  total_xp?: number;
+  total_level?: number;
   achievements?: string[];
+  new_achievements?: string[];
+  unlocked_achievements?: string[];
+  achievements_mask?: number;
+  new_achievements_mask?: number;
+  unlocked_achievements_mask?: number;
+  final_achievements_mask?: number;
+  achievement_catalog_version?: string;
+  session_id?: string;
   crisis_event?: string | null;
+  crisis_type?: string | null;
   monthly_savings?: number;
   debt_to_income_ratio?: number;
   savings_ratio?: number;
@@ -40,20 +52,238 @@ export interface FinancialGameData {
   final_level?: number;
   final_achievements?: string[];
   leaderboard_position?: number;
+  tips?: ConclusionTip[];
   decision_options?: DecisionOption[];
+  scenario_index?: number;
+  recommended_option?: string | null;
+  narrative_job_id?: string;
+  narrative_status?: 'pending' | 'done' | 'failed' | 'unknown';
+  five_year_outlook?: FinancialOutlook;
+  take_home?: TakeHome;
+  health_metrics?: HealthMetrics | null;
+  health_history?: HealthHistory;
+  state_history?: StateHistory;
+  goal_forecast?: GoalForecast;
+  decision_preview?: DecisionPreview;
+  goals?: GoalResult[];
+  months?: number;
+  net_worth?: number;
+  debt_free_month?: number | null;
+  monthly_debt_payment?: number;
+  debt_interest_paid?: number;
+  savings_interest_earned?: number;
+  schedule?: {
+    month: number[];
+    savings: number[];
+    debt: number[];
+  };
+  trace?: GameTrace;
   error?: string;
 }
 
+/**
+ * Projected finances after fast-forwarding a number of months
+ */
+export interface FinancialOutlook {
+  months: number;
+  savings: number;
+  debt: number;
+  net_worth: number;
+  debt_free_month: number | null;
+}
+
+/**
+ * Monthly gross pay and deductions behind the take-home income
+ */
+export interface TakeHome {
+  gross: number;
+  income_tax: number;
+  national_insurance: number;
+  student_loan: number;
+  net: number;
+  gross_salary: number;
+  student_loan_plan: 'plan_1' | 'plan_2' | 'plan_5' | null;
+  employment: 'employed' | 'self_employed';
+  tax_year: string;
+}
+
+/**
+ * A financial tip picked for the player's conclusion from the local tip index
+ */
+export interface ConclusionTip {
+  id: string;
+  topic: string;
+  text: string;
+  score: number;
+}
+
+/**
+ * Rolling financial health over the session's recent turns (amounts in pounds)
+ */
+export interface HealthMetrics {
+  turns: number;
+  window_turns: number;
+  average_cash_flow: number;
+  average_savings_change: number;
+  savings_volatility: number;
+  net_worth_trend: number;
+  average_debt_to_income_ratio: number;
+  peak_net_worth: number;
+  max_drawdown: number;
+  positive_cash_flow_streak: number;
+  longest_positive_cash_flow_streak: number;
+}
+
+/**
+ * Per-turn series behind the health metrics, oldest turn first
+ */
+export interface HealthHistory {
+  turn: number[];
+  cash_flow: number[];
+  savings: number[];
+  savings_change: number[];
+  net_worth: number[];
+  debt_to_income_ratio: number[];
+}
+
+/**
+ * A session's state by turn, downsampled for charts (amounts in pounds)
+ */
+export interface StateHistory {
+  turns: number;
+  method: 'lttb' | 'minmax';
+  resolution: number;
+  series: Partial<Record<StateHistorySeries, { turn: number[]; value: number[] }>>;
+}
+
+export type StateHistorySeries = 'income' | 'expenses' | 'savings' | 'debt' | 'net_worth';
+
+/**
+ * Side-by-side comparison of every option of the presented scenario
+ */
+export interface DecisionPreviewRow {
+  value: string;
+  label: string;
+  income: number;
+  expenses: number;
+  savings: number;
+  debt: number;
+  monthly_savings: number;
+  debt_to_income_ratio: number | null;
+  savings_ratio: number | null;
+  monthly_savings_change: number;
+  outlook_12m: {
+    savings: number;
+    debt: number;
+    net_worth: number;
+  };
+  net_worth_change_12m: number;
+}
+
+export interface DecisionPreview {
+  months: number;
+  baseline: {
+    income: number;
+    expenses: number;
+    savings: number;
+    debt: number;
+    monthly_savings: number;
+    debt_to_income_ratio: number | null;
+    savings_ratio: number | null;
+    net_worth_12m: number;
+  };
+  options: DecisionPreviewRow[];
+  best: {
+    net_worth_12m?: string;
+    monthly_savings?: string;
+    lowest_debt_12m?: string;
+  };
+}
+
+/**
+ * Debt-free and emergency-fund forecasts returned with every turn
+ */
+export interface GoalForecast {
+  debt_free_months: number | null;
+  debt_free_month: string | null;
+  emergency_fund_target: number;
+  emergency_fund_months: number | null;
+  emergency_fund_month: string | null;
+}
+
+export interface Goal {
+  id?: string;
+  kind: 'savings_target' | 'debt_free';
+  career_path?: string;
+  income: number;
+  expenses: number;
+  savings: number;
+  debt: number;
+  target?: number;
+  deadline?: number;
+  savings_apr?: number;
+  debt_apr?: number;
+  debt_payment?: number;
+}
+
+export interface GoalResult {
+  id?: string;
+  kind: 'savings_target' | 'debt_free';
+  reachable: boolean;
+  months: number | null;
+  target_month: string | null;
+  target?: number;
+  deadline?: number;
+  required_monthly?: number;
+}
+
+/**
+ * Achievement id-to-label table used to read achievement bitsets
+ */
+export interface AchievementCatalog {
+  version: string;
+  labels: Record<string, string>;
+}
+
+export interface AchievementCohort {
+  players: number;
+  matching: number;
+  percentage: number;
+  rarity: Record<string, number>;
+  error?: string;
+}
+
+/**
+ * Span tree recorded by the Python game engine for a traced request
+ */
+export interface GameSpan {
+  span_id: string;
+  parent_id: string | null;
+  name: string;
+  start_time: number;
+  duration_ms: number;
+  attributes?: Record<string, any>;
+  in_progress?: boolean;
+  children: GameSpan[];
+}
+
+export interface GameTrace {
+  trace_id: string;
+  root: GameSpan;
+}
+
 /**
  * Run a Python game function with parameters
  */
 async function runGameFunction(
   functionName: string,
-  params: Record<string, any>
+  params: Record<string, any>,
+  traceId: string = randomUUID()
 ): Promise<FinancialGameData> {
+  const startedAt = Date.now();
   try {
     // Log function call
-    log(`runGameFunction called with function: ${functionName}`, 'python');
+    log(`runGameFunction called with function: ${functionName} (trace ${traceId})`, 'python');
     
     // Check if python_modules directory exists
     const scriptsDir = path.join(process.cwd(), 'python_modules');
@@ -71,9 +301,11 @@ async function runGameFunction(
       args: []
     };
 
+    // The trace id is propagated through game_runner into the Python ApiClient
     const data = {
       function: functionName,
-      params
+      params,
+      trace_id: traceId
     };
 
     // Log the data being sent to Python
@@ -112,9 +344,10 @@ async function runGameFunction(
     // The result will be a stringified JSON object
     log(`Processing Python results: ${results.join('')}`, 'python');
     const resultData = JSON.parse(results.join('')) as FinancialGameData;
+    log(`Python round-trip for ${functionName} took ${Date.now() - startedAt}ms (trace ${traceId})`, 'python');
     return resultData;
   } catch (error) {
-    log(`Error running game function ${functionName}:`, 'python');
+    log(`Error running game function ${functionName} (trace ${traceId}):`, 'python');
     log(`${error}`, 'python');
     
     // Provide more descriptive error message with fallback content
@@ -143,11 +376,13 @@ export async function startGame(
  */
 export async function initializeFinancialTwin(
   careerPath: string,
-  acknowledgeStatus: string
+  acknowledgeStatus: string,
+  progressive: boolean = false
 ): Promise<FinancialGameData> {
   return runGameFunction('initialize_financial_twin_function', {
     career_path: careerPath,
-    acknowledge_status: acknowledgeStatus
+    acknowledge_status: acknowledgeStatus,
+    progressive
   });
 }
 
@@ -161,7 +396,9 @@ export async function processFinancialDecision(
   savings: number,
   debt: number,
   financialDecision: string,
-  nextStep: string
+  nextStep: string,
+  sessionId?: string,
+  achievementFormat: 'labels' | 'bits' = 'labels'
 ): Promise<FinancialGameData> {
   return runGameFunction('process_financial_decisions_function', {
     career_path: careerPath,
@@ -170,7 +407,9 @@ export async function processFinancialDecision(
     savings: savings,
     debt: debt,
     financial_decision: financialDecision,
-    next_step: nextStep
+    next_step: nextStep,
+    session_id: sessionId,
+    achievement_format: achievementFormat
   });
 }
 
@@ -183,7 +422,10 @@ export async function concludeGameSession(
   xpEarned: number,
   level: number,
   achievements: string[],
-  financialDecision: string
+  financialDecision: string,
+  progressive: boolean = false,
+  sessionId?: string,
+  polish?: boolean
 ): Promise<FinancialGameData> {
   return runGameFunction('conclude_session_function', {
     player_name: playerName,
@@ -191,6 +433,133 @@ export async function concludeGameSession(
     xp_earned: xpEarned,
     level: level,
     achievements: achievements,
-    financial_decision: financialDecision
+    financial_decision: financialDecision,
+    progressive,
+    session_id: sessionId,
+    polish
   });
-}
\ No newline at end of file
+}
+
+/**
+ * Poll the LLM narrative of a progressive response
+ */
+export async function getNarrativeJob(
+  jobId: string
+): Promise<FinancialGameData> {
+  return runGameFunction('get_narrative_job_function', {
+    job_id: jobId
+  });
+}
+
+/**
+ * Fast-forward the player's finances a number of months
+ */
+export async function fastForward(
+  careerPath: string,
+  income: number,
+  expenses: number,
+  savings: number,
+  debt: number,
+  months: number,
+  options: {
+    savingsApr?: number;
+    debtApr?: number;
+    debtPayment?: number;
+    includeSchedule?: boolean;
+  } = {}
+): Promise<FinancialGameData> {
+  return runGameFunction('fast_forward_function', {
+    career_path: careerPath,
+    income: income,
+    expenses: expenses,
+    savings: savings,
+    debt: debt,
+    months: months,
+    savings_apr: options.savingsApr,
+    debt_apr: options.debtApr,
+    debt_payment: options.debtPayment,
+    include_schedule: Boolean(options.includeSchedule)
+  });
+}
+
+/**
+ * Solve savings-target and debt-free goals for one or many players
+ */
+export async function solveGoals(
+  goals: Goal[]
+): Promise<FinancialGameData> {
+  return runGameFunction('solve_goals_function', {
+    goals: goals
+  });
+}
+
+/**
+ * Compare every decision option from the player's current state
+ */
+export async function previewDecisions(
+  careerPath: string,
+  income: number,
+  expenses: number,
+  savings: number,
+  debt: number,
+  decisionOptions?: DecisionOption[]
+): Promise<FinancialGameData> {
+  return runGameFunction('preview_decisions_function', {
+    career_path: careerPath,
+    income: income,
+    expenses: expenses,
+    savings: savings,
+    debt: debt,
+    decision_options: decisionOptions
+  });
+}
+
+/**
+ * Get the achievement id-to-label table
+ */
+export async function getAchievementCatalog(): Promise<AchievementCatalog> {
+  const result = await runGameFunction('get_achievement_catalog_function', {});
+  return result as unknown as AchievementCatalog;
+}
+
+/**
+ * Count players with some achievements and without others
+ */
+export async function queryAchievements(
+  has: Array<string | number>,
+  lacks: Array<string | number> = []
+): Promise<AchievementCohort> {
+  const result = await runGameFunction('query_achievements_function', {
+    has: has,
+    lacks: lacks
+  });
+  return result as unknown as AchievementCohort;
+}
+
+/**
+ * Rolling health metrics of a session and the history behind them, for charts
+ */
+export async function getHealthHistory(
+  sessionId: string
+): Promise<FinancialGameData> {
+  return runGameFunction('get_health_history_function', {
+    session_id: sessionId
+  });
+}
+
+/**
+ * A session's state by turn, downsampled to about `resolution` points per series
+ */
+export async function getStateHistory(
+  sessionId: string,
+  resolution?: number,
+  method?: 'lttb' | 'minmax',
+  series?: StateHistorySeries[]
+): Promise<FinancialGameData> {
+  return runGameFunction('get_state_history_function', {
+    session_id: sessionId,
+    resolution,
+    method,
+    series
+  });
+}